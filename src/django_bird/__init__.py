@@ -1,7 +1,30 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+from typing import Any
+
 from pluggy import HookimplMarker
 
+if TYPE_CHECKING:
+    from .components import render_component
+    from .fragments import render_fragment
+
 __version__ = "0.18.1"
 
+__all__ = ["hookimpl", "render_component", "render_fragment"]
+
 hookimpl = HookimplMarker("django_bird")
+
+
+def __getattr__(name: str) -> Any:
+    # Imported lazily, since importing components requires configured settings
+    if name == "render_component":
+        from .components import render_component
+
+        return render_component
+    if name == "render_fragment":
+        from .fragments import render_fragment
+
+        return render_fragment
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
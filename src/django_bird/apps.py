@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import final
 
 from django.apps import AppConfig
+from django.core import checks
 
 from ._typing import override
 
@@ -15,13 +16,18 @@ class DjangoBirdAppConfig(AppConfig):
 
     @override
     def ready(self):
+        from django_bird.checks import check_render_time_assets
+        from django_bird.loaders import loaders
         from django_bird.plugins import pm
         from django_bird.staticfiles import asset_types
 
+        checks.register(check_render_time_assets)
+
         for pre_ready in pm.hook.pre_ready():
             pre_ready()
 
         pm.hook.register_asset_types(register_type=asset_types.register_type)
+        pm.hook.register_loaders(register_loader=loaders.register)
 
         for ready in pm.hook.ready():
             ready()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import final
+
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
+
+from django_bird import hookimpl
+
+from .plugins import pm
+
+if TYPE_CHECKING:
+    from django.http import HttpResponseBase
+
+    from .components import Component
+
+_current_policies: ContextVar[CachePolicies | None] = ContextVar(
+    "django_bird_cache_policies", default=None
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """How a response containing a component may be cached, as declared with
+    `{% bird:cache_control %}` in the component's template."""
+
+    max_age: int | None = None
+    public: bool = False
+    private: bool = False
+    no_store: bool = False
+    vary: tuple[str, ...] = ()
+
+    def combine(self, other: CachePolicy) -> CachePolicy:
+        """Get the most restrictive policy satisfying both policies."""
+        max_ages = [
+            max_age for max_age in (self.max_age, other.max_age) if max_age is not None
+        ]
+        private = self.private or other.private
+        return CachePolicy(
+            max_age=min(max_ages) if max_ages else None,
+            public=(self.public or other.public) and not private,
+            private=private,
+            no_store=self.no_store or other.no_store,
+            vary=tuple(dict.fromkeys((*self.vary, *other.vary))),
+        )
+
+    def patch_response(self, response: HttpResponseBase) -> None:
+        """Add this policy to a response's `Cache-Control` and `Vary` headers.
+
+        The policy only ever makes the response's caching more restrictive. `private`
+        replaces a `public` directive already in the response, but `public` is not
+        added to a response that is already `private` or `no-store`, and the lower
+        of the two `max-age` values is used.
+        """
+        existing = get_cache_control(response)
+        directives: dict[str, Any] = {}
+        if self.no_store:
+            directives["no_store"] = True
+        if self.private:
+            directives["private"] = True
+        elif self.public and not ("private" in existing or "no-store" in existing):
+            directives["public"] = True
+        if self.max_age is not None:
+            max_age = self.max_age
+            existing_max_age = existing.get("max-age")
+            if isinstance(existing_max_age, str) and existing_max_age.isdigit():
+                max_age = min(max_age, int(existing_max_age))
+            directives["max_age"] = max_age
+        if directives:
+            patch_cache_control(response, **directives)
+        if self.vary:
+            patch_vary_headers(response, self.vary)
+
+
+def get_cache_control(response: HttpResponseBase) -> dict[str, str | bool]:
+    """Get the directives in a response's `Cache-Control` header, by lowercase name,
+    with the value of each, or True for directives without one."""
+    directives: dict[str, str | bool] = {}
+    for field in response.get("Cache-Control", "").split(","):
+        name, has_value, value = field.partition("=")
+        if name.strip():
+            directives[name.strip().lower()] = value.strip() if has_value else True
+    return directives
+
+
+@final
+class CachePolicies:
+    """The combined cache policy of the components rendered over a block of code."""
+
+    def __init__(self) -> None:
+        self.policy: CachePolicy | None = None
+        self._seen: set[str] = set()
+
+    def add(self, component: Component) -> None:
+        if component.name in self._seen:
+            return
+        self._seen.add(component.name)
+        policy = component.cache_policy
+        if policy is None:
+            return
+        self.policy = policy if self.policy is None else self.policy.combine(policy)
+
+
+@contextmanager
+def record_cache_policies() -> Iterator[CachePolicies]:
+    """Record the cache policies of all components rendered within the block.
+
+    Policies are only recorded while this module is registered as a plugin, which
+    `CacheControlMiddleware` does when it is loaded.
+    """
+    policies = CachePolicies()
+    token = _current_policies.set(policies)
+    try:
+        with pm.record_component_renders():
+            yield policies
+    finally:
+        _current_policies.reset(token)
+
+
+@hookimpl
+def before_component_render(component: Component) -> None:
+    policies = _current_policies.get()
+    if policies is not None:
+        policies.add(component)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.checks import CheckMessage
+from django.core.checks import Warning
+from django.utils.module_loading import import_string
+
+from .conf import app_settings
+
+DEFERRED_ASSETS_MIDDLEWARE = "django_bird.middleware.DeferredAssetsMiddleware"
+
+
+def check_render_time_assets(
+    app_configs: Sequence[AppConfig] | None = None, **kwargs: Any
+) -> list[CheckMessage]:
+    """Check that `DeferredAssetsMiddleware` is installed when `RENDER_TIME_ASSETS`
+    is enabled, since without it the asset placeholders are never replaced."""
+    if not app_settings.RENDER_TIME_ASSETS:
+        return []
+
+    from .middleware import DeferredAssetsMiddleware
+
+    for path in getattr(settings, "MIDDLEWARE", None) or []:
+        try:
+            middleware = import_string(path)
+        except ImportError:
+            continue
+        if isinstance(middleware, type) and issubclass(
+            middleware, DeferredAssetsMiddleware
+        ):
+            return []
+
+    return [
+        Warning(
+            "RENDER_TIME_ASSETS is enabled but DeferredAssetsMiddleware is not in "
+            "MIDDLEWARE, so {% bird:css %} and {% bird:js %} render placeholders "
+            "that are never replaced with assets.",
+            hint=f"Add {DEFERRED_ASSETS_MIDDLEWARE!r} to MIDDLEWARE.",
+            id="django_bird.W001",
+        )
+    ]
@@ -3,34 +3,63 @@ from __future__ import annotations
 import itertools
 from collections import defaultdict
 from collections.abc import Generator
+from collections.abc import Hashable
 from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
 from dataclasses import dataclass
 from dataclasses import field
 from hashlib import md5
 from pathlib import Path
 from threading import Lock
+from time import perf_counter
 from typing import Any
+from typing import cast
 
 from django.conf import settings
+from django.http import HttpRequest
 from django.template.backends.django import Template as DjangoTemplate
+from django.template.base import FilterExpression
 from django.template.base import Node
 from django.template.base import NodeList
 from django.template.base import TextNode
 from django.template.context import Context
+from django.template.context import make_context
+from django.template.exceptions import TemplateDoesNotExist
+from django.template.exceptions import TemplateSyntaxError
 from django.template.loader import select_template
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
 
+from .cache_control import CachePolicy
 from .conf import app_settings
+from .loaders import is_collecting_keys
+from .nested import NestedRender
+from .nested import note_nested_render
+from .nested import note_nested_renders
+from .nested import record_nested_renders
 from .params import Param
 from .params import Params
+from .params import ParamsPlan
 from .plugins import pm
+from .profiling import get_active_profile
+from .render_cache import get_vary_values
+from .render_cache import render_cache
+from .render_cache import use_render_cache
 from .staticfiles import Asset
 from .staticfiles import AssetType
+from .templates import ComponentGraph
 from .templates import find_components_in_template
 from .templates import get_component_directories
 from .templates import get_template_names
 from .templatetags.tags.bird import BirdNode
+from .templatetags.tags.cache_control import CacheControlNode
+from .templatetags.tags.prop import PropNode
+from .templatetags.tags.pure import PureNode
 from .templatetags.tags.slot import DEFAULT_SLOT
 from .templatetags.tags.slot import SlotNode
+from .timing import slow_render_log
 
 
 @dataclass(frozen=True, slots=True)
@@ -38,6 +67,41 @@ class Component:
     name: str
     template: DjangoTemplate
     assets: frozenset[Asset] = field(default_factory=frozenset)
+    # Worked out once from the template, since they are needed on every render
+    id: str = field(init=False, compare=False)
+    cache_policy: CachePolicy | None = field(init=False, compare=False, repr=False)
+    loaded_props: dict[str, str] = field(init=False, compare=False, repr=False)
+    prop_names: frozenset[str] = field(init=False, compare=False, repr=False)
+    prop_nodes: tuple[PropNode, ...] = field(init=False, compare=False, repr=False)
+    pure_node: PureNode | None = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        normalized_source = "".join(self.source.split())
+        hashed = md5(
+            f"{self.name}:{self.path}:{normalized_source}".encode()
+        ).hexdigest()
+        prop_nodes = tuple(node for node in self.nodelist if isinstance(node, PropNode))
+        # Found at any depth, such as within `{% spaceless %}`
+        cache_control_nodes = self.nodelist.get_nodes_by_type(CacheControlNode)
+        pure_nodes = self.nodelist.get_nodes_by_type(PureNode)
+
+        # The dataclass is frozen, so fields are set as `__init__` would set them
+        object.__setattr__(self, "id", hashed[:7])
+        object.__setattr__(
+            self,
+            "cache_policy",
+            cache_control_nodes[0].policy if cache_control_nodes else None,
+        )
+        object.__setattr__(
+            self,
+            "loaded_props",
+            {node.name: node.loader for node in prop_nodes if node.loader is not None},
+        )
+        object.__setattr__(
+            self, "prop_names", frozenset(node.name for node in prop_nodes)
+        )
+        object.__setattr__(self, "prop_nodes", prop_nodes)
+        object.__setattr__(self, "pure_node", pure_nodes[0] if pure_nodes else None)
 
     def get_asset(self, asset_filename: str) -> Asset | None:
         for asset in self.assets:
@@ -49,18 +113,158 @@ class Component:
         params = Params.from_node(node)
         return BoundComponent(component=self, params=params, nodelist=node.nodelist)
 
+    def get_data_attrs(self, bird_id: str) -> list[Param]:
+        # Identical renders of pure components share their output, so they cannot
+        # have a unique id
+        if self.pure:
+            return [Param(f"data-bird-{self.data_attribute_name}", True)]
+        return [
+            Param(f"data-bird-{self.data_attribute_name}", True),
+            Param("data-bird-id", bird_id),
+        ]
+
+    def render(
+        self,
+        props: Mapping[str, Any] | None = None,
+        slots: Mapping[str, str] | None = None,
+        context: Context | Mapping[str, Any] | None = None,
+        request: HttpRequest | None = None,
+    ) -> SafeString:
+        """Render the component from Python, as `{% bird %}` would.
+
+        Unlike `{% bird %}` attributes, `props` values are used as they are rather than
+        resolved as template expressions. Names the component does not declare with
+        `{% bird:prop %}` become attributes, with their values escaped. Since their
+        names are not, never pass untrusted names, such as all of a request's query
+        parameters. `slots` maps slot names (`"default"` for the default slot) to
+        their content, which is escaped unless marked safe.
+
+        Args:
+            props: The props and attributes to pass to the component, by name
+            slots: The content of each slot, by name
+            context: The context to render in, or the variables for a new one
+            request: The request, to render with context processors
+
+        Returns:
+            SafeString: The rendered component
+
+        Raises:
+            ValueError: If an attribute name is not a valid HTML attribute name
+        """
+        if not isinstance(context, Context):
+            context = make_context(
+                None if context is None else dict(context),
+                request,
+                autoescape=self.template.backend.engine.autoescape,
+            )
+
+        nodelist = None
+        if slots:
+            nodelist = NodeList(
+                TextNode(conditional_escape(content))
+                if name == DEFAULT_SLOT
+                else SlotNode(name, NodeList([TextNode(conditional_escape(content))]))
+                for name, content in slots.items()
+            )
+
+        bound = BoundComponent(component=self, params=Params(), nodelist=nodelist)
+        plan = ParamsPlan.from_values(props or {}, self)
+
+        profile = get_active_profile()
+        if profile is None:
+            return mark_safe(bound.render_plan(context, plan))
+        with profile.frame(self.name, context):
+            return mark_safe(bound.render_plan(context, plan))
+
+    def render_many(
+        self,
+        items: Iterable[Any],
+        context: Context | Mapping[str, Any] | None = None,
+        *,
+        item_name: str = "item",
+        attrs: Mapping[str, FilterExpression | str | bool] | None = None,
+        nodelist: NodeList | None = None,
+        isolated_context: bool = False,
+    ) -> SafeString:
+        """Render the component once for every item, as `{% bird:each %}` does.
+
+        Each item is available to `attrs` and the slot content as `item_name`. Attribute
+        values are template expressions, as in `{% bird %}` (e.g. `"item.name"` or
+        `"'primary'"`). Which attributes are props is worked out once, and every
+        item's props are resolved before the first item is rendered, so loaded props
+        are fetched in a single batch.
+
+        Args:
+            items: The items to render the component for
+            context: The context to render in, or the variables for a new one
+            item_name: The name each item is bound to
+            attrs: The attributes to pass to every instance, by name
+            nodelist: The slot content to render for every instance
+            isolated_context: Whether to render in an isolated context, like `only`
+
+        Returns:
+            SafeString: The rendered instances, concatenated
+        """
+        if not isinstance(context, Context):
+            context = Context(context)
+        items = list(items)
+
+        bound = BoundComponent(component=self, params=Params(), nodelist=nodelist)
+        plan = ParamsPlan.bind(Params.from_attrs(attrs or {}), self)
+        timed = bound.timed
+        profile = get_active_profile()
+
+        if app_settings.RENDER_TIME_ASSETS:
+            get_rendered_components(context)[self.name] = self
+
+        data_attrs: Iterable[list[Param]] = itertools.repeat([])
+        if app_settings.ENABLE_BIRD_ATTRS:
+            component_id = self.id
+            first = bound._sequence.reserve(self, len(items))
+            data_attrs = (
+                self.get_data_attrs(f"{component_id}-{instance}")
+                for instance in range(first, first + len(items))
+            )
+
+        rendered: list[str] = []
+        with context.push() as frame:
+            render_context = context.new() if isolated_context else context
+
+            # Resolve every item's props first, so their loaded props share a batch
+            resolved: list[tuple[dict[str, Any], SafeString, float]] = []
+            for item, item_data_attrs in zip(items, data_attrs, strict=False):
+                frame[item_name] = item
+                start = perf_counter() if timed else 0.0
+                props = plan.render_props(context)
+                item_attrs = plan.render_attrs(context, item_data_attrs)
+                resolve_time = perf_counter() - start if timed else 0.0
+                resolved.append((props, item_attrs, resolve_time))
+
+            for item, (props, item_attrs, resolve_time) in zip(
+                items, resolved, strict=True
+            ):
+                frame[item_name] = item
+                render_start = perf_counter() - resolve_time if timed else None
+                if profile is None:
+                    rendered.append(
+                        bound.render_template(
+                            render_context, props, item_attrs, render_start
+                        )
+                    )
+                    continue
+                with profile.frame(self.name, render_context):
+                    rendered.append(
+                        bound.render_template(
+                            render_context, props, item_attrs, render_start
+                        )
+                    )
+
+        return mark_safe("".join(rendered))
+
     @property
     def data_attribute_name(self):
         return self.name.replace(".", "-")
 
-    @property
-    def id(self):
-        normalized_source = "".join(self.source.split())
-        hashed = md5(
-            f"{self.name}:{self.path}:{normalized_source}".encode()
-        ).hexdigest()
-        return hashed[:7]
-
     @property
     def nodelist(self):
         return self.template.template.nodelist
@@ -69,6 +273,15 @@ class Component:
     def path(self):
         return self.template.template.origin.name
 
+    @property
+    def pure(self) -> bool:
+        return self.pure_node is not None
+
+    @property
+    def vary(self) -> tuple[str, ...]:
+        pure_node = self.pure_node
+        return () if pure_node is None else pure_node.vary
+
     @property
     def source(self):
         return self.template.template.source
@@ -124,10 +337,18 @@ class SequenceGenerator:
         return cls._instance
 
     def next(self, component: Component) -> int:
+        return self.reserve(component, 1)
+
+    def reserve(self, component: Component, count: int) -> int:
+        """Reserve `count` consecutive numbers for a component, returning the first."""
+        if is_collecting_keys():
+            # The render is discarded, so its numbers are not used up
+            return 1
+        component_id = component.id
         with self._lock:
-            current = self._counters.get(component.id, 0) + 1
-            self._counters[component.id] = current
-        return current
+            first = self._counters.get(component_id, 0) + 1
+            self._counters[component_id] = first + count - 1
+        return first
 
 
 @dataclass
@@ -142,21 +363,151 @@ class BoundComponent:
         context: Context,
         resolution_context: Context | None = None,
     ):
+        profile = get_active_profile()
+        if profile is None:
+            return self._render(context, resolution_context)
+        with profile.frame(self.component.name, context):
+            return self._render(context, resolution_context)
+
+    def _render(
+        self,
+        context: Context,
+        resolution_context: Context | None = None,
+    ):
+        start = perf_counter() if self.timed else None
+
+        if app_settings.RENDER_TIME_ASSETS:
+            get_rendered_components(context)[self.component.name] = self.component
+
         if app_settings.ENABLE_BIRD_ATTRS:
-            data_attrs = [
-                Param(
-                    f"data-bird-{self.component.data_attribute_name}",
-                    True,
-                ),
-                Param("data-bird-id", f"{self.component.id}-{self.id}"),
-            ]
-            self.params.attrs.extend(data_attrs)
+            self.params.attrs.extend(
+                self.component.get_data_attrs(f"{self.component.id}-{self.id}")
+            )
 
         expression_context = resolution_context or context
         props = self.params.render_props(self.component, expression_context)
         attrs = self.params.render_attrs(expression_context)
+
+        return self.render_template(context, props, attrs, start)
+
+    def render_plan(self, context: Context, plan: ParamsPlan) -> str:
+        """Render the component with params already matched to its props."""
+        start = perf_counter() if self.timed else None
+
+        if app_settings.RENDER_TIME_ASSETS:
+            get_rendered_components(context)[self.component.name] = self.component
+
+        data_attrs: list[Param] = []
+        if app_settings.ENABLE_BIRD_ATTRS:
+            data_attrs = self.component.get_data_attrs(f"{self.component.id}-{self.id}")
+
+        props = plan.render_props(context)
+        attrs = plan.render_attrs(context, data_attrs)
+        return self.render_template(context, props, attrs, start)
+
+    @property
+    def timed(self) -> bool:
+        return (
+            pm.component_render_hooks_active
+            or app_settings.SLOW_RENDER_THRESHOLD is not None
+        ) and not is_collecting_keys()
+
+    def render_template(
+        self,
+        context: Context,
+        props: dict[str, Any] | None,
+        attrs: SafeString,
+        start: float | None,
+    ) -> str:
+        """Render the component's slots and template with resolved props and attrs.
+
+        `start` is when the render started, if it is being timed, so that render hooks
+        and slow render logging include the time spent resolving props and attrs.
+        """
+        render_hooks = start is not None and pm.component_render_hooks_active
+
+        note_nested_render(context, self.component.name)
+
+        if render_hooks:
+            pm.hook.before_component_render(
+                component=self.component, props=props, context=context
+            )
+
+        elapsed = 0.0
+        try:
+            rendered = self.render_output(context, props, attrs)
+        finally:
+            # Every `before_component_render` gets a matching
+            # `after_component_render`, even if the render fails
+            if start is not None:
+                elapsed = perf_counter() - start
+                if render_hooks:
+                    pm.hook.after_component_render(
+                        component=self.component,
+                        props=props,
+                        context=context,
+                        elapsed=elapsed,
+                    )
+
+        if start is not None and app_settings.SLOW_RENDER_THRESHOLD is not None:
+            slow_render_log.record(self.component, props or {}, context, elapsed)
+
+        return rendered
+
+    def render_output(
+        self,
+        context: Context,
+        props: dict[str, Any] | None,
+        attrs: SafeString,
+    ) -> str:
+        """Render the component's slots and template, or reuse an identical render
+        of a pure component."""
         slots = self.fill_slots(context)
 
+        memo_key = None
+        if self.component.pure:
+            memo_key = get_memo_key(
+                self.component,
+                props,
+                attrs,
+                slots,
+                get_vary_values(self.component, context),
+            )
+        if memo_key is None:
+            return self.render_slots(context, props, attrs, slots)
+
+        memo = get_render_memo(context)
+        stored = memo.get(memo_key)
+        cache_key = None
+        collecting = is_collecting_keys()
+        if stored is None and not collecting and use_render_cache(context):
+            cache_key = render_cache.make_key(self.component, memo_key)
+            stored = render_cache.get(cache_key)
+            if stored is not None:
+                memo[memo_key] = stored
+
+        if stored is not None:
+            replay_nested_renders(context, stored.nested)
+            return stored.output
+
+        with record_nested_renders(context) as nested:
+            rendered = self.render_slots(context, props, attrs, slots)
+        stored = StoredRender(output=rendered, nested=tuple(nested))
+        if not collecting:
+            memo[memo_key] = stored
+        if cache_key is not None:
+            render_cache.set(cache_key, stored)
+
+        return rendered
+
+    def render_slots(
+        self,
+        context: Context,
+        props: dict[str, Any] | None,
+        attrs: SafeString,
+        slots: dict[str, Any],
+    ) -> str:
+        """Render the component's template with its props, attrs and filled slots."""
         with context.push(
             **{
                 "attrs": attrs,
@@ -169,6 +520,13 @@ class BoundComponent:
             return self.component.template.template.render(context)
 
     def fill_slots(self, context: Context):
+        profile = get_active_profile()
+        if profile is None:
+            return self._fill_slots(context)
+        with profile.frame("fill_slots", context):
+            return self._fill_slots(context)
+
+    def _fill_slots(self, context: Context):
         if self.nodelist is None:
             return {
                 DEFAULT_SLOT: None,
@@ -196,17 +554,165 @@ class BoundComponent:
         return str(self._sequence.next(self.component))
 
 
+RENDERED_COMPONENTS_KEY = "_django_bird_rendered_components"
+
+
+def get_rendered_components(context: Context) -> dict[str, Component]:
+    """Get the components rendered so far, keyed by name.
+
+    The components are tracked in the outermost render context, so components
+    rendered by nested templates and isolated (`only`) components are included.
+    When the context has a request, the same components are shared by every
+    template rendered for that request.
+
+    Args:
+        context: The template context being rendered
+
+    Returns:
+        dict[str, Component]: The rendered components, in the order first rendered
+    """
+    render_state = cast("dict[str, Any]", context.render_context.dicts[0])
+    rendered: dict[str, Component] | None = render_state.get(RENDERED_COMPONENTS_KEY)
+    if rendered is None:
+        # A render collecting loader keys may render components the final render
+        # doesn't, so it doesn't share the request's
+        request = None if is_collecting_keys() else getattr(context, "request", None)
+        rendered = getattr(request, RENDERED_COMPONENTS_KEY, None)
+        if rendered is None:
+            rendered = {}
+            if request is not None:
+                setattr(request, RENDERED_COMPONENTS_KEY, rendered)
+        render_state[RENDERED_COMPONENTS_KEY] = rendered
+    return rendered
+
+
+def replay_nested_renders(context: Context, nested: Sequence[NestedRender]) -> None:
+    """Record the components rendered as part of a reused render as rendered again.
+
+    They are recorded for render-time asset collection and any render being recorded
+    around this one, and render hooks are called for them, with `None` props since
+    their props are not kept.
+    """
+    note_nested_renders(context, nested)
+    render_hooks = pm.component_render_hooks_active
+    for render in nested:
+        replay_hooks = render_hooks and render.rendered
+        if not (app_settings.RENDER_TIME_ASSETS or replay_hooks):
+            continue
+
+        component = components.get_component(render.name)
+        if app_settings.RENDER_TIME_ASSETS:
+            get_rendered_components(context)[component.name] = component
+        if replay_hooks:
+            start = perf_counter()
+            pm.hook.before_component_render(
+                component=component, props=None, context=context
+            )
+            pm.hook.after_component_render(
+                component=component,
+                props=None,
+                context=context,
+                elapsed=perf_counter() - start,
+            )
+
+
+RENDER_MEMO_KEY = "_django_bird_render_memo"
+
+# Prop values that can be part of a memo key
+MEMO_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True, slots=True)
+class StoredRender:
+    """The output of a pure component render, kept to be reused, with the components
+    rendered as part of it."""
+
+    output: str
+    nested: tuple[NestedRender, ...] = ()
+
+
+def get_render_memo(context: Context) -> dict[Hashable, StoredRender]:
+    """Get the output of the pure component renders so far, keyed by memo key.
+
+    Like the rendered components, the memo is kept in the outermost render context
+    and shared with every template rendered for the same request.
+    """
+    render_state = cast("dict[str, Any]", context.render_context.dicts[0])
+    memo: dict[Hashable, StoredRender] | None = render_state.get(RENDER_MEMO_KEY)
+    if memo is None:
+        request = getattr(context, "request", None)
+        memo = getattr(request, RENDER_MEMO_KEY, None)
+        if memo is None:
+            memo = {}
+            if request is not None:
+                setattr(request, RENDER_MEMO_KEY, memo)
+        render_state[RENDER_MEMO_KEY] = memo
+    return memo
+
+
+def get_memo_key(
+    component: Component,
+    props: Mapping[str, Any] | None,
+    attrs: str,
+    slots: Mapping[str, Any],
+    vary: tuple[str, ...] = (),
+) -> Hashable | None:
+    """Get the key identifying a render of a pure component, or None if it cannot
+    be memoized.
+
+    Only renders whose props are strings, numbers, booleans, `None`, or lists,
+    tuples and dictionaries of these are memoized, since other values, like model
+    instances, can differ while comparing equal.
+    """
+    try:
+        frozen_props = freeze_memo_value(props or {})
+    except TypeError:
+        return None
+    frozen_slots = tuple(
+        sorted((name, str(content)) for name, content in slots.items())
+    )
+    return (
+        components.get_tree_id(component),
+        frozen_props,
+        str(attrs),
+        frozen_slots,
+        vary,
+    )
+
+
+def freeze_memo_value(value: Any) -> Hashable:
+    if isinstance(value, MEMO_KEY_TYPES):
+        # Keep 1, 1.0 and True apart
+        return (type(value), value)
+    if isinstance(value, list | tuple):
+        return (type(value), tuple(freeze_memo_value(item) for item in value))
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple(
+                (freeze_memo_value(key), freeze_memo_value(item))
+                for key, item in value.items()
+            ),
+        )
+    msg = f"{type(value).__name__} values cannot be part of a memo key"
+    raise TypeError(msg)
+
+
 class ComponentRegistry:
     def __init__(self):
         self._component_usage: dict[str, set[Path]] = defaultdict(set)
         self._components: dict[str, Component] = {}
+        self._graph = ComponentGraph()
         self._template_usage: dict[Path, set[str]] = defaultdict(set)
+        self._tree_ids: dict[str, str] = {}
 
     def reset(self) -> None:
         """Reset the registry, used for testing."""
         self._component_usage = defaultdict(set)
         self._components = {}
+        self._graph = ComponentGraph()
         self._template_usage = defaultdict(set)
+        self._tree_ids = {}
 
     def get_assets(self, asset_type: AssetType | None = None) -> frozenset[Asset]:
         return frozenset(
@@ -225,17 +731,43 @@ class ComponentRegistry:
             self._component_usage[name] = set()
         return self._components[name]
 
+    def get_tree_id(self, component: Component) -> str:
+        """Get an id for a component's template and those of the components it uses,
+        transitively, which changes when any of those templates change.
+
+        Components whose names are only known when rendering, like
+        `{% bird component_name %}`, are not included. Components without nested
+        components use their own id.
+        """
+        if not settings.DEBUG and component.name in self._tree_ids:
+            return self._tree_ids[component.name]
+
+        # Templates can change with `DEBUG` on, so the components they use are found
+        # again
+        graph = ComponentGraph() if settings.DEBUG else self._graph
+        ids = [component.id]
+        for name in sorted(graph.closure([component.name]) - {component.name}):
+            try:
+                ids.append(f"{name}:{self.get_component(name).id}")
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                continue
+        tree_id = (
+            ids[0] if len(ids) == 1 else md5(":".join(ids).encode()).hexdigest()[:7]
+        )
+        self._tree_ids[component.name] = tree_id
+        return tree_id
+
     def get_component_names_used_in_template(
         self, template_path: str | Path
     ) -> set[str]:
-        """Get names of components used in a template."""
+        """Get names of components used in a template, including nested components."""
 
         path = Path(template_path)
 
         if path in self._template_usage:
             return self._template_usage[path]
 
-        components = find_components_in_template(template_path)
+        components = self._graph.closure(find_components_in_template(template_path))
 
         self._template_usage[path] = components
         for component_name in components:
@@ -252,3 +784,19 @@ class ComponentRegistry:
 
 
 components = ComponentRegistry()
+
+
+def render_component(
+    name: str,
+    props: Mapping[str, Any] | None = None,
+    slots: Mapping[str, str] | None = None,
+    request: HttpRequest | None = None,
+    context: Context | Mapping[str, Any] | None = None,
+) -> SafeString:
+    """Render a component by name, without a template containing `{% bird %}`.
+
+    See `Component.render` for how `props` and `slots` are passed to the component.
+    """
+    return components.get_component(name).render(
+        props, slots, context=context, request=request
+    )
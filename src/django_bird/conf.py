@@ -17,9 +17,23 @@ DJANGO_BIRD_FINDER = "django_bird.staticfiles.BirdAssetFinder"
 @dataclass
 class AppSettings:
     ADD_ASSET_PREFIX: bool | None = None
+    ASSET_MANIFEST_RELOAD_INTERVAL: float | None = None
     COMPONENT_DIRS: list[Path | str] = field(default_factory=list)
     ENABLE_BIRD_ATTRS: bool = True
+    ESI_ENABLED: bool = False
+    FRAGMENT_COMPONENTS: list[str] = field(default_factory=list)
+    INLINE_COMPONENTS: bool = False
+    PROFILE_DIR: Path | str | None = None
     DEFAULT_ONLY: bool = False
+    RENDER_CACHE: str | None = None
+    RENDER_CACHE_LOCAL_SIZE: int = 1000
+    RENDER_CACHE_TIMEOUT: int | None = 300
+    RENDER_TIME_ASSETS: bool = False
+    SERVER_TIMING_MAX_ENTRIES: int = 10
+    SERVER_TIMING_SAMPLE_RATE: float = 1.0
+    SLOW_RENDER_LOG_LIMIT: int = 10
+    SLOW_RENDER_SAMPLE_RATE: float = 1.0
+    SLOW_RENDER_THRESHOLD: float | None = None
 
     @override
     def __getattribute__(self, __name: str) -> object:
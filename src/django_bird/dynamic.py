@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django import template
+from django.core import signing
+from django.http import HttpRequest
+from django.template.context import Context
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from .payloads import ComponentPayload
+from .payloads import dumps_node
+from .templatetags.tags.bird import BirdNode
+
+DYNAMIC_SALT = "django_bird.dynamic"
+
+DYNAMIC_PLACEHOLDER_PATTERN = re.compile(rb"<!--bird:dynamic ([\w.:-]+)-->")
+
+_deferring_dynamic: ContextVar[bool] = ContextVar(
+    "django_bird_deferring_dynamic", default=False
+)
+
+
+@contextmanager
+def defer_dynamic_components() -> Iterator[None]:
+    """Render placeholders for `{% bird ... dynamic %}` tags within the block."""
+    token = _deferring_dynamic.set(True)
+    try:
+        yield
+    finally:
+        _deferring_dynamic.reset(token)
+
+
+def render_dynamic_placeholder(node: BirdNode, context: Context) -> SafeString | None:
+    """Render the placeholder for a `{% bird ... dynamic %}` tag, or return None if
+    dynamic components are not being deferred and it should be rendered inline.
+
+    The placeholder is an HTML comment holding the tag's signed payload, which
+    `render_dynamic_components` replaces with the rendered component.
+    """
+    if not _deferring_dynamic.get():
+        return None
+    try:
+        token = dumps_node(node, context, DYNAMIC_SALT)
+    except (TypeError, ValueError) as e:
+        msg = (
+            f"The props of dynamic component {node.get_component_name(context)!r} "
+            f"cannot be serialized: {e}"
+        )
+        raise template.TemplateSyntaxError(msg) from e
+    return mark_safe(f"<!--bird:dynamic {token}-->")
+
+
+def render_dynamic_components(
+    content: bytes, request: HttpRequest | None = None, charset: str = "utf-8"
+) -> bytes:
+    """Replace dynamic component placeholders in rendered content with the
+    components, rendered for `request`.
+
+    Placeholders in the slot content of a dynamic component are replaced too.
+    Placeholders that were not signed by this site are left as they are.
+
+    Args:
+        content: The rendered content, for example a cached response's
+        request: The request to render the components for
+        charset: The encoding of the content
+
+    Returns:
+        bytes: The content with all placeholders replaced
+    """
+
+    def replace(match: re.Match[bytes]) -> bytes:
+        try:
+            payload = ComponentPayload.loads(match.group(1).decode(), DYNAMIC_SALT)
+        except signing.BadSignature:
+            return match.group(0)
+        rendered = payload.render(request).encode(charset)
+        return DYNAMIC_PLACEHOLDER_PATTERN.sub(replace, rendered)
+
+    return DYNAMIC_PLACEHOLDER_PATTERN.sub(replace, content)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import logging
+
+from django.template.context import Context
+from django.utils.html import format_html
+from django.utils.safestring import SafeString
+
+from .payloads import dumps_node
+from .payloads import get_payload_url
+from .templatetags.tags.bird import BirdNode
+
+logger = logging.getLogger(__name__)
+
+ESI_SALT = "django_bird.esi"
+
+
+def render_esi_include(node: BirdNode, context: Context) -> SafeString | None:
+    """Render an `<esi:include>` for a `{% bird ... esi %}` tag.
+
+    The include points at the ESI view with the tag's signed payload, so an ESI
+    capable CDN or proxy can fetch and cache the component separately from the
+    page. Returns None if the component must be rendered inline instead.
+    """
+    try:
+        token = dumps_node(node, context, ESI_SALT)
+    except (TypeError, ValueError) as e:
+        logger.warning(
+            "Rendering component %r inline, its props cannot be serialized: %s",
+            node.get_component_name(context),
+            e,
+        )
+        return None
+    src = get_payload_url("django_bird:component_esi", token)
+    return format_html('<esi:include src="{}" />', src)
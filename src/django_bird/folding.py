@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from django.template.base import FilterExpression
+from django.template.base import Variable
+from django.template.context import Context
+
+from .components import Component
+from .components import freeze_memo_value
+from .components import get_rendered_components
+from .components import replay_nested_renders
+from .conf import app_settings
+from .nested import NestedRender
+from .nested import note_nested_render
+from .nested import record_nested_renders
+from .params import Params
+from .plugins import pm
+from .templatetags.tags.bird import BirdNode
+from .templatetags.tags.bird import is_blank
+
+# Names Django resolves to constants rather than looking up in the context
+CONSTANT_NAMES = {("True",), ("False",), ("None",)}
+
+
+@dataclass(frozen=True, slots=True)
+class FoldedRender:
+    """The output of a constant `{% bird %}` tag, for the component and settings it
+    was rendered with, and the components rendered as part of it. `output` is None
+    if the render cannot be reused."""
+
+    component: Component
+    enable_bird_attrs: bool
+    autoescape: bool
+    props: dict[str, Any] | None
+    output: str | None
+    nested: tuple[NestedRender, ...] = ()
+
+    def matches(self, component: Component, context: Context) -> bool:
+        return (
+            self.component is component
+            and self.enable_bird_attrs == app_settings.ENABLE_BIRD_ATTRS
+            and self.autoescape == context.autoescape
+        )
+
+
+def is_literal(expression: FilterExpression) -> bool:
+    """Whether an attribute's value is the same in any context."""
+    if expression.filters:
+        return False
+    var = expression.var
+    if not isinstance(var, Variable):
+        # Quoted strings, or lazy translations for `_("...")`. Django resolves these
+        # when parsing, so a `Variable` is never a translation.
+        return isinstance(var, str)
+    return var.literal is not None or var.lookups in CONSTANT_NAMES
+
+
+def is_constant_tag(node: BirdNode) -> bool:
+    """Whether a `{% bird %}` tag passes the same props, attributes and slots in any
+    context, so a pure component renders it the same every time.
+
+    This is the case for tags with only literal attribute values and no content.
+    Empty `{% bird %}...{% endbird %}` tags are not constant, since they take their
+    default slot from the enclosing component.
+    """
+    if node.fragment or node.esi or node.dynamic or node.lazy:
+        return False
+    if node.nodelist is not None and not (node.nodelist and is_blank(node.nodelist)):
+        return False
+    return all(is_literal(value) for value in node.attrs.values())
+
+
+def render_folded(node: BirdNode, component: Component, context: Context) -> str:
+    """Render a constant `{% bird %}` tag for a pure component.
+
+    The first render is stored on the node and reused by later renders, in any
+    request, until the component or the settings affecting its output change.
+    Components loaded with `DEBUG` on are new on every render, so nothing is reused
+    then. A reused render records the component, and the components rendered as part
+    of it, as rendered again, for render-time asset collection, cache policies and
+    render hooks.
+    """
+    folded = node.folded
+    if folded is None or not folded.matches(component, context):
+        with record_nested_renders(context) as nested:
+            rendered = node.render_component(component, context)
+        props = Params.from_node(node).render_props(component, context)
+        try:
+            freeze_memo_value(props)
+        except TypeError:
+            # Props from data loaders depend on more than the tag
+            output = None
+        else:
+            output = rendered
+        node.folded = FoldedRender(
+            component=component,
+            enable_bird_attrs=app_settings.ENABLE_BIRD_ATTRS,
+            autoescape=context.autoescape,
+            props=props,
+            output=output,
+            # The first render recorded is the component's own
+            nested=tuple(nested[1:]),
+        )
+        return rendered
+
+    if folded.output is None:
+        return node.render_component(component, context)
+
+    note_nested_render(context, component.name)
+    if app_settings.RENDER_TIME_ASSETS:
+        get_rendered_components(context)[component.name] = component
+
+    if not pm.component_render_hooks_active:
+        replay_nested_renders(context, folded.nested)
+        return folded.output
+
+    start = perf_counter()
+    props = None if folded.props is None else dict(folded.props)
+    pm.hook.before_component_render(component=component, props=props, context=context)
+    try:
+        replay_nested_renders(context, folded.nested)
+    finally:
+        pm.hook.after_component_render(
+            component=component,
+            props=props,
+            context=context,
+            elapsed=perf_counter() - start,
+        )
+
+    return folded.output
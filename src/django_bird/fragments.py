@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template import TemplateSyntaxError
+from django.template.base import Template
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.loader import select_template
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from .templatetags.tags.bird import BirdNode
+
+_fragments: WeakKeyDictionary[Template, dict[str, BirdNode]] = WeakKeyDictionary()
+
+
+def get_fragments(template: Template) -> dict[str, BirdNode]:
+    """Get the `{% bird %}` tags marked as fragments in a template, by name.
+
+    The template's nodes are searched once and the result is kept for as long as the
+    template, so a template kept by the cached loader is only searched the first
+    time.
+    """
+    fragments = _fragments.get(template)
+    if fragments is not None:
+        return fragments
+
+    fragments = {}
+    for node in template.nodelist.get_nodes_by_type(BirdNode):
+        if not isinstance(node, BirdNode) or node.fragment is None:
+            continue
+        if node.fragment in fragments:
+            msg = f"Fragment {node.fragment!r} is defined more than once in {template.origin.name}"
+            raise TemplateSyntaxError(msg)
+        fragments[node.fragment] = node
+    _fragments[template] = fragments
+    return fragments
+
+
+def render_fragment_to_string(
+    template_name: str | Sequence[str],
+    fragment: str,
+    context: Mapping[str, Any] | None = None,
+    request: HttpRequest | None = None,
+    using: str | None = None,
+) -> SafeString:
+    """Render only the `{% bird %}` tag marked with `fragment="<name>"` in a template.
+
+    The rest of the template is skipped. The fragment is rendered with the given
+    context alone, so variables set by tags around it in the template, such as
+    `{% with %}` or `{% for %}`, are not available. Only templates of the Django
+    template backend have fragments.
+    """
+    if isinstance(template_name, str):
+        backend_template = get_template(template_name, using=using)
+    else:
+        backend_template = select_template(template_name, using=using)
+    template = getattr(backend_template, "template", None)
+    if not isinstance(template, Template):
+        msg = f"{template_name}#{fragment}"
+        raise TemplateDoesNotExist(msg)
+
+    node = get_fragments(template).get(fragment)
+    if node is None:
+        msg = f"{template.origin.name}#{fragment}"
+        raise TemplateDoesNotExist(msg)
+
+    render_context = make_context(
+        None if context is None else dict(context),
+        request,
+        autoescape=template.engine.autoescape,
+    )
+    with render_context.render_context.push_state(template):
+        with render_context.bind_template(template):
+            return mark_safe(node.render(render_context))
+
+
+def render_fragment(
+    request: HttpRequest,
+    template_name: str | Sequence[str],
+    fragment: str,
+    context: Mapping[str, Any] | None = None,
+    content_type: str | None = None,
+    status: int | None = None,
+    using: str | None = None,
+) -> HttpResponse:
+    """Like `django.shortcuts.render`, rendering only one fragment of the template."""
+    content = render_fragment_to_string(
+        template_name, fragment, context, request, using
+    )
+    return HttpResponse(content, content_type, status)
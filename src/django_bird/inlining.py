@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+from copy import copy
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import cast
+from typing import final
+
+from django.conf import settings
+from django.template.base import FilterExpression
+from django.template.base import Node
+from django.template.base import NodeList
+from django.template.base import TextNode
+from django.template.base import Variable
+from django.template.base import VariableNode
+from django.template.context import Context
+from django.template.defaulttags import CommentNode
+from django.template.defaulttags import ForNode
+from django.template.defaulttags import IfNode
+from django.template.defaulttags import LoadNode as DjangoLoadNode
+from django.template.defaulttags import TemplateLiteral
+from django.template.smartif import TokenBase
+from django.utils.safestring import SafeString
+
+from ._typing import override
+from .components import Component
+from .components import SequenceGenerator
+from .components import get_rendered_components
+from .conf import app_settings
+from .nested import note_nested_render
+from .params import Param
+from .params import Params
+from .params import ParamsPlan
+from .params import PropSpec
+from .params import Value
+from .plugins import pm
+from .profiling import get_active_profile
+from .templatetags.tags.bird import BirdNode
+from .templatetags.tags.load import LoadNode
+from .templatetags.tags.prop import PropNode
+from .templatetags.tags.slot import SlotNode
+
+# Variables a component's template is rendered with, which inlining replaces
+COMPONENT_VARIABLES = {"attrs", "props", "slot", "slots", "vars"}
+
+# Nodes that render nothing
+EMPTY_NODE_TYPES = (CommentNode, DjangoLoadNode, LoadNode, PropNode)
+
+
+class NotInlinable(Exception):
+    """Raised when a component's template uses something inlining cannot expand."""
+
+
+@dataclass(frozen=True, slots=True)
+class InlinedComponent:
+    """A component's template expanded for a `{% bird %}` tag. `nodelist` is None if
+    the template cannot be expanded."""
+
+    component: Component
+    nodelist: NodeList | None
+
+
+@final
+@dataclass(frozen=True, slots=True)
+class PropVariable:
+    """`props.<name>` in an expanded template, resolving the value the `{% bird %}`
+    tag passes for the prop, or the prop's default, as the component's render would.
+    """
+
+    variable: Variable
+    prop: PropSpec
+
+    def resolve(self, context: Context) -> Any:
+        value = self.prop.resolve(context)
+        if self.variable.lookups is None or len(self.variable.lookups) == 2:
+            return value
+        # Follow the rest of the lookups, as for `props.<name>.<attribute>`
+        with context.push(props={self.prop.name: value}):
+            return self.variable.resolve(context)
+
+
+@final
+class AttrsNode(Node):
+    """`{{ attrs }}` in an expanded template, rendering the tag's attributes that are
+    not props."""
+
+    def __init__(self, component: Component, plan: ParamsPlan) -> None:
+        self.component = component
+        self.plan = plan
+        self.sequence = SequenceGenerator()
+
+    @override
+    def render(self, context: Context) -> SafeString:
+        data_attrs: list[Param] = []
+        if app_settings.ENABLE_BIRD_ATTRS:
+            instance = self.sequence.next(self.component)
+            data_attrs = self.component.get_data_attrs(
+                f"{self.component.id}-{instance}"
+            )
+        return self.plan.render_attrs(context, data_attrs)
+
+
+def get_names(expression: FilterExpression) -> set[str]:
+    """Get the names of the context variables an expression looks up."""
+    variables = [expression.var]
+    for _func, args in expression.filters:
+        variables.extend(arg for lookup, arg in args if lookup)
+    return {
+        variable.lookups[0]
+        for variable in variables
+        if isinstance(variable, Variable) and variable.lookups
+    }
+
+
+@dataclass
+class ComponentExpander:
+    """Expands a component's template for a `{% bird %}` tag, replacing `props`,
+    `attrs` and `slot` with what the tag passes, so it can be rendered in place.
+    """
+
+    component: Component
+    plan: ParamsPlan
+    content: NodeList | None
+    props: dict[str, PropSpec] = field(init=False)
+    loopvars: list[str] = field(default_factory=list)
+    attrs_used: bool = False
+    slot_used: bool = False
+
+    def __post_init__(self) -> None:
+        self.props = {prop.name: prop for prop in self.plan.props}
+
+    def expand_nodelist(self, nodelist: NodeList) -> NodeList:
+        expanded = NodeList()
+        for node in nodelist:
+            expanded.extend(self.expand_node(node))
+        return expanded
+
+    def expand_node(self, node: Node) -> list[Node]:
+        if isinstance(node, EMPTY_NODE_TYPES):
+            return []
+        if isinstance(node, TextNode):
+            return [node]
+        if isinstance(node, VariableNode):
+            return self.expand_variable_node(node)
+        if isinstance(node, IfNode):
+            return [
+                IfNode(
+                    [
+                        (
+                            None
+                            if condition is None
+                            else self.expand_condition(condition),
+                            self.expand_nodelist(nodelist),
+                        )
+                        for condition, nodelist in node.conditions_nodelists
+                    ]
+                )
+            ]
+        if isinstance(node, ForNode):
+            return [self.expand_for_node(node)]
+        msg = f"{type(node).__name__} cannot be inlined"
+        raise NotInlinable(msg)
+
+    def expand_variable_node(self, node: VariableNode) -> list[Node]:
+        expression = node.filter_expression
+        variable = expression.var
+        if expression.filters or not isinstance(variable, Variable):
+            return [VariableNode(self.expand_expression(expression))]
+        match variable.lookups:
+            case ("attrs",):
+                return [self.expand_attrs()]
+            case ("slot",):
+                return self.expand_slot()
+            case _:
+                return [VariableNode(self.expand_expression(expression))]
+
+    def expand_attrs(self) -> Node:
+        # Rendered once, outside loops, so each render numbers its `data-bird-id` once
+        if self.attrs_used or self.loopvars:
+            msg = "attrs can only be rendered once, outside loops"
+            raise NotInlinable(msg)
+        self.attrs_used = True
+        return AttrsNode(self.component, self.plan)
+
+    def expand_slot(self) -> list[Node]:
+        # The content is rendered where `{{ slot }}` is, so like a component render
+        # it must be rendered once, without the template's loop variables
+        if self.slot_used or self.loopvars:
+            msg = "slot can only be rendered once, outside loops"
+            raise NotInlinable(msg)
+        # Tags without content render `None`, or the enclosing component's slot
+        if not self.content:
+            msg = "slot is rendered for a tag without content"
+            raise NotInlinable(msg)
+        self.slot_used = True
+        return list(self.content)
+
+    def expand_for_node(self, node: ForNode) -> ForNode:
+        # Parsed `{% for %}` tags have an expression and nodelists
+        sequence = self.expand_expression(cast("FilterExpression", node.sequence))
+        nodelist_empty = self.expand_nodelist(cast("NodeList", node.nodelist_empty))
+        loopvars = [node.loopvars] if isinstance(node.loopvars, str) else node.loopvars
+        self.loopvars.extend([*loopvars, "forloop"])
+        try:
+            nodelist_loop = self.expand_nodelist(cast("NodeList", node.nodelist_loop))
+        finally:
+            del self.loopvars[-len(loopvars) - 1 :]
+        return ForNode(
+            node.loopvars,
+            sequence,
+            node.is_reversed,
+            nodelist_loop,
+            nodelist_empty,
+        )
+
+    def expand_condition(self, condition: TokenBase) -> Any:
+        expanded = copy(condition)
+        if isinstance(condition, TemplateLiteral):
+            expanded.value = self.expand_expression(
+                cast("FilterExpression", condition.value)
+            )
+            return expanded
+        expanded.first = self.expand_condition(condition.first)
+        if condition.second is not None:
+            expanded.second = self.expand_condition(condition.second)
+        return expanded
+
+    def expand_expression(self, expression: FilterExpression) -> FilterExpression:
+        for _func, args in expression.filters:
+            for lookup, arg in args:
+                if lookup:
+                    self.check_variable(arg)
+
+        variable = expression.var
+        if not isinstance(variable, Variable) or not variable.lookups:
+            return expression
+        if variable.lookups[0] != "props":
+            self.check_variable(variable)
+            return expression
+
+        lookups = variable.lookups
+        prop = self.props.get(lookups[1]) if len(lookups) > 1 else None
+        if prop is None:
+            msg = f"{variable.var} is not a prop of {self.component.name}"
+            raise NotInlinable(msg)
+        # Within a loop, the value passed for the prop must not use the loop's names
+        values = [prop.default, prop.value]
+        names = {
+            name
+            for value in values
+            if isinstance(value, Value) and isinstance(value.raw, FilterExpression)
+            for name in get_names(value.raw)
+        }
+        if names & set(self.loopvars):
+            msg = f"{variable.var} is passed a name a loop in the template shadows"
+            raise NotInlinable(msg)
+
+        expanded = copy(expression)
+        expanded.var = PropVariable(variable, prop)
+        return expanded
+
+    @staticmethod
+    def check_variable(variable: Variable) -> None:
+        if variable.lookups and variable.lookups[0] in COMPONENT_VARIABLES:
+            msg = f"{variable.var} cannot be inlined"
+            raise NotInlinable(msg)
+
+
+def expand_component(node: BirdNode, component: Component) -> NodeList | None:
+    """Expand a component's template for a `{% bird %}` tag, or return None if it
+    cannot be inlined.
+
+    Components can be inlined when their template only uses text, variables, comments
+    and the `{% if %}`, `{% for %}`, `{% load %}` and `{% bird:prop %}` tags, and uses
+    `attrs` and `slot` only as `{{ attrs }}` and `{{ slot }}`, once each and outside
+    loops. Pure components, components with loaded props and isolated (`only`) tags
+    are not inlined, and neither are tags with named slots.
+    """
+    if node.isolated_context or component.pure or component.loaded_props:
+        return None
+    if node.nodelist is not None and any(
+        isinstance(child, SlotNode) for child in node.nodelist
+    ):
+        return None
+
+    expander = ComponentExpander(
+        component=component,
+        plan=ParamsPlan.bind(Params.from_node(node), component),
+        content=node.nodelist,
+    )
+    try:
+        return expander.expand_nodelist(component.nodelist)
+    except NotInlinable:
+        return None
+
+
+def render_inlined(
+    node: BirdNode, component: Component, context: Context
+) -> str | None:
+    """Render a `{% bird %}` tag by rendering its component's expanded template in
+    place, or return None to render the component as usual.
+
+    The template is expanded on the tag's first render and kept on the node until the
+    component changes. Instead of a nested template render with `props`, `attrs` and
+    `slot` pushed onto the context, each `props.<name>` is resolved from the tag's
+    attribute for the prop or the prop's default, `{{ attrs }}` renders the tag's other
+    attributes and `{{ slot }}` is replaced with the tag's content.
+
+    Components are rendered as usual with `DEBUG` on, since they are loaded again on
+    every render then, and while render hooks, slow render logging or profiling are
+    active, which time each component render.
+    """
+    if (
+        settings.DEBUG
+        or pm.component_render_hooks_active
+        or app_settings.SLOW_RENDER_THRESHOLD is not None
+        or get_active_profile() is not None
+    ):
+        return None
+
+    inlined = node.inlined
+    if inlined is None or inlined.component is not component:
+        inlined = InlinedComponent(component, expand_component(node, component))
+        node.inlined = inlined
+    if inlined.nodelist is None:
+        return None
+
+    note_nested_render(context, component.name)
+    if app_settings.RENDER_TIME_ASSETS:
+        get_rendered_components(context)[component.name] = component
+    return inlined.nodelist.render(context)
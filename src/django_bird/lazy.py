@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+
+from django.template.context import Context
+from django.utils.html import format_html
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from .payloads import ComponentPayload
+from .payloads import dumps_payload
+from .payloads import get_payload_url
+from .templatetags.tags.bird import BirdNode
+
+logger = logging.getLogger(__name__)
+
+LAZY_SALT = "django_bird.lazy"
+LAZY_FALLBACK_SLOT = "fallback"
+
+
+def render_lazy_placeholder(node: BirdNode, context: Context) -> SafeString | None:
+    """Render the placeholder for a `{% bird ... lazy %}` tag.
+
+    The placeholder shows the tag's `fallback` slot and has htmx attributes that
+    fetch the component from the lazy view, with the tag's signed payload, once the
+    placeholder is scrolled into view, then replace the placeholder with it.
+    Returns None if the component must be rendered inline instead.
+    """
+    payload = ComponentPayload.from_node(node, context)
+    try:
+        token = dumps_payload(payload, context, LAZY_SALT)
+    except (TypeError, ValueError) as e:
+        logger.warning(
+            "Rendering component %r inline, its props cannot be serialized: %s",
+            payload.name,
+            e,
+        )
+        return None
+    return format_html(
+        '<div hx-get="{}" hx-trigger="revealed" hx-swap="outerHTML">{}</div>',
+        get_payload_url("django_bird:component_lazy", token),
+        # Slot content is rendered template output
+        mark_safe(payload.slots.get(LAZY_FALLBACK_SLOT, "")),
+    )
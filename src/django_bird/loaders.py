@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from contextvars import ContextVar
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import cast
+from typing import final
+from typing import overload
+
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django import template
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.template.base import FilterExpression
+from django.template.base import Variable
+from django.template.context import Context
+from django.template.loader import render_to_string
+from django.utils.functional import SimpleLazyObject
+
+if TYPE_CHECKING:
+    from django_bird._typing import ParsedTagBits
+    from django_bird.components import Component
+    from django_bird.templatetags.tags.bird import ForLoop
+
+BatchLoadResult = Mapping[Any, Any] | Sequence[Any]
+SyncBatchLoadFunc = Callable[[list[Any]], BatchLoadResult]
+AsyncBatchLoadFunc = Callable[[list[Any]], Awaitable[BatchLoadResult]]
+BatchLoadFunc = SyncBatchLoadFunc | AsyncBatchLoadFunc
+
+DATA_LOADERS_KEY = "_django_bird_data_loaders"
+
+# Data loaders shared by the renders of `arender_to_string`, and whether the
+# current render is only collecting the keys of async loaders
+_current_data_loaders: ContextVar[dict[str, DataLoader] | None] = ContextVar(
+    "django_bird_data_loaders", default=None
+)
+_collecting_keys: ContextVar[bool] = ContextVar(
+    "django_bird_collecting_keys", default=False
+)
+
+
+def is_collecting_keys() -> bool:
+    """Whether the current render is the first render of `arender_to_string`, which
+    only collects the keys of async batch load functions and is discarded.
+
+    Such a render does not share the request's rendered components or pure render
+    memo, does not store reusable renders, and does not call the render hooks.
+    """
+    return _collecting_keys.get()
+
+
+@final
+class LoaderRegistry:
+    """Batch load functions available to `{% bird:prop %}`'s `load` option, by name.
+
+    A batch load function receives a list of unique keys and returns either a mapping
+    of keys to values or a sequence of values in the same order as the keys. Keys
+    missing from a returned mapping load as `None`. Batch load functions may be
+    coroutine functions; see `arender_to_string`.
+    """
+
+    def __init__(self) -> None:
+        self.loaders: dict[str, BatchLoadFunc] = {}
+
+    @overload
+    def register(self, name: str) -> Callable[[BatchLoadFunc], BatchLoadFunc]: ...
+
+    @overload
+    def register(self, name: str, func: BatchLoadFunc) -> BatchLoadFunc: ...
+
+    def register(
+        self, name: str, func: BatchLoadFunc | None = None
+    ) -> Callable[[BatchLoadFunc], BatchLoadFunc] | BatchLoadFunc:
+        """Register a batch load function, directly or as a decorator:
+
+        @loaders.register("users")
+        def load_users(ids):
+            return User.objects.in_bulk(ids)
+        """
+        if func is None:
+
+            def decorator(func: BatchLoadFunc) -> BatchLoadFunc:
+                return self.register(name, func)
+
+            return decorator
+        self.loaders[name] = func
+        return func
+
+    def get(self, name: str) -> BatchLoadFunc:
+        try:
+            return self.loaders[name]
+        except KeyError:
+            msg = f"No data loader named {name!r} is registered"
+            raise template.TemplateSyntaxError(msg) from None
+
+    def reset(self) -> None:
+        self.loaders.clear()
+
+
+loaders = LoaderRegistry()
+
+
+@final
+class DataLoader:
+    """Batches and caches the loads of one batch load function.
+
+    Keys are queued as components using the loader resolve their props. The first
+    time a loaded value is used, every queued key is loaded in a single call, so
+    components whose props were resolved before then share one batch. Loaded values
+    are cached for the rest of the render or request.
+    """
+
+    def __init__(self, batch_load: BatchLoadFunc) -> None:
+        self.batch_load = batch_load
+        self.is_async = inspect.iscoroutinefunction(batch_load)
+        self.cache: dict[Hashable, Any] = {}
+        # Used as an ordered set
+        self.pending: dict[Hashable, None] = {}
+
+    def queue(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            if key is not None and key not in self.cache:
+                self.pending[key] = None
+
+    def load(self, key: Hashable) -> Any:
+        if key is None:
+            return None
+        if key not in self.cache:
+            self.queue([key])
+            if self.is_async and _collecting_keys.get():
+                return None
+            self.dispatch()
+        return self.cache[key]
+
+    def load_lazy(self, key: Hashable) -> Any:
+        """Queue a key and return a lazy object that loads it on first use."""
+        if key is None:
+            return None
+        if key in self.cache:
+            return self.cache[key]
+        self.queue([key])
+        return SimpleLazyObject(partial(self.load, key))
+
+    def dispatch(self) -> None:
+        keys = list(self.pending)
+        self.pending.clear()
+        if not keys:
+            return
+        if self.is_async:
+            batch_load = async_to_sync(cast(AsyncBatchLoadFunc, self.batch_load))
+        else:
+            batch_load = cast(SyncBatchLoadFunc, self.batch_load)
+        self._store(keys, batch_load(keys))
+
+    async def adispatch(self) -> None:
+        keys = list(self.pending)
+        self.pending.clear()
+        if not keys:
+            return
+        if self.is_async:
+            loaded = await cast(AsyncBatchLoadFunc, self.batch_load)(keys)
+        else:
+            loaded = await sync_to_async(cast(SyncBatchLoadFunc, self.batch_load))(keys)
+        self._store(keys, loaded)
+
+    def _store(self, keys: list[Hashable], loaded: BatchLoadResult) -> None:
+        if isinstance(loaded, Mapping):
+            self.cache.update((key, loaded.get(key)) for key in keys)
+            return
+        if len(loaded) != len(keys):
+            msg = (
+                f"Batch load function {self.batch_load!r} returned {len(loaded)} "
+                f"values for {len(keys)} keys"
+            )
+            raise ValueError(msg)
+        self.cache.update(zip(keys, loaded, strict=True))
+
+
+def get_data_loader(context: Context, name: str) -> DataLoader:
+    """Get the data loader for a batch load function, shared by the whole render.
+
+    Like the rendered components, data loaders are kept in the outermost render
+    context and shared with every template rendered for the same request.
+    """
+    render_state = cast("dict[str, Any]", context.render_context.dicts[0])
+    data_loaders: dict[str, DataLoader] | None = render_state.get(DATA_LOADERS_KEY)
+    if data_loaders is None:
+        request = getattr(context, "request", None)
+        data_loaders = getattr(request, DATA_LOADERS_KEY, None)
+        if data_loaders is None:
+            data_loaders = _current_data_loaders.get()
+        if data_loaders is None:
+            data_loaders = {}
+        if request is not None:
+            setattr(request, DATA_LOADERS_KEY, data_loaders)
+        render_state[DATA_LOADERS_KEY] = data_loaders
+    data_loader = data_loaders.get(name)
+    if data_loader is None:
+        data_loader = data_loaders[name] = DataLoader(loaders.get(name))
+    return data_loader
+
+
+def queue_loop_keys(
+    loop: ForLoop, attrs: ParsedTagBits, component: Component, context: Context
+) -> None:
+    """Queue the loaded prop keys of every iteration of the `{% for %}` loop a
+    `{% bird %}` tag is in, given the tag's attributes, so the component's instances
+    share one batch.
+
+    Called on the loop's first iteration. The loop's sequence is looked up again,
+    which is only done when that has no side effects: the sequence must be a list,
+    tuple or already evaluated queryset, reached without calling any methods.
+    Keys are only queued, so a key that differs from the one an iteration ends up
+    using only costs an extra key in the batch.
+    """
+    loaded_attrs = {
+        name: attrs[name] for name in component.loaded_props if name in attrs
+    }
+    if not loaded_attrs:
+        return
+    sequence = resolve_sequence(loop.sequence, loop.loopvars, context)
+    if sequence is None:
+        return
+
+    with context.push() as frame:
+        for item in sequence:
+            if len(loop.loopvars) == 1:
+                frame[loop.loopvars[0]] = item
+            else:
+                try:
+                    frame.update(zip(loop.loopvars, item, strict=True))
+                except (TypeError, ValueError):
+                    return
+            for name, expression in loaded_attrs.items():
+                try:
+                    key = expression.resolve(context, ignore_failures=True)
+                except Exception:
+                    # The iteration's own render reports the error, if it is rendered
+                    continue
+                if isinstance(key, Hashable):
+                    get_data_loader(context, component.loaded_props[name]).queue([key])
+
+
+def resolve_sequence(
+    expression: FilterExpression, loopvars: Sequence[str], context: Context
+) -> Sequence[Any] | QuerySet[Any] | None:
+    """Look up a `{% for %}` loop's sequence again, if that has no side effects."""
+    var = expression.var
+    if expression.filters or not isinstance(var, Variable) or var.lookups is None:
+        return None
+    root, *bits = var.lookups
+    # The loop variables now hold the current item, not what the sequence used
+    if root in loopvars:
+        return None
+    try:
+        current = context[root]
+    except KeyError:
+        return None
+    for bit in bits:
+        if callable(current):
+            return None
+        try:
+            current = current[bit]
+        except (TypeError, AttributeError, KeyError, ValueError, IndexError):
+            try:
+                current = getattr(current, bit)
+            except AttributeError:
+                return None
+    if isinstance(current, list | tuple):
+        return current
+    # The loop has already evaluated the queryset, so iterating it is free
+    if isinstance(current, QuerySet) and current._result_cache is not None:
+        return current
+    return None
+
+
+async def arender_to_string(
+    template_name: str | Sequence[str],
+    context: Mapping[str, Any] | None = None,
+    request: HttpRequest | None = None,
+    using: str | None = None,
+) -> str:
+    """Render a template, running its components' async batch load functions
+    concurrently before the final render.
+
+    The template is first rendered to collect the keys of every loaded prop whose
+    batch load function is a coroutine function; those props are `None` during this
+    render and its output is discarded, so it is kept apart from the final render
+    (see `is_collecting_keys`). All of the collected batches are then
+    awaited together with `asyncio.gather`, so the time spent waiting on them is
+    that of the slowest rather than the sum. Finally, the template is rendered again
+    with the loaded values.
+
+    Keys first seen during the final render, such as those of components rendered
+    only once a loaded value is known, are loaded synchronously as they are used.
+    """
+    data_loaders: dict[str, DataLoader] = {}
+    if request is not None:
+        setattr(request, DATA_LOADERS_KEY, data_loaders)
+    token = _current_data_loaders.set(data_loaders)
+    try:
+        collecting = _collecting_keys.set(True)
+        try:
+            await sync_to_async(render_to_string)(
+                template_name, context, request, using
+            )
+        finally:
+            _collecting_keys.reset(collecting)
+
+        await asyncio.gather(
+            *(
+                data_loader.adispatch()
+                for data_loader in data_loaders.values()
+                if data_loader.is_async and data_loader.pending
+            )
+        )
+
+        return await sync_to_async(render_to_string)(
+            template_name, context, request, using
+        )
+    finally:
+        _current_data_loaders.reset(token)
+
+
+async def arender(
+    request: HttpRequest,
+    template_name: str | Sequence[str],
+    context: Mapping[str, Any] | None = None,
+    content_type: str | None = None,
+    status: int | None = None,
+    using: str | None = None,
+) -> HttpResponse:
+    """Like `django.shortcuts.render`, rendering with `arender_to_string`."""
+    content = await arender_to_string(template_name, context, request, using)
+    return HttpResponse(content, content_type, status)
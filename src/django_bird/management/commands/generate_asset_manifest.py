@@ -7,6 +7,7 @@ from typing import final
 from django.core.management.base import BaseCommand
 
 from django_bird._typing import override
+from django_bird.manifest import ManifestFormat
 from django_bird.manifest import default_manifest_path
 from django_bird.manifest import generate_asset_manifest
 from django_bird.manifest import save_asset_manifest
@@ -26,12 +27,25 @@ class Command(BaseCommand):
             default=None,
             help="Path where the manifest file should be saved. Defaults to STATIC_ROOT/django_bird/manifest.json",
         )
+        parser.add_argument(
+            "--format",
+            type=str,
+            choices=[manifest_format.value for manifest_format in ManifestFormat],
+            default=None,
+            help="Format of the manifest file. Defaults to the format matching the --output suffix, or json",
+        )
 
     @override
     def handle(self, *args: Any, **options: Any) -> None:
         manifest_data = generate_asset_manifest()
-        output_path = options["output"] or default_manifest_path()
-        save_asset_manifest(manifest_data, output_path)
+        if options["format"]:
+            manifest_format = ManifestFormat(options["format"])
+        elif options["output"]:
+            manifest_format = ManifestFormat.from_path(options["output"])
+        else:
+            manifest_format = ManifestFormat.JSON
+        output_path = options["output"] or default_manifest_path(manifest_format)
+        save_asset_manifest(manifest_data, output_path, manifest_format)
         self.stdout.write(
             self.style.SUCCESS(
                 f"Asset manifest generated successfully at {output_path}"
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from typing import Any
+from typing import final
+
+from django.core.management.base import BaseCommand
+
+from django_bird._typing import override
+from django_bird.prerender import default_prerender_path
+from django_bird.prerender import prerender_components
+from django_bird.prerender import save_prerendered_components
+
+
+@final
+class Command(BaseCommand):
+    help: str = "Prerenders the components whose output does not depend on the context"
+
+    @override
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Path where the prerendered components should be saved. Defaults to STATIC_ROOT/django_bird/prerendered.json",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        prerendered = prerender_components()
+        output_path = options["output"] or default_prerender_path()
+        save_prerendered_components(prerendered, output_path)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Prerendered {len(prerendered)} components to {output_path}"
+            )
+        )
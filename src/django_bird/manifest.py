@@ -1,138 +1,299 @@
 from __future__ import annotations
 
-import hashlib
+import ast
 import json
 import logging
+import math
+import os
+import time
+from collections.abc import Mapping
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import replace
 from enum import Enum
 from pathlib import Path
+from threading import Lock
+from typing import final
 
 from django.conf import settings
 
+from django_bird.templates import ComponentGraph
 from django_bird.templates import gather_bird_tag_template_usage
 
-logger = logging.getLogger(__name__)
+from .conf import app_settings
 
-_manifest_cache = None
+logger = logging.getLogger(__name__)
 
+PYTHON_MANIFEST_VARIABLE = "MANIFEST"
 
-class PathPrefix(str, Enum):
-    """Path prefixes used for normalizing template paths."""
+# Delay in seconds before retrying a missing or invalid manifest, doubled after
+# each consecutive failure up to the maximum
+MANIFEST_RETRY_BACKOFF = 1.0
+MANIFEST_RETRY_BACKOFF_MAX = 60.0
 
-    PKG = "pkg"
-    APP = "app"
-    EXT = "ext"
 
-    def prepend_to(self, path: str) -> str:
-        """Generate a prefixed path string by prepending this prefix to a path.
+class ManifestFormat(str, Enum):
+    """File formats the asset manifest can be saved in and loaded from."""
 
-        Args:
-            path: The path to prefix
+    JSON = "json"
+    PYTHON = "python"
 
-        Returns:
-            str: A string with this prefix and the path
-        """
-        return f"{self.value}:{path}"
+    @property
+    def suffix(self) -> str:
+        """The file suffix used for manifests saved in this format."""
+        match self:
+            case ManifestFormat.JSON:
+                return ".json"
+            case ManifestFormat.PYTHON:
+                return ".py"
 
     @classmethod
-    def has_prefix(cls, path: str) -> bool:
-        """Check if a path already has one of the recognized prefixes.
+    def from_path(cls, path: Path | str) -> ManifestFormat:
+        """Infer the manifest format from a file path's suffix.
 
         Args:
-            path: The path to check
+            path: The manifest file path
 
         Returns:
-            bool: True if the path starts with any of the recognized prefixes
+            ManifestFormat: PYTHON for `.py` files, JSON for anything else
         """
-        return any(path.startswith(f"{prefix.value}:") for prefix in cls)
+        if Path(path).suffix == cls.PYTHON.suffix:
+            return cls.PYTHON
+        return cls.JSON
 
 
-def normalize_path(path: str) -> str:
-    """Normalize a template path to remove system-specific information.
+FileSignature = tuple[str, int, int, int]
 
-    Args:
-        path: The template path to normalize
 
-    Returns:
-        str: A normalized path without system-specific details
+@dataclass(frozen=True, slots=True)
+class ManifestState:
+    data: dict[str, Sequence[str]] | None = None
+    signature: FileSignature | None = None
+    next_check: float = 0.0
+    failures: int = 0
+
+
+@final
+class AssetManifest:
+    """Holds the loaded asset manifest and keeps it in sync with the file on disk.
+
+    Readers get the current manifest without ever waiting on a lock. Once the
+    check time has passed, a single reader stats the manifest file and, if it
+    changed, parses it and swaps in the new manifest in one attribute assignment;
+    other readers meanwhile keep getting the previous manifest. Missing or invalid
+    manifests are cached too and retried with exponential backoff.
+
+    How often a loaded manifest is checked for changes is controlled by the
+    `ASSET_MANIFEST_RELOAD_INTERVAL` app setting. By default it is never checked
+    again, only reloaded by an explicit call to `reload`.
     """
-    if PathPrefix.has_prefix(path):
-        return path
 
-    if "site-packages" in path:
-        parts = path.split("site-packages/")
-        if len(parts) > 1:
-            return PathPrefix.PKG.prepend_to(parts[1])
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._state = ManifestState()
 
-    if hasattr(settings, "BASE_DIR") and settings.BASE_DIR:  # type: ignore[misc]
-        base_dir = Path(settings.BASE_DIR).resolve()  # type: ignore[misc]
-        abs_path = Path(path).resolve()
+    def get(self) -> dict[str, Sequence[str]] | None:
+        state = self._state
+        if time.monotonic() < state.next_check:
+            return state.data
+        if not self._lock.acquire(blocking=False):
+            return state.data
         try:
-            if str(abs_path).startswith(str(base_dir)):
-                rel_path = abs_path.relative_to(base_dir)
-                return PathPrefix.APP.prepend_to(str(rel_path))
-        except ValueError:
-            # Path is not relative to BASE_DIR
-            pass
+            now = time.monotonic()
+            if now >= self._state.next_check:
+                self._refresh(now)
+        finally:
+            self._lock.release()
+        return self._state.data
+
+    def reload(self) -> dict[str, Sequence[str]] | None:
+        """Re-read the manifest from disk immediately, even if it appears unchanged."""
+        with self._lock:
+            self._refresh(time.monotonic(), force=True)
+        return self._state.data
+
+    def reset(self) -> None:
+        """Reset the manifest, used for testing."""
+        with self._lock:
+            self._state = ManifestState()
+
+    def _refresh(self, now: float, force: bool = False) -> None:
+        state = self._state
+        found = self._find()
+
+        if found is None:
+            failures = state.failures + 1
+            self._state = ManifestState(
+                next_check=now + self._backoff(failures), failures=failures
+            )
+            return
+
+        path, manifest_format, signature = found
+
+        if signature == state.signature and not force:
+            if state.failures:
+                next_check = now + self._backoff(state.failures)
+            else:
+                next_check = now + self._reload_interval()
+            self._state = replace(state, next_check=next_check)
+            return
+
+        data = read_asset_manifest(path, manifest_format)
+
+        if data is None:
+            # Keep serving the last good manifest rather than swapping in a broken one
+            failures = state.failures + 1
+            self._state = replace(
+                state,
+                signature=signature,
+                next_check=now + self._backoff(failures),
+                failures=failures,
+            )
+            return
+
+        self._state = ManifestState(
+            data=data,
+            signature=signature,
+            next_check=now + self._reload_interval(),
+        )
+
+    def _find(self) -> tuple[Path, ManifestFormat, FileSignature] | None:
+        if not (hasattr(settings, "STATIC_ROOT") and settings.STATIC_ROOT):
+            return None
+        for manifest_format in (ManifestFormat.PYTHON, ManifestFormat.JSON):
+            path = default_manifest_path(manifest_format)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return (
+                path,
+                manifest_format,
+                (str(path), stat.st_ino, stat.st_size, stat.st_mtime_ns),
+            )
+        return None
+
+    @staticmethod
+    def _backoff(failures: int) -> float:
+        return min(
+            MANIFEST_RETRY_BACKOFF * 2 ** (failures - 1), MANIFEST_RETRY_BACKOFF_MAX
+        )
 
-    if path.startswith("/"):
-        hash_val = hashlib.md5(path.encode()).hexdigest()[:8]
-        filename = Path(path).name
-        return PathPrefix.EXT.prepend_to(f"{hash_val}/{filename}")
+    @staticmethod
+    def _reload_interval() -> float:
+        interval = app_settings.ASSET_MANIFEST_RELOAD_INTERVAL
+        return math.inf if interval is None else interval
 
-    # Return as is if it's already a relative path
-    return path
 
+asset_manifest = AssetManifest()
 
-def load_asset_manifest() -> dict[str, list[str]] | None:
+
+def load_asset_manifest() -> dict[str, Sequence[str]] | None:
     """Load asset manifest from the default location.
 
-    Returns a simple dict mapping template paths to lists of component names.
-    If the manifest cannot be loaded, returns None and falls back to runtime scanning.
+    Returns a simple dict mapping template keys (`loader:template_name`, see
+    `django_bird.templates.get_template_key`) to sequences of component names.
+    A Python module manifest (`manifest.py`) takes precedence over the JSON one
+    (`manifest.json`) when both exist. If the manifest cannot be loaded, returns
+    None and falls back to runtime scanning.
 
     Returns:
-        dict[str, list[str]] | None: Manifest data or None if not found or invalid
+        dict[str, Sequence[str]] | None: Manifest data or None if not found or invalid
     """
-    global _manifest_cache
+    return asset_manifest.get()
 
-    if _manifest_cache is not None:
-        return _manifest_cache
 
-    if hasattr(settings, "STATIC_ROOT") and settings.STATIC_ROOT:
-        manifest_path = default_manifest_path()
-        if manifest_path.exists():
-            try:
-                with open(manifest_path) as f:
-                    manifest_data = json.load(f)
-                    _manifest_cache = manifest_data
-                    return manifest_data
-            except json.JSONDecodeError:
-                logger.warning(
-                    f"Asset manifest at {manifest_path} contains invalid JSON. Falling back to registry."
-                )
-                return None
-            except (OSError, PermissionError) as e:
-                logger.warning(
-                    f"Error reading asset manifest at {manifest_path}: {str(e)}. Falling back to registry."
-                )
-                return None
-
-    # No manifest found, will fall back to registry
-    return None
+def read_asset_manifest(
+    path: Path | str, format: ManifestFormat | None = None
+) -> dict[str, Sequence[str]] | None:
+    """Read an asset manifest file.
+
+    Args:
+        path: Path of the manifest file
+        format: Format of the manifest, inferred from the file suffix if not given
+
+    Returns:
+        dict[str, Sequence[str]] | None: Manifest data or None if the file is invalid
+    """
+    path_obj = Path(path)
+    manifest_format = format or ManifestFormat.from_path(path_obj)
+
+    try:
+        match manifest_format:
+            case ManifestFormat.JSON:
+                with open(path_obj) as f:
+                    return json.load(f)
+            case ManifestFormat.PYTHON:
+                return _read_python_manifest(path_obj)
+    except (json.JSONDecodeError, SyntaxError, ValueError, AttributeError, TypeError):
+        logger.warning(
+            f"Asset manifest at {path_obj} is not a valid {manifest_format.value} manifest. Falling back to registry."
+        )
+        return None
+    except (OSError, PermissionError) as e:
+        logger.warning(
+            f"Error reading asset manifest at {path_obj}: {str(e)}. Falling back to registry."
+        )
+        return None
+
+
+def _read_python_manifest(path: Path) -> dict[str, Sequence[str]]:
+    # The manifest is evaluated as a literal rather than imported, so whoever can
+    # write to STATIC_ROOT cannot run code through it
+    module = ast.parse(path.read_text(), filename=str(path))
+    for statement in module.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and len(statement.targets) == 1
+            and isinstance(statement.targets[0], ast.Name)
+            and statement.targets[0].id == PYTHON_MANIFEST_VARIABLE
+        ):
+            manifest = ast.literal_eval(statement.value)
+            break
+    else:
+        msg = f"{path} does not define {PYTHON_MANIFEST_VARIABLE}"
+        raise AttributeError(msg)
+
+    if not isinstance(manifest, dict):
+        msg = f"{PYTHON_MANIFEST_VARIABLE} must be a dict, got {type(manifest)!r}"
+        raise TypeError(msg)
+
+    # Share each component name between all the templates using it
+    names: dict[str, str] = {}
+    data: dict[str, Sequence[str]] = {}
+    for template, component_names in manifest.items():
+        if not (
+            isinstance(template, str)
+            and isinstance(component_names, list | tuple)
+            and all(isinstance(name, str) for name in component_names)
+        ):
+            msg = (
+                f"{PYTHON_MANIFEST_VARIABLE} must map template keys to component names"
+            )
+            raise TypeError(msg)
+        data[template] = tuple(names.setdefault(name, name) for name in component_names)
+    return data
 
 
 def generate_asset_manifest() -> dict[str, list[str]]:
     """Generate a manifest by scanning templates for component usage.
 
+    Templates are keyed by their loader and template name (see
+    `django_bird.templates.get_template_key`), so a manifest generated on one
+    machine can be used on another with a different filesystem layout.
+
+    Each template's entry includes the components used inside the templates of
+    the components it uses, transitively, so nested components' assets are loaded
+    too.
+
     Returns:
-        dict[str, list[str]]: A dictionary mapping template paths to lists of component names.
+        dict[str, list[str]]: A dictionary mapping template keys to lists of component names.
     """
+    graph = ComponentGraph()
     template_component_map: dict[str, set[str]] = {}
 
-    for template_path, component_names in gather_bird_tag_template_usage():
-        # Convert Path objects to strings for JSON and normalize
-        original_path = str(template_path)
-        normalized_path = normalize_path(original_path)
-        template_component_map[normalized_path] = component_names
+    for template_key, component_names in gather_bird_tag_template_usage():
+        template_component_map[template_key] = graph.closure(component_names)
 
     manifest: dict[str, list[str]] = {
         template: sorted(list(components))
@@ -142,28 +303,66 @@ def generate_asset_manifest() -> dict[str, list[str]]:
     return manifest
 
 
-def save_asset_manifest(manifest_data: dict[str, list[str]], path: Path | str) -> None:
+def save_asset_manifest(
+    manifest_data: Mapping[str, Sequence[str]],
+    path: Path | str,
+    format: ManifestFormat | None = None,
+) -> None:
     """Save asset manifest to a file.
 
     Args:
         manifest_data: The manifest data to save
         path: Path where to save the manifest
+        format: Format to save the manifest in, inferred from the file suffix if not given
     """
     path_obj = Path(path)
     path_obj.parent.mkdir(parents=True, exist_ok=True)
+    manifest_format = format or ManifestFormat.from_path(path_obj)
 
-    with open(path_obj, "w") as f:
-        json.dump(manifest_data, f, indent=2)
+    match manifest_format:
+        case ManifestFormat.JSON:
+            with open(path_obj, "w") as f:
+                json.dump(manifest_data, f, indent=2)
+        case ManifestFormat.PYTHON:
+            path_obj.write_text(render_python_manifest(manifest_data))
 
 
-def default_manifest_path() -> Path:
+def render_python_manifest(manifest_data: Mapping[str, Sequence[str]]) -> str:
+    """Render manifest data as Python source defining it as a dict literal.
+
+    Component names are stored as tuples of string literals. The file is only ever
+    read as a literal, never imported, and every component name is held in memory
+    only once no matter how many templates use it.
+
+    Args:
+        manifest_data: The manifest data to render
+
+    Returns:
+        str: Python source defining the manifest as a module-level dict
+    """
+    lines = [
+        "# Generated by django-bird's generate_asset_manifest command. Do not edit.",
+        f"{PYTHON_MANIFEST_VARIABLE} = {{",
+    ]
+    for template, component_names in manifest_data.items():
+        names = "".join(f"{name!r}, " for name in component_names).rstrip()
+        lines.append(f"    {template!r}: ({names}),")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def default_manifest_path(format: ManifestFormat = ManifestFormat.JSON) -> Path:
     """Get the default manifest path.
 
+    Args:
+        format: The manifest format, which determines the file suffix
+
     Returns:
         Path: The default path for the asset manifest file
     """
     if hasattr(settings, "STATIC_ROOT") and settings.STATIC_ROOT:
-        return Path(settings.STATIC_ROOT) / "django_bird" / "manifest.json"
+        path = Path(settings.STATIC_ROOT) / "django_bird" / "manifest.json"
     else:
         # Fallback for when STATIC_ROOT is not set
-        return Path("django_bird-asset-manifest.json")
+        path = Path("django_bird-asset-manifest.json")
+    return path.with_suffix(format.suffix)
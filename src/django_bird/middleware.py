@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import random
+import re
+import time
+import uuid
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+from typing import cast
+from typing import final
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import HttpResponseBase
+from django.template.base import Template
+from django.template.response import SimpleTemplateResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_header_parameters
+
+from . import cache_control
+from . import queries
+from . import timing
+from ._typing import override
+from .components import RENDERED_COMPONENTS_KEY
+from .components import Component
+from .conf import app_settings
+from .dynamic import defer_dynamic_components
+from .dynamic import render_dynamic_components
+from .manifest import load_asset_manifest
+from .plugins import pm
+from .profiling import ComponentProfile
+from .profiling import profile_components
+from .staticfiles import get_component_assets
+from .templates import get_template_key
+from .templatetags.tags.asset import AssetTag
+from .templatetags.tags.asset import get_template_components
+from .templatetags.tags.asset import render_component_assets
+
+ASSET_PLACEHOLDERS = {tag.placeholder: tag for tag in AssetTag}
+
+PLACEHOLDER_PATTERN = re.compile(
+    "|".join(re.escape(placeholder) for placeholder in ASSET_PLACEHOLDERS).encode()
+)
+
+
+@final
+class DeferredAssetsMiddleware(MiddlewareMixin):
+    """Fill in the assets of the components rendered during a request.
+
+    With the `RENDER_TIME_ASSETS` app setting enabled, `{% bird:css %}` and
+    `{% bird:js %}` render placeholders instead of assets, and every component
+    rendered records itself on the request. Once the response is rendered, this
+    middleware replaces the placeholders with the assets of exactly those
+    components. Only `text/html` responses are changed, so the placeholders are
+    left alone in other content, such as HTML embedded in JSON.
+    """
+
+    @override
+    def process_response(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        rendered: dict[str, Component] | None = getattr(
+            request, RENDERED_COMPONENTS_KEY, None
+        )
+        if (
+            rendered is None
+            or not isinstance(response, HttpResponse)
+            or not is_html_response(response)
+        ):
+            return response
+
+        response.content = replace_asset_placeholders(
+            response.content, rendered.values(), response.charset
+        )
+        if response.has_header("Content-Length"):
+            response.headers["Content-Length"] = str(len(response.content))
+        return response
+
+
+def is_html_response(response: HttpResponseBase) -> bool:
+    """Whether a response's content is HTML, going by its `Content-Type` header."""
+    media_type, _ = parse_header_parameters(response.get("Content-Type", ""))
+    return media_type == "text/html"
+
+
+def replace_asset_placeholders(
+    content: bytes, rendered_components: Iterable[Component], charset: str = "utf-8"
+) -> bytes:
+    """Replace asset placeholders in rendered content with the components' assets.
+
+    The content is scanned once, and each asset tag's assets are rendered at most
+    once no matter how many placeholders for it appear.
+
+    Args:
+        content: The rendered response content
+        rendered_components: The components whose assets should be included
+        charset: The encoding of the content
+
+    Returns:
+        bytes: The content with all placeholders replaced
+    """
+    used_components = list(rendered_components)
+    replacements: dict[bytes, bytes] = {}
+
+    def replace(match: re.Match[bytes]) -> bytes:
+        placeholder = match.group(0)
+        if placeholder not in replacements:
+            asset_tag = ASSET_PLACEHOLDERS[placeholder.decode()]
+            replacements[placeholder] = render_component_assets(
+                used_components, asset_tag
+            ).encode(charset)
+        return replacements[placeholder]
+
+    return PLACEHOLDER_PATTERN.sub(replace, content)
+
+
+@final
+class AssetPreloadMiddleware(MiddlewareMixin):
+    """Add `Link` preload headers for the assets of a response's components.
+
+    For template responses, the components used in the response's template are
+    looked up (from the asset manifest in production) before the template is
+    rendered, and a `rel=preload` link for each of their assets is added to the
+    response's `Link` header. The header value is computed once per template and
+    cached until the asset manifest changes.
+
+    CDNs and servers that support HTTP 103 Early Hints can use these headers to
+    start asset downloads before the response body is sent.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._manifest: object | None = None
+        self._links: dict[str, str] = {}
+
+    def process_template_response(
+        self, request: HttpRequest, response: SimpleTemplateResponse
+    ) -> SimpleTemplateResponse:
+        template = getattr(
+            response.resolve_template(response.template_name), "template", None
+        )
+        if not isinstance(template, Template):
+            return response
+
+        links = self.get_links(template)
+        if links:
+            existing = response.headers.get("Link")
+            response.headers["Link"] = f"{existing}, {links}" if existing else links
+        return response
+
+    def get_links(self, template: Template) -> str:
+        """Get the `Link` header value preloading a template's component assets.
+
+        Args:
+            template: The template being rendered
+
+        Returns:
+            str: Comma-separated preload links, or an empty string if there are none
+        """
+        template_key = get_template_key(template)
+        if template_key is None or settings.DEBUG:
+            return render_preload_links(get_template_components(template))
+
+        manifest = load_asset_manifest()
+        if manifest is not self._manifest:
+            self._manifest = manifest
+            self._links = {}
+
+        links = self._links.get(template_key)
+        if links is None:
+            links = render_preload_links(get_template_components(template))
+            self._links[template_key] = links
+        return links
+
+
+def render_preload_links(used_components: Iterable[Component]) -> str:
+    """Render a `Link` header value preloading the assets of the given components.
+
+    Args:
+        used_components: The components whose assets should be preloaded
+
+    Returns:
+        str: Comma-separated preload links, in the same order as the asset tags
+    """
+    assets = {
+        asset
+        for component in used_components
+        for asset in get_component_assets(component)
+    }
+    links = (
+        asset.render_preload_link() for asset in sorted(assets, key=lambda a: a.path)
+    )
+    return ", ".join(link for link in links if link is not None)
+
+
+@final
+class ServerTimingMiddleware:
+    """Report per-component render times in a `Server-Timing` response header.
+
+    For a sampled fraction of requests (the `SERVER_TIMING_SAMPLE_RATE` app
+    setting), every component render is counted and timed, and the components with
+    the most exclusive render time are added to the response's `Server-Timing`
+    header, up to `SERVER_TIMING_MAX_ENTRIES` of them.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponseBase]
+        | Callable[[HttpRequest], Awaitable[HttpResponseBase]],
+    ) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        pm.register_recorder(timing, timing.__name__)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        # Not in async mode, so `get_response` is synchronous
+        get_response = cast(
+            Callable[[HttpRequest], HttpResponseBase], self.get_response
+        )
+        if not self.sampled():
+            return get_response(request)
+        with timing.record_component_timings() as timings:
+            response = get_response(request)
+        return self.add_header(response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        get_response = cast(
+            Callable[[HttpRequest], Awaitable[HttpResponseBase]], self.get_response
+        )
+        if not self.sampled():
+            return await get_response(request)
+        with timing.record_component_timings() as timings:
+            response = await get_response(request)
+        return self.add_header(response, timings)
+
+    def sampled(self) -> bool:
+        sample_rate = app_settings.SERVER_TIMING_SAMPLE_RATE
+        return sample_rate >= 1 or random.random() < sample_rate
+
+    def add_header(
+        self, response: HttpResponseBase, timings: timing.ComponentTimings
+    ) -> HttpResponseBase:
+        value = timings.render_server_timing(app_settings.SERVER_TIMING_MAX_ENTRIES)
+        if value:
+            existing = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = (
+                f"{existing}, {value}" if existing else value
+            )
+        return response
+
+
+@final
+class ComponentQueriesMiddleware:
+    """Attribute the database queries made during a request to components.
+
+    Every query is counted and timed against the innermost component being rendered
+    when it runs. After the response is produced, a summary is logged to the
+    `django_bird.queries` logger and the per-component counts are passed to the
+    `report_component_queries` plugin hook.
+
+    Queries are only attributed on the thread rendering the templates, so this
+    middleware only runs synchronously.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+        pm.register_recorder(queries, queries.__name__)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        with queries.record_component_queries() as log:
+            response = self.get_response(request)
+        log.report(request)
+        return response
+
+
+@final
+class ComponentProfileMiddleware:
+    """Write a component render profile for every request.
+
+    Each request's profile is written in collapsed stack format to a `.folded` file
+    in the directory set by the `PROFILE_DIR` app setting, ready to be loaded into
+    speedscope or turned into a flame graph with flamegraph.pl. The middleware is
+    disabled when `PROFILE_DIR` is not set.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponseBase]
+        | Callable[[HttpRequest], Awaitable[HttpResponseBase]],
+    ) -> None:
+        if app_settings.PROFILE_DIR is None:
+            raise MiddlewareNotUsed
+        self.profile_dir = Path(app_settings.PROFILE_DIR)
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        # Not in async mode, so `get_response` is synchronous
+        get_response = cast(
+            Callable[[HttpRequest], HttpResponseBase], self.get_response
+        )
+        with profile_components() as profile:
+            response = get_response(request)
+        self.write_profile(request, profile)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        get_response = cast(
+            Callable[[HttpRequest], Awaitable[HttpResponseBase]], self.get_response
+        )
+        with profile_components() as profile:
+            response = await get_response(request)
+        self.write_profile(request, profile)
+        return response
+
+    def write_profile(self, request: HttpRequest, profile: ComponentProfile) -> None:
+        if not profile.samples:
+            return
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", request.path).strip("-") or "index"
+        timestamp = time.strftime("%Y%m%dT%H%M%S")
+        profile.write(
+            self.profile_dir
+            / f"{timestamp}-{request.method}-{slug}-{uuid.uuid4().hex[:8]}.folded"
+        )
+
+
+@final
+class DynamicComponentsMiddleware:
+    """Render the `{% bird ... dynamic %}` components of cached pages per request.
+
+    While a response is produced, dynamic components render a placeholder holding
+    their signed props and slot content instead of their output. This middleware
+    then renders them into the response for the current request, whether the
+    response was just rendered or served from a cache inside this middleware, such
+    as Django's `cache_page` or cache middleware. The cached page holds only the
+    placeholders, so it can be shared between users while the dynamic components
+    stay per-request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponseBase]
+        | Callable[[HttpRequest], Awaitable[HttpResponseBase]],
+    ) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        # Not in async mode, so `get_response` is synchronous
+        get_response = cast(
+            Callable[[HttpRequest], HttpResponseBase], self.get_response
+        )
+        with defer_dynamic_components():
+            response = get_response(request)
+        return self.render_dynamic_components(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        get_response = cast(
+            Callable[[HttpRequest], Awaitable[HttpResponseBase]], self.get_response
+        )
+        with defer_dynamic_components():
+            response = await get_response(request)
+        return await sync_to_async(self.render_dynamic_components)(request, response)
+
+    def render_dynamic_components(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        if not isinstance(response, HttpResponse):
+            return response
+        response.content = render_dynamic_components(
+            response.content, request, response.charset
+        )
+        if response.has_header("Content-Length"):
+            response.headers["Content-Length"] = str(len(response.content))
+        return response
+
+
+@final
+class CacheControlMiddleware:
+    """Set a response's caching headers from the components rendered in it.
+
+    Components declare how responses containing them may be cached with
+    `{% bird:cache_control %}`. The policies of all components rendered during a
+    request are combined into the most restrictive one, which is added to the
+    response's `Cache-Control` and `Vary` headers. Responses without any
+    components declaring a policy are left as they are.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponseBase]
+        | Callable[[HttpRequest], Awaitable[HttpResponseBase]],
+    ) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        pm.register_recorder(cache_control, cache_control.__name__)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.async_mode:
+            return self.__acall__(request)
+        # Not in async mode, so `get_response` is synchronous
+        get_response = cast(
+            Callable[[HttpRequest], HttpResponseBase], self.get_response
+        )
+        with cache_control.record_cache_policies() as policies:
+            response = get_response(request)
+        if policies.policy is not None:
+            policies.policy.patch_response(response)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        get_response = cast(
+            Callable[[HttpRequest], Awaitable[HttpResponseBase]], self.get_response
+        )
+        with cache_control.record_cache_policies() as policies:
+            response = await get_response(request)
+        if policies.policy is not None:
+            policies.policy.patch_response(response)
+        return response
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from collections.abc import Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+from typing import cast
+
+from django.template.context import Context
+
+NESTED_RENDERS_KEY = "_django_bird_nested_renders"
+
+
+@dataclass(frozen=True, slots=True)
+class NestedRender:
+    """A component rendered as part of another component's render.
+
+    `rendered` is False for components whose output was only included, like
+    prerendered components and ESI and lazy placeholders, which render hooks are not
+    called for.
+    """
+
+    name: str
+    rendered: bool = True
+
+
+def get_recordings(context: Context) -> list[list[NestedRender]] | None:
+    render_state = cast("dict[str, Any]", context.render_context.dicts[0])
+    return render_state.get(NESTED_RENDERS_KEY)
+
+
+@contextmanager
+def record_nested_renders(context: Context) -> Iterator[list[NestedRender]]:
+    """Record the components rendered within the block, including those rendered by
+    nested components, so a reused render can record them as rendered again."""
+    render_state = cast("dict[str, Any]", context.render_context.dicts[0])
+    recordings: list[list[NestedRender]] = render_state.setdefault(
+        NESTED_RENDERS_KEY, []
+    )
+    recording: list[NestedRender] = []
+    recordings.append(recording)
+    try:
+        yield recording
+    finally:
+        recordings.pop()
+
+
+def note_nested_render(context: Context, name: str, rendered: bool = True) -> None:
+    """Add a component render to every recording in progress, if there are any."""
+    recordings = get_recordings(context)
+    if not recordings:
+        return
+    render = NestedRender(name, rendered)
+    for recording in recordings:
+        recording.append(render)
+
+
+def note_nested_renders(context: Context, renders: Sequence[NestedRender]) -> None:
+    """Add the component renders of a reused render to every recording in progress."""
+    recordings = get_recordings(context)
+    if not recordings:
+        return
+    for recording in recordings:
+        recording.extend(renders)
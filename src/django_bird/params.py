@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import itertools
+import re
+from collections.abc import Iterable
+from collections.abc import Mapping
 from dataclasses import dataclass
 from dataclasses import field
 from typing import TYPE_CHECKING
@@ -9,15 +13,19 @@ from django import template
 from django.template.base import FilterExpression
 from django.template.base import VariableDoesNotExist
 from django.template.context import Context
+from django.utils.html import conditional_escape
 from django.utils.safestring import SafeString
 from django.utils.safestring import mark_safe
 
+from .loaders import get_data_loader
 from .templatetags.tags.bird import BirdNode
-from .templatetags.tags.prop import PropNode
 
 if TYPE_CHECKING:
     from django_bird.components import Component
 
+# Attribute names, without any of the characters HTML does not allow in them
+ATTR_NAME_PATTERN = re.compile(r"[^\s\"'>/=\x00-\x1f\x7f]+")
+
 
 @dataclass
 class Params:
@@ -30,10 +38,7 @@ class Params:
 
         attrs_to_remove = set()
 
-        for node in component.nodelist:
-            if not isinstance(node, PropNode):
-                continue
-
+        for node in component.prop_nodes:
             value = Value(node.default)
 
             for idx, attr in enumerate(self.attrs):
@@ -58,7 +63,10 @@ class Params:
         for idx in sorted(attrs_to_remove, reverse=True):
             self.attrs.pop(idx)
 
-        return {prop.name: prop.render_prop(context) for prop in self.props}
+        props = {prop.name: prop.render_prop(context) for prop in self.props}
+        for name, loader in component.loaded_props.items():
+            props[name] = get_data_loader(context, loader).load_lazy(props[name])
+        return props
 
     def render_attrs(self, context: Context) -> SafeString:
         rendered = " ".join(attr.render_attr(context) for attr in self.attrs)
@@ -66,12 +74,89 @@ class Params:
 
     @classmethod
     def from_node(cls, node: BirdNode) -> Params:
+        return cls.from_attrs(node.attrs)
+
+    @classmethod
+    def from_attrs(cls, attrs: Mapping[str, FilterExpression | str | bool]) -> Params:
         return cls(
-            attrs=[Param(key, Value(value)) for key, value in node.attrs.items()],
+            attrs=[Param(key, Value(value)) for key, value in attrs.items()],
             props=[],
         )
 
 
+@dataclass(frozen=True, slots=True)
+class PropSpec:
+    name: str
+    default: Value
+    # A value passed as-is, such as from Python, is not resolved
+    value: Value | Any
+    loader: str | None
+
+    def resolve(self, context: Context) -> Any:
+        """Resolve the value passed for the prop, or its default if that is None."""
+        value = (
+            self.value.resolve(context) if isinstance(self.value, Value) else self.value
+        )
+        if value is None:
+            value = self.default.resolve(context)
+        return value
+
+
+@dataclass(frozen=True, slots=True)
+class ParamsPlan:
+    """Params matched against a component's props once, to render it many times.
+
+    Which attributes are props depends only on their names, so it is worked out once
+    instead of on every render. Resolving the values still happens per render.
+    """
+
+    props: tuple[PropSpec, ...]
+    attrs: tuple[Param, ...]
+
+    @classmethod
+    def bind(cls, params: Params, component: Component) -> ParamsPlan:
+        attrs = {param.name: param for param in params.attrs}
+        props: list[PropSpec] = []
+        for node in component.prop_nodes:
+            attr = attrs.pop(node.name, None)
+            value = None if attr is None else attr.value
+            props.append(PropSpec(node.name, Value(node.default), value, node.loader))
+        return cls(props=tuple(props), attrs=tuple(attrs.values()))
+
+    @classmethod
+    def from_values(cls, values: Mapping[str, Any], component: Component) -> ParamsPlan:
+        """Bind Python values, which are used as they are instead of being resolved.
+
+        Attribute values are escaped, since `{{ attrs }}` is rendered as safe, and
+        attribute names must be valid HTML attribute names, or `ValueError` is raised.
+        """
+        params = Params()
+        for name, value in values.items():
+            if name not in component.prop_names:
+                if not ATTR_NAME_PATTERN.fullmatch(name):
+                    msg = f"{name!r} is not a valid attribute name"
+                    raise ValueError(msg)
+                if value is not None and not isinstance(value, bool):
+                    value = conditional_escape(value)
+            params.attrs.append(Param(name, value))
+        return cls.bind(params, component)
+
+    def render_props(self, context: Context) -> dict[str, Any]:
+        props: dict[str, Any] = {}
+        for prop in self.props:
+            value = prop.resolve(context)
+            if prop.loader is not None:
+                value = get_data_loader(context, prop.loader).load_lazy(value)
+            props[prop.name] = value
+        return props
+
+    def render_attrs(self, context: Context, extra: Iterable[Param] = ()) -> SafeString:
+        rendered = " ".join(
+            attr.render_attr(context) for attr in itertools.chain(self.attrs, extra)
+        )
+        return mark_safe(rendered)
+
+
 @dataclass
 class Param:
     name: str
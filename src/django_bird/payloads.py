@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from urllib.parse import urlencode
+
+from django.core import signing
+from django.http import HttpRequest
+from django.template.context import Context
+from django.urls import reverse
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from .components import components
+from .components import get_rendered_components
+from .conf import app_settings
+from .nested import note_nested_render
+from .params import Value
+from .templatetags.tags.bird import BirdNode
+
+# The query parameter holding a serialized payload in the URLs of payload views
+PAYLOAD_PARAM = "c"
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentPayload:
+    """A component's name, resolved props and rendered slots, to render it later.
+
+    Payloads are signed when serialized, so a payload read back from a URL or a
+    cached page can be trusted to have been created by this site.
+    """
+
+    name: str
+    props: dict[str, Any] = field(default_factory=dict)
+    slots: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_node(cls, node: BirdNode, context: Context) -> ComponentPayload:
+        """Capture a `{% bird %}` tag's component, attribute values and slot content.
+
+        The attributes are resolved and the slot content is rendered in `context`,
+        as they would be if the tag rendered its component there.
+        """
+        component = components.get_component(node.get_component_name(context))
+        props = {
+            name: Value(value).resolve(context) for name, value in node.attrs.items()
+        }
+        slot_context = context.new() if node.isolated_context else context
+        slots = component.get_bound_component(node).fill_slots(slot_context)
+        return cls(
+            name=component.name,
+            props=props,
+            slots={
+                name: str(content)
+                for name, content in slots.items()
+                if content is not None
+            },
+        )
+
+    def dumps(self, salt: str) -> str:
+        return signing.dumps(
+            {"name": self.name, "props": self.props, "slots": self.slots},
+            salt=salt,
+            compress=True,
+        )
+
+    @classmethod
+    def loads(
+        cls, token: str, salt: str, max_age: int | None = None
+    ) -> ComponentPayload:
+        """Read a serialized payload, raising `django.core.signing.BadSignature` if
+        it was not signed with `salt` by this site or is older than `max_age`."""
+        data = signing.loads(token, salt=salt, max_age=max_age)
+        return cls(name=data["name"], props=data["props"], slots=data["slots"])
+
+    def render(self, request: HttpRequest | None = None) -> SafeString:
+        # The slots were rendered and signed by this site, so they are safe
+        slots = {name: mark_safe(content) for name, content in self.slots.items()}
+        return components.get_component(self.name).render(
+            self.props, slots, request=request
+        )
+
+
+def dumps_node(node: BirdNode, context: Context, salt: str) -> str:
+    """Capture and serialize a `{% bird %}` tag for rendering later.
+
+    Raises:
+        TypeError, ValueError: If the tag's props cannot be serialized
+    """
+    return dumps_payload(ComponentPayload.from_node(node, context), context, salt)
+
+
+def dumps_payload(payload: ComponentPayload, context: Context, salt: str) -> str:
+    """Serialize a payload captured from a `{% bird %}` tag rendered in `context`.
+
+    With `RENDER_TIME_ASSETS`, the component is recorded as rendered so that its
+    assets are still loaded by the page.
+
+    Raises:
+        TypeError, ValueError: If the payload's props cannot be serialized
+    """
+    token = payload.dumps(salt)
+    note_nested_render(context, payload.name, rendered=False)
+    if app_settings.RENDER_TIME_ASSETS:
+        component = components.get_component(payload.name)
+        get_rendered_components(context)[component.name] = component
+    return token
+
+
+def get_payload_url(view_name: str, token: str) -> str:
+    return f"{reverse(view_name)}?{urlencode({PAYLOAD_PARAM: token})}"
@@ -4,16 +4,61 @@ from collections.abc import Callable
 from collections.abc import Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Any
 
 from pluggy import HookspecMarker
 
 if TYPE_CHECKING:
+    from django.http import HttpRequest
+    from django.template.context import Context
+
+    from django_bird.components import Component
+    from django_bird.loaders import BatchLoadFunc
+    from django_bird.queries import ComponentQueries
     from django_bird.staticfiles import Asset
     from django_bird.staticfiles import AssetType
 
 hookspec = HookspecMarker("django_bird")
 
 
+@hookspec
+def after_component_render(
+    component: Component, props: dict[str, Any] | None, context: Context, elapsed: float
+) -> None:
+    """Called after a component has been rendered.
+
+    Receives the same arguments as `before_component_render`, plus `elapsed`: the time
+    in seconds spent rendering the component, including resolving its props and
+    attributes, rendering its slots and rendering any nested components.
+
+    When no plugin implements this hook or `before_component_render`, components are
+    rendered without any hook overhead.
+    """
+
+
+@hookspec
+def before_component_render(
+    component: Component, props: dict[str, Any] | None, context: Context
+) -> None:
+    """Called before a component's slots and template are rendered.
+
+    This hook is called for every component render, after the component's props have
+    been resolved. It receives the `Component` being rendered (`component.name` is the
+    name it was rendered with), the resolved props and the template context the
+    component is being rendered in.
+
+    Components used in the slot content passed to this component are rendered after
+    this hook is called and before `after_component_render`, so their renders nest
+    inside this one.
+
+    When the output of a pure component is reused, this hook is also called for the
+    components rendered as part of it, with `props` set to `None`.
+
+    Implementations run on every component render, so they should be cheap. This hook
+    is intended for instrumentation, such as APM tracing or metrics.
+    """
+
+
 @hookspec
 def collect_component_assets(template_path: Path) -> Iterable[Asset]:
     """Collect all assets associated with a component.
@@ -64,6 +109,19 @@ def ready() -> None:
     """
 
 
+@hookspec
+def register_loaders(
+    register_loader: Callable[[str, BatchLoadFunc], BatchLoadFunc],
+) -> None:
+    """Register batch load functions for component props.
+
+    This hook allows plugins to register the batch load functions that component
+    props can name with `{% bird:prop <name> load="<loader>" %}`. Each function
+    receives a list of keys and returns a mapping of keys to values, or a sequence
+    of values in the same order as the keys.
+    """
+
+
 @hookspec
 def register_asset_types(register_type: Callable[[AssetType], None]) -> None:
     """Register a new type of asset.
@@ -73,3 +131,20 @@ def register_asset_types(register_type: Callable[[AssetType], None]) -> None:
     what file extension it uses, and what django-bird asset templatetag it should be
     rendered with.
     """
+
+
+@hookspec
+def report_component_queries(
+    request: HttpRequest, queries: list[ComponentQueries]
+) -> None:
+    """Called with the database queries made by each component during a request.
+
+    This hook is called by `ComponentQueriesMiddleware` after the response has been
+    produced. `queries` holds one `ComponentQueries` for every component that made
+    queries, with its number of renders, its query count and time (excluding the
+    queries of nested components) and the most queries made by a single render,
+    ordered by query count.
+
+    Plugins can use this hook to send per-component query counts to a metrics or
+    APM service, or to flag components that make queries on every render.
+    """
@@ -1,12 +1,83 @@
 from __future__ import annotations
 
 import importlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
 
 import pluggy
 
+from django_bird._typing import override
 from django_bird.plugins import hookspecs
 
-pm = pluggy.PluginManager("django_bird")
+COMPONENT_RENDER_HOOKS = ("before_component_render", "after_component_render")
+
+_active_recorders: ContextVar[int] = ContextVar(
+    "django_bird_active_render_recorders", default=0
+)
+
+
+class BirdPluginManager(pluggy.PluginManager):
+    """Plugin manager that tracks whether any component render hooks are implemented.
+
+    Component rendering is a hot path, so instead of calling into pluggy for every
+    component, `BoundComponent.render` checks `component_render_hooks_active`. It is
+    true when a plugin implements the render hooks, which is recomputed whenever a
+    plugin is registered or unregistered, or while a render recorder is recording.
+
+    Render recorders are plugins that only collect data for some requests, such as
+    the timings for `Server-Timing`. They are registered with `register_recorder`
+    and only make components call the render hooks within
+    `record_component_renders`, so other requests render without hook overhead.
+    """
+
+    has_component_render_hooks: bool = False
+
+    def __init__(self, project_name: str) -> None:
+        super().__init__(project_name)
+        self._recorders: set[str] = set()
+
+    @property
+    def component_render_hooks_active(self) -> bool:
+        return self.has_component_render_hooks or _active_recorders.get() > 0
+
+    def register_recorder(self, plugin: object, name: str) -> None:
+        """Register a render recorder plugin, if it is not registered already."""
+        self._recorders.add(name)
+        if not self.is_registered(plugin):
+            self.register(plugin, name)
+
+    @contextmanager
+    def record_component_renders(self) -> Iterator[None]:
+        """Call the component render hooks of render recorders within the block."""
+        token = _active_recorders.set(_active_recorders.get() + 1)
+        try:
+            yield
+        finally:
+            _active_recorders.reset(token)
+
+    @override
+    def register(self, plugin: object, name: str | None = None) -> str | None:
+        plugin_name = super().register(plugin, name)
+        self._update_component_render_hooks()
+        return plugin_name
+
+    @override
+    def unregister(self, plugin: object | None = None, name: str | None = None) -> Any:
+        unregistered = super().unregister(plugin, name)
+        self._update_component_render_hooks()
+        return unregistered
+
+    def _update_component_render_hooks(self) -> None:
+        self.has_component_render_hooks = any(
+            hookimpl.plugin_name not in self._recorders
+            for hook_name in COMPONENT_RENDER_HOOKS
+            for hookimpl in getattr(self.hook, hook_name).get_hookimpls()
+        )
+
+
+pm = BirdPluginManager("django_bird")
 pm.add_hookspecs(hookspecs)
 
 pm.load_setuptools_entrypoints("django-bird")
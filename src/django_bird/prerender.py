@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from threading import Lock
+from typing import final
+
+from django.conf import settings
+from django.template.base import TextNode
+from django.template.defaulttags import CommentNode
+from django.template.defaulttags import LoadNode as DjangoLoadNode
+from django.template.exceptions import TemplateDoesNotExist
+from django.template.exceptions import TemplateSyntaxError
+
+from .components import Component
+from .components import components
+from .templates import ComponentGraph
+from .templates import gather_bird_tag_template_usage
+from .templatetags.tags.bird import BirdNode
+from .templatetags.tags.bird import PrerenderedNode
+from .templatetags.tags.bird import is_blank
+from .templatetags.tags.load import LoadNode
+from .templatetags.tags.prop import PropNode
+from .templatetags.tags.pure import PureNode
+
+logger = logging.getLogger(__name__)
+
+# Nodes that render the same output, or nothing, in any context
+STATIC_NODE_TYPES = (
+    CommentNode,
+    DjangoLoadNode,
+    LoadNode,
+    PrerenderedNode,
+    PropNode,
+    PureNode,
+    TextNode,
+)
+
+PrerenderedData = dict[str, dict[str, str]]
+
+
+def is_static_component(component: Component, _seen: set[str] | None = None) -> bool:
+    """Whether a component renders the same output in any context.
+
+    This is the case when its template contains only text, comments, `{% load %}`
+    and the tags that declare props or purity, and `{% bird %}` tags without
+    attributes or content for other static components. Props are allowed since,
+    without any variables, the template cannot use them.
+    """
+    seen = set() if _seen is None else _seen
+    if component.name in seen:
+        return False
+    seen.add(component.name)
+    for node in component.nodelist:
+        if isinstance(node, STATIC_NODE_TYPES):
+            continue
+        if isinstance(node, BirdNode) and is_static_tag(node, seen):
+            continue
+        return False
+    return True
+
+
+def is_static_tag(node: BirdNode, seen: set[str] | None = None) -> bool:
+    """Whether a `{% bird %}` tag renders the same output in any context."""
+    if node.attrs or node.fragment or node.esi or node.dynamic or node.lazy:
+        return False
+    if not is_blank(node.nodelist):
+        return False
+    try:
+        component = components.get_component(node.name.strip("\"'"))
+    except TemplateDoesNotExist:
+        return False
+    return is_static_component(component, seen)
+
+
+def prerender_components() -> PrerenderedData:
+    """Prerender every static component used in the project's templates.
+
+    Returns:
+        PrerenderedData: The tree id and output of each static component, by name
+    """
+    graph = ComponentGraph()
+    names: set[str] = set()
+    for _template_key, component_names in gather_bird_tag_template_usage():
+        names |= component_names
+
+    prerendered: PrerenderedData = {}
+    for name in sorted(graph.closure(names)):
+        try:
+            component = components.get_component(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            continue
+        if is_static_component(component):
+            prerendered[name] = {
+                "id": components.get_tree_id(component),
+                "html": component.render(),
+            }
+    return prerendered
+
+
+def save_prerendered_components(data: PrerenderedData, path: Path | str) -> None:
+    path_obj = Path(path)
+    path_obj.parent.mkdir(parents=True, exist_ok=True)
+    with open(path_obj, "w") as f:
+        json.dump(data, f, indent=2)
+    prerendered_components.reset()
+
+
+def default_prerender_path() -> Path:
+    """Get the default path of the prerendered components file."""
+    if hasattr(settings, "STATIC_ROOT") and settings.STATIC_ROOT:
+        return Path(settings.STATIC_ROOT) / "django_bird" / "prerendered.json"
+    # Fallback for when STATIC_ROOT is not set
+    return Path("django_bird-prerendered.json")
+
+
+@final
+class PrerenderedComponents:
+    """The output of the static components prerendered by the
+    `prerender_components` command, read from the default location on first use.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._data: PrerenderedData | None = None
+
+    def get(self, name: str) -> dict[str, str] | None:
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._data = self._read()
+        return self._data.get(name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data = None
+
+    @staticmethod
+    def _read() -> PrerenderedData:
+        path = default_prerender_path()
+        if not path.exists():
+            return {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read prerendered components at %s: %s", path, e)
+            return {}
+        if not isinstance(data, dict):
+            logger.warning("Prerendered components at %s must be an object", path)
+            return {}
+        return data
+
+
+prerendered_components = PrerenderedComponents()
+
+
+def get_prerendered_output(name: str) -> str | None:
+    """Get the prerendered output of a component, if it is current.
+
+    Output prerendered from a different version of the component's template, or of
+    the template of a component it uses, is ignored. Nothing is prerendered with `DEBUG` on, so template changes show up.
+    """
+    if settings.DEBUG:
+        return None
+    entry = prerendered_components.get(name)
+    if entry is None:
+        return None
+    try:
+        component = components.get_component(name)
+    except TemplateDoesNotExist:
+        return None
+    if components.get_tree_id(component) != entry.get("id"):
+        return None
+    return entry.get("html")
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import IO
+from typing import final
+
+from django.template.context import Context
+
+from .loaders import is_collecting_keys
+
+UNKNOWN_TEMPLATE = "<unknown template>"
+
+_current_profile: ContextVar[ComponentProfile | None] = ContextVar(
+    "django_bird_component_profile", default=None
+)
+
+# Number of profiles being recorded in any thread, checked before the ContextVar so
+# renders pay only a global lookup when nothing is being profiled
+_active_profiles = 0
+_active_profiles_lock = Lock()
+
+
+@dataclass(slots=True)
+class Frame:
+    path: str
+    start: float
+    children: float = 0.0
+
+
+@final
+class ComponentProfile:
+    """Self time of each stack of component render frames.
+
+    Frames are pushed for each `{% bird %}` tag, component render, slot fill and
+    `{% bird:slot %}` tag, below a root frame named after the template being
+    rendered. Stacks are stored in the collapsed format, one `;`-separated string
+    per stack, understood by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self) -> None:
+        self.samples: dict[str, float] = {}
+        self._stack: list[Frame] = []
+
+    @contextmanager
+    def frame(self, name: str, context: Context) -> Iterator[None]:
+        """Record the time spent in the block as a frame named `name`."""
+        if self._stack:
+            parent = self._stack[-1].path
+        else:
+            template = getattr(context, "template", None)
+            parent = _clean(getattr(template, "name", None) or UNKNOWN_TEMPLATE)
+        frame = Frame(path=f"{parent};{_clean(name)}", start=perf_counter())
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = perf_counter() - frame.start
+            self.samples[frame.path] = (
+                self.samples.get(frame.path, 0.0) + elapsed - frame.children
+            )
+            if self._stack:
+                self._stack[-1].children += elapsed
+
+    def collapsed(self) -> str:
+        """Render the profile in collapsed stack format, with self time in microseconds."""
+        lines = [
+            f"{path} {round(seconds * 1_000_000)}"
+            for path, seconds in sorted(self.samples.items())
+        ]
+        return "".join(f"{line}\n" for line in lines)
+
+    def write(self, file: Path | str | IO[str]) -> None:
+        """Write the profile in collapsed stack format to a path or text file."""
+        if isinstance(file, Path | str):
+            Path(file).write_text(self.collapsed())
+        else:
+            file.write(self.collapsed())
+
+
+def get_active_profile() -> ComponentProfile | None:
+    """Get the profile being recorded for the current thread or task, if any.
+
+    Renders collecting loader keys are discarded, so they are not profiled.
+    """
+    if not _active_profiles or is_collecting_keys():
+        return None
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_components() -> Iterator[ComponentProfile]:
+    """Profile all component renders within the block.
+
+    Example:
+        with profile_components() as profile:
+            render_to_string("page.html", context)
+        profile.write("page.folded")
+    """
+    global _active_profiles
+
+    profile = ComponentProfile()
+    token = _current_profile.set(profile)
+    with _active_profiles_lock:
+        _active_profiles += 1
+    try:
+        yield profile
+    finally:
+        with _active_profiles_lock:
+            _active_profiles -= 1
+        _current_profile.reset(token)
+
+
+def _clean(name: str) -> str:
+    # `;` separates frames and newlines separate stacks in the collapsed format
+    return name.replace(";", ":").replace("\n", " ")
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import sys
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import ExitStack
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import final
+
+from django.db import connections
+
+from django_bird import hookimpl
+
+from .plugins import pm
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+    from .components import Component
+
+logger = logging.getLogger(__name__)
+
+_current_queries: ContextVar[ComponentQueryLog | None] = ContextVar(
+    "django_bird_component_queries", default=None
+)
+
+
+@dataclass(slots=True)
+class ComponentQueries:
+    name: str
+    renders: int = 0
+    count: int = 0
+    duration: float = 0.0
+    max_per_render: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.count} queries in {self.renders} renders "
+            f"({self.duration * 1000:.2f}ms)"
+        )
+
+
+@final
+class ComponentQueryLog:
+    """Database queries per component, aggregated over a block of code.
+
+    Each query is attributed to the innermost component being rendered when it runs,
+    so a component's queries exclude those made by components nested in its template
+    or slots. Queries made while resolving a component's props are attributed to the
+    component (or template) passing them.
+    """
+
+    def __init__(self) -> None:
+        self.queries: dict[str, ComponentQueries] = {}
+        # Query count and duration of each component being rendered
+        self._stack: list[list[Any]] = []
+
+    def start(self, name: str) -> None:
+        self._stack.append([name, 0, 0.0])
+
+    def stop(self) -> None:
+        if not self._stack:
+            return
+        name, count, duration = self._stack.pop()
+        queries = self.queries.get(name)
+        if queries is None:
+            queries = self.queries[name] = ComponentQueries(name)
+        queries.renders += 1
+        queries.count += count
+        queries.duration += duration
+        queries.max_per_render = max(queries.max_per_render, count)
+
+    def execute(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        if not self._stack:
+            return execute(sql, params, many, context)
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            frame = self._stack[-1]
+            frame[1] += 1
+            frame[2] += perf_counter() - start
+
+    def top(self) -> list[ComponentQueries]:
+        """Get the components that made queries, most queries first."""
+        return sorted(
+            (queries for queries in self.queries.values() if queries.count),
+            key=lambda queries: (queries.count, queries.duration),
+            reverse=True,
+        )
+
+    def summary(self) -> str:
+        return "; ".join(str(queries) for queries in self.top())
+
+    def report(self, request: HttpRequest) -> None:
+        """Log a summary of the request's component queries and pass them to the
+        `report_component_queries` hook."""
+        top = self.top()
+        if not top:
+            return
+        logger.info(
+            "Component queries for %s %s: %s",
+            request.method,
+            request.path,
+            self.summary(),
+            extra={
+                "component_queries": {
+                    queries.name: {
+                        "renders": queries.renders,
+                        "count": queries.count,
+                        "duration_ms": round(queries.duration * 1000, 3),
+                        "max_per_render": queries.max_per_render,
+                    }
+                    for queries in top
+                },
+            },
+        )
+        pm.hook.report_component_queries(request=request, queries=top)
+
+
+@contextmanager
+def record_component_queries() -> Iterator[ComponentQueryLog]:
+    """Record the database queries made by components rendered within the block.
+
+    Queries are only attributed while this module is registered as a plugin, which
+    `ComponentQueriesMiddleware` and `assert_component_queries` do.
+    """
+    log = ComponentQueryLog()
+    token = _current_queries.set(log)
+    try:
+        with ExitStack() as stack:
+            stack.enter_context(pm.record_component_renders())
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(log.execute))
+            yield log
+    finally:
+        _current_queries.reset(token)
+
+
+@contextmanager
+def assert_component_queries(name: str, max: int) -> Iterator[ComponentQueryLog]:
+    """Assert that no render of a component within the block makes more than `max`
+    database queries.
+
+    Useful for catching N+1 queries in tests, such as a lazy queryset passed as a
+    prop to a component rendered in a loop:
+
+        with assert_component_queries("table.row", max=0):
+            render_to_string("orders.html", {"orders": Order.objects.all()})
+    """
+    plugin = sys.modules[__name__]
+    registered = pm.is_registered(plugin)
+    if not registered:
+        pm.register_recorder(plugin, __name__)
+    try:
+        with record_component_queries() as log:
+            yield log
+    finally:
+        if not registered:
+            pm.unregister(plugin)
+
+    queries = log.queries.get(name)
+    if queries is not None and queries.max_per_render > max:
+        raise AssertionError(
+            f"Component {name!r} made {queries.max_per_render} queries in a single "
+            f"render, expected at most {max} ({queries})"
+        )
+
+
+@hookimpl
+def before_component_render(component: Component) -> None:
+    log = _current_queries.get()
+    if log is not None:
+        log.start(component.name)
+
+
+@hookimpl
+def after_component_render() -> None:
+    log = _current_queries.get()
+    if log is not None:
+        log.stop()
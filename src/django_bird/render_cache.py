@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Hashable
+from hashlib import md5
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import final
+
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.utils import translation
+
+from .conf import app_settings
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+    from django.template.context import Context
+
+    from .components import Component
+    from .components import StoredRender
+
+RENDER_CACHE_KEY_PREFIX = "django_bird.render"
+BYPASS_RENDER_CACHE_KEY = "_django_bird_bypass_render_cache"
+
+
+def vary_on_user(context: Context) -> Hashable:
+    user = getattr(getattr(context, "request", None), "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def vary_on_language(context: Context) -> Hashable:
+    return translation.get_language()
+
+
+# What the renders of a pure component can vary on, for `{% bird:pure vary=... %}`
+VARY_ON: dict[str, Callable[[Context], Hashable]] = {
+    "language": vary_on_language,
+    "user": vary_on_user,
+}
+
+
+def get_vary_values(component: Component, context: Context) -> tuple[str, ...]:
+    return tuple(repr(VARY_ON[name](context)) for name in component.vary)
+
+
+@final
+class RenderCache:
+    """Caches the output of pure component renders across requests.
+
+    Renders are stored in the cache named by the `RENDER_CACHE` app setting, behind
+    an in-process tier holding the `RENDER_CACHE_LOCAL_SIZE` most recently used
+    renders. Keys are derived from the render's memo key, which includes the tree id
+    of the component (see `ComponentRegistry.get_tree_id`), so changing the template
+    of the component or of any component it uses stops its old renders from being
+    used.
+
+    Each render is stored with the names of the components rendered as part of it,
+    which are recorded as rendered again whenever the render is reused.
+    """
+
+    def __init__(self) -> None:
+        self.local: OrderedDict[str, tuple[float | None, StoredRender]] = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.local_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return app_settings.RENDER_CACHE is not None
+
+    @property
+    def backend(self) -> BaseCache:
+        # Only used while enabled, when `RENDER_CACHE` is set
+        return caches[app_settings.RENDER_CACHE or DEFAULT_CACHE_ALIAS]
+
+    def make_key(self, component: Component, memo_key: Hashable) -> str:
+        digest = md5(repr(memo_key).encode()).hexdigest()
+        return f"{RENDER_CACHE_KEY_PREFIX}:{component.name}:{component.id}:{digest}"
+
+    def get(self, key: str) -> StoredRender | None:
+        with self.lock:
+            entry = self.local.get(key)
+            if entry is not None:
+                expires, rendered = entry
+                if expires is None or expires > time.monotonic():
+                    self.local.move_to_end(key)
+                    self.local_hits += 1
+                    return rendered
+                del self.local[key]
+
+        rendered = self.backend.get(key)
+        if rendered is None:
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        self.set_local(key, rendered)
+        return rendered
+
+    def set(self, key: str, rendered: StoredRender) -> None:
+        self.backend.set(key, rendered, app_settings.RENDER_CACHE_TIMEOUT)
+        self.set_local(key, rendered)
+
+    def set_local(self, key: str, rendered: StoredRender) -> None:
+        size = app_settings.RENDER_CACHE_LOCAL_SIZE
+        if size <= 0:
+            return
+        timeout = app_settings.RENDER_CACHE_TIMEOUT
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            self.local[key] = (expires, rendered)
+            self.local.move_to_end(key)
+            while len(self.local) > size:
+                self.local.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Get the hit and miss counts since the cache was last reset.
+
+        `local_hits` are renders found in the in-process tier and `hits` those found
+        in the cache backend.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "local_hits": self.local_hits,
+                "misses": self.misses,
+                "local_size": len(self.local),
+            }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.local.clear()
+            self.hits = 0
+            self.local_hits = 0
+            self.misses = 0
+
+
+render_cache = RenderCache()
+
+
+def bypass_render_cache(request: HttpRequest) -> None:
+    """Render every pure component afresh for this request, without reading from
+    or writing to the render cache. Renders are still memoized within the request.
+    """
+    setattr(request, BYPASS_RENDER_CACHE_KEY, True)
+
+
+def use_render_cache(context: Context) -> bool:
+    if not render_cache.enabled:
+        return False
+    request = getattr(context, "request", None)
+    return not getattr(request, BYPASS_RENDER_CACHE_KEY, False)
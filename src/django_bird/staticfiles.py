@@ -39,6 +39,15 @@ class AssetElement(Enum):
     STYLESHEET = "stylesheet"
     SCRIPT = "script"
 
+    @property
+    def preload_as(self) -> str:
+        """The `as` attribute value used when preloading an asset of this element."""
+        match self:
+            case AssetElement.STYLESHEET:
+                return "style"
+            case AssetElement.SCRIPT:
+                return "script"
+
 
 @dataclass(frozen=True, slots=True)
 class AssetType:
@@ -109,6 +118,13 @@ class Asset:
             case AssetElement.SCRIPT:
                 return f'<script src="{self.url}"></script>'
 
+    def render_preload_link(self) -> str | None:
+        """Render a `Link` header value that preloads this asset."""
+        url = self.url
+        if url is None:
+            return None
+        return f"<{url}>; rel=preload; as={self.type.element.preload_as}"
+
     @property
     def absolute_path(self):
         return self.path.resolve()
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import logging
 import multiprocessing
+import os
 from collections.abc import Callable
 from collections.abc import Generator
+from collections.abc import Iterable
 from collections.abc import Iterator
 from itertools import chain
 from pathlib import Path
 from typing import Any
 from typing import TypeGuard
 from typing import final
+from weakref import WeakKeyDictionary
 
 from django.template.base import Node
 from django.template.base import Template
@@ -25,6 +28,8 @@ from django_bird import hookimpl
 
 from .conf import app_settings
 from .templatetags.tags.bird import BirdNode
+from .templatetags.tags.bird import PrerenderedNode
+from .templatetags.tags.each import EachNode
 from .templatetags.tags.load import LoadNode
 from .utils import get_files_from_dirs
 from .utils import unique_ordered
@@ -120,7 +125,42 @@ def get_component_directories(
     ]
 
 
-def gather_bird_tag_template_usage() -> Generator[tuple[Path, set[str]], Any, None]:
+_template_keys: WeakKeyDictionary[Template, str | None] = WeakKeyDictionary()
+
+
+def get_template_key(template: Template) -> str | None:
+    """Get a deployment-independent key identifying a loaded template.
+
+    The key is made up of the name of the loader that found the template and the
+    template name as that loader sees it, e.g.
+    `django.template.loaders.filesystem.Loader:pages/home.html`. Unlike the
+    template's absolute path, this stays the same across machines with different
+    filesystem layouts. The key is computed once and kept for as long as the
+    template is.
+
+    Args:
+        template: The loaded template
+
+    Returns:
+        str | None: The template key, or None if the template was not loaded by name
+    """
+    try:
+        return _template_keys[template]
+    except KeyError:
+        pass
+
+    origin = template.origin
+    template_name = origin.template_name
+    if template_name is None:
+        key = None
+    else:
+        key = f"{origin.loader_name}:{os.fsdecode(template_name)}"
+
+    _template_keys[template] = key
+    return key
+
+
+def gather_bird_tag_template_usage() -> Generator[tuple[str, set[str]], Any, None]:
     template_dirs = get_template_directories()
     templates = list(get_files_from_dirs(template_dirs))
     chunk_size = max(1, len(templates) // multiprocessing.cpu_count() * 2)
@@ -147,13 +187,17 @@ def gather_bird_tag_template_usage() -> Generator[tuple[Path, set[str]], Any, No
 
 def _process_template_chunk(  # pragma: no cover
     templates: list[tuple[Path, Path]],
-) -> list[tuple[Path, set[str]]]:
-    results: list[tuple[Path, set[str]]] = []
+) -> list[tuple[str, set[str]]]:
+    results: list[tuple[str, set[str]]] = []
     for path, root in templates:
         template_name = str(path.relative_to(root))
-        components = find_components_in_template(template_name)
-        if components:
-            results.append((path, components))
+        found = _find_components(template_name)
+        if found is None:
+            continue
+        template, components = found
+        template_key = get_template_key(template)
+        if components and template_key is not None:
+            results.append((template_key, components))
     return results
 
 
@@ -166,21 +210,71 @@ def find_components_in_template(template_path: str | Path) -> set[str]:
     Returns:
         set[str]: Set of component names used in the template
     """
-    template_name = str(template_path)
+    found = _find_components(str(template_path))
+    if found is None:
+        return set()
+    _template, components = found
+    return components
 
-    visitor = NodeVisitor(Engine.get_default())
+
+def _find_components(
+    template_name: str | list[str],
+) -> tuple[Template, set[str]] | None:
+    engine = Engine.get_default()
+    visitor = NodeVisitor(engine)
     try:
-        template = Engine.get_default().get_template(template_name)
+        if isinstance(template_name, str):
+            template = engine.get_template(template_name)
+        else:
+            template = engine.select_template(template_name)
         context = Context()
         with context.bind_template(template):
             visitor.visit(template, context)
-        return visitor.components
+        return template, visitor.components
     except (TemplateDoesNotExist, TemplateSyntaxError, UnicodeDecodeError) as e:
-        # If we can't load or process the template for any reason, log the exception and return an empty set
+        # If we can't load or process the template for any reason, log the exception and return None
         logger.debug(
             f"Could not process template {template_name!r}: {e.__class__.__name__}: {e}"
         )
-        return set()
+        return None
+
+
+@final
+class ComponentGraph:
+    """Graph of the components used by each component's own template.
+
+    Each component's template is scanned at most once, the first time its children
+    are needed.
+    """
+
+    def __init__(self) -> None:
+        self._children: dict[str, set[str]] = {}
+
+    def children(self, name: str) -> set[str]:
+        """Get the names of the components used directly in a component's template."""
+        if name not in self._children:
+            found = _find_components(get_template_names(name))
+            self._children[name] = set() if found is None else found[1] - {name}
+        return self._children[name]
+
+    def closure(self, names: Iterable[str]) -> set[str]:
+        """Expand component names with every component they use, transitively.
+
+        Args:
+            names: Names of the components used in a template
+
+        Returns:
+            set[str]: The given names plus the names of all their descendants
+        """
+        seen: set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            pending.extend(self.children(name))
+        return seen
 
 
 NodeVisitorMethod = Callable[[Template | Node, Context], None]
@@ -198,6 +292,8 @@ class NodeVisitor:  # pragma: no cover
         self.visited_templates: set[str] = set()
         self._dispatch: dict[type, Callable[..., None]] = {
             BirdNode: self.visit_BirdNode,
+            EachNode: self.visit_BirdNode,
+            PrerenderedNode: self.visit_BirdNode,
             ExtendsNode: self.visit_ExtendsNode,
             IncludeNode: self.visit_IncludeNode,
             LoadNode: self.visit_LoadNode,
@@ -214,7 +310,9 @@ class NodeVisitor:  # pragma: no cover
         for child_node in node.nodelist:
             self.visit(child_node, context)
 
-    def visit_BirdNode(self, node: BirdNode, context: Context) -> None:
+    def visit_BirdNode(
+        self, node: BirdNode | EachNode | PrerenderedNode, context: Context
+    ) -> None:
         component_name = node.name.strip("\"'")
         self.components.add(component_name)
         self.generic_visit(node, context)
@@ -4,8 +4,11 @@ from django import template
 
 from .tags import asset
 from .tags import bird
+from .tags import cache_control
+from .tags import each
 from .tags import load
 from .tags import prop
+from .tags import pure
 from .tags import slot
 from .tags import var
 
@@ -15,8 +18,11 @@ register = template.Library()
 register.tag(asset.AssetTag.CSS.value, asset.do_asset)
 register.tag(asset.AssetTag.JS.value, asset.do_asset)
 register.tag(bird.TAG, bird.do_bird)
+register.tag(cache_control.TAG, cache_control.do_cache_control)
+register.tag(each.TAG, each.do_each)
 register.tag(load.TAG, load.do_load)
 register.tag(prop.TAG, prop.do_prop)
+register.tag(pure.TAG, pure.do_pure)
 register.tag(slot.TAG, slot.do_slot)
 register.tag(var.TAG, var.do_var)
 register.tag(var.END_TAG, var.do_end_var)
@@ -1,24 +1,36 @@
 # pyright: reportAny=false
 from __future__ import annotations
 
+from collections.abc import Iterable
 from enum import Enum
+from typing import TYPE_CHECKING
 from typing import final
 
 from django import template
 from django.conf import settings
 from django.template.base import Parser
+from django.template.base import Template
 from django.template.base import Token
 from django.template.context import Context
 
 from django_bird._typing import override
+from django_bird.conf import app_settings
 from django_bird.manifest import load_asset_manifest
-from django_bird.manifest import normalize_path
+from django_bird.templates import get_template_key
+
+if TYPE_CHECKING:
+    from django_bird.components import Component
 
 
 class AssetTag(Enum):
     CSS = "bird:css"
     JS = "bird:js"
 
+    @property
+    def placeholder(self) -> str:
+        """Marker rendered in place of the assets when they are collected at render time."""
+        return f"<!-- django-bird:{self.value} -->"
+
 
 def do_asset(_parser: Parser, token: Token) -> AssetNode:
     bits = token.split_contents()
@@ -37,41 +49,83 @@ class AssetNode(template.Node):
 
     @override
     def render(self, context: Context) -> str:
-        from django_bird.components import components
-        from django_bird.staticfiles import Asset
-        from django_bird.staticfiles import get_component_assets
+        from django_bird.components import get_rendered_components
 
         template = getattr(context, "template", None)
         if not template:
             return ""
 
-        template_path = template.origin.name
+        if (
+            app_settings.RENDER_TIME_ASSETS
+            and getattr(context, "request", None) is not None
+        ):
+            # Make sure the request tracks rendered components even if none are
+            # rendered, so the placeholder is always replaced
+            get_rendered_components(context)
+            return self.asset_tag.placeholder
 
-        used_components = []
+        used_components = get_template_components(template)
 
-        # Only use manifest in production mode
-        if not settings.DEBUG:
-            manifest = load_asset_manifest()
-            normalized_path = normalize_path(template_path)
-            if manifest and normalized_path in manifest:
-                component_names = manifest[normalized_path]
-                used_components = [
-                    components.get_component(name) for name in component_names
-                ]
+        return render_component_assets(used_components, self.asset_tag)
 
-        # If we're in development or there was no manifest data, use registry
-        if not used_components:
-            used_components = list(components.get_component_usage(template_path))
 
-        assets: set[Asset] = set()
-        for component in used_components:
-            component_assets = get_component_assets(component)
-            assets.update(
-                asset for asset in component_assets if asset.type.tag == self.asset_tag
-            )
+def get_template_components(template: Template) -> list[Component]:
+    """Get the components used in a template.
 
-        if not assets:
-            return ""
+    In production, the components are read from the asset manifest when it has an
+    entry for the template. Otherwise the template is scanned.
+
+    Args:
+        template: The template to get the used components of
+
+    Returns:
+        list[Component]: The components used in the template
+    """
+    from django_bird.components import components
+
+    used_components: list[Component] = []
+
+    # Only use manifest in production mode
+    if not settings.DEBUG:
+        manifest = load_asset_manifest()
+        template_key = get_template_key(template)
+        if manifest and template_key is not None and template_key in manifest:
+            component_names = manifest[template_key]
+            used_components = [
+                components.get_component(name) for name in component_names
+            ]
+
+    # If we're in development or there was no manifest data, use registry
+    if not used_components:
+        used_components = list(components.get_component_usage(template.origin.name))
+
+    return used_components
+
+
+def render_component_assets(
+    used_components: Iterable[Component], asset_tag: AssetTag
+) -> str:
+    """Render the HTML tags for the assets of the given components.
+
+    Args:
+        used_components: The components whose assets should be rendered
+        asset_tag: Which asset tag to render the assets for
+
+    Returns:
+        str: The rendered asset tags, one per line
+    """
+    from django_bird.staticfiles import Asset
+    from django_bird.staticfiles import get_component_assets
+
+    assets: set[Asset] = set()
+    for component in used_components:
+        component_assets = get_component_assets(component)
+        assets.update(
+            asset for asset in component_assets if asset.type.tag == asset_tag
+        )
+
+    if not assets:
+        return ""
 
-        rendered = [asset.render() for asset in sorted(assets, key=lambda a: a.path)]
-        return "\n".join(rendered)
+    rendered = [asset.render() for asset in sorted(assets, key=lambda a: a.path)]
+    return "\n".join(rendered)
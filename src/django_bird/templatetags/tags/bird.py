@@ -1,30 +1,118 @@
 # pyright: reportAny=false
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
 from typing import final
 
 from django import template
+from django.template.base import FilterExpression
 from django.template.base import NodeList
 from django.template.base import Parser
+from django.template.base import TextNode
 from django.template.base import Token
 from django.template.context import Context
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
 
 from django_bird._typing import ParsedTagBits
 from django_bird._typing import RawTagBits
 from django_bird._typing import override
 from django_bird.conf import app_settings
+from django_bird.loaders import is_collecting_keys
+from django_bird.nested import note_nested_render
+from django_bird.profiling import get_active_profile
+
+if TYPE_CHECKING:
+    from django_bird.components import Component
+    from django_bird.folding import FoldedRender
+    from django_bird.inlining import InlinedComponent
 
 TAG = "bird"
 END_TAG = "endbird"
+FRAGMENT_OPTION = "fragment"
+ESI_OPTION = "esi"
+DYNAMIC_OPTION = "dynamic"
+LAZY_OPTION = "lazy"
 
 
-def do_bird(parser: Parser, token: Token) -> BirdNode:
+def do_bird(parser: Parser, token: Token) -> BirdNode | PrerenderedNode:
     _tag, *bits = token.split_contents()
     if not bits:
         msg = f"{TAG} tag requires at least one argument"
         raise template.TemplateSyntaxError(msg)
 
     name = bits.pop(0)
+    fragment: str | None = None
+    for bit in bits:
+        if bit.startswith(f"{FRAGMENT_OPTION}="):
+            fragment = parse_quoted_option(bit, TAG)
+    bits = [bit for bit in bits if not bit.startswith(f"{FRAGMENT_OPTION}=")]
+    esi = ESI_OPTION in bits
+    dynamic = DYNAMIC_OPTION in bits
+    lazy = LAZY_OPTION in bits
+    bits = [bit for bit in bits if bit not in (ESI_OPTION, DYNAMIC_OPTION, LAZY_OPTION)]
+
+    attrs, isolated_context = parse_attrs(bits, parser)
+    nodelist = parse_nodelist(bits, parser)
+
+    if not (attrs or fragment or esi or dynamic or lazy) and is_blank(nodelist):
+        from django_bird.prerender import get_prerendered_output
+
+        output = get_prerendered_output(name.strip("\"'"))
+        if output is not None:
+            return PrerenderedNode(name.strip("\"'"), output)
+
+    return BirdNode(
+        name,
+        attrs,
+        nodelist,
+        isolated_context,
+        fragment,
+        esi,
+        dynamic,
+        lazy,
+        loop=find_enclosing_loop(parser),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ForLoop:
+    """The loop variables and sequence of a `{% for %}` tag."""
+
+    loopvars: tuple[str, ...]
+    sequence: FilterExpression
+
+
+def find_enclosing_loop(parser: Parser) -> ForLoop | None:
+    """Get the innermost `{% for %}` tag the tag being parsed is in, if any."""
+    # The tag being parsed is the last command on the stack
+    for command, token in reversed(parser.command_stack[:-1]):
+        if command != "for":
+            continue
+        # `{% for %}` checks its syntax before parsing its contents, so the tag is
+        # well formed
+        bits = token.split_contents()
+        in_index = -3 if bits[-1] == "reversed" else -2
+        loopvars = re.split(r" *, *", " ".join(bits[1:in_index]))
+        return ForLoop(tuple(loopvars), parser.compile_filter(bits[in_index + 1]))
+    return None
+
+
+def parse_quoted_option(bit: str, tag: str) -> str:
+    """Get the value of a `name="value"` tag option, which must be a quoted string."""
+    option, value = bit.split("=", 1)
+    if len(value) <= 2 or value[0] not in "'\"" or value[-1] != value[0]:
+        msg = f"{tag} tag's {option} option must be a quoted name"
+        raise template.TemplateSyntaxError(msg)
+    return value[1:-1]
+
+
+def parse_attrs(
+    bits: RawTagBits, parser: Parser, tag: str = TAG
+) -> tuple[ParsedTagBits, bool]:
     attrs: ParsedTagBits = {}
     isolated_context = app_settings.DEFAULT_ONLY
     explicit_context_mode: str | None = None
@@ -33,7 +121,7 @@ def do_bird(parser: Parser, token: Token) -> BirdNode:
         match bit:
             case "only" | "inherit":
                 if explicit_context_mode and explicit_context_mode != bit:
-                    msg = f"{TAG} tag cannot use both 'only' and 'inherit'"
+                    msg = f"{tag} tag cannot use both 'only' and 'inherit'"
                     raise template.TemplateSyntaxError(msg)
                 explicit_context_mode = bit
                 isolated_context = bit == "only"
@@ -47,21 +135,29 @@ def do_bird(parser: Parser, token: Token) -> BirdNode:
                     value = "True"
                 attrs[key] = parser.compile_filter(value)
 
-    nodelist = parse_nodelist(bits, parser)
-    return BirdNode(name, attrs, nodelist, isolated_context)
+    return attrs, isolated_context
 
 
-def parse_nodelist(bits: RawTagBits, parser: Parser) -> NodeList | None:
+def parse_nodelist(
+    bits: RawTagBits, parser: Parser, end_tag: str = END_TAG
+) -> NodeList | None:
     # self-closing tag
     # {% bird name / %}
     if len(bits) > 0 and bits[-1] == "/":
         nodelist = None
     else:
-        nodelist = parser.parse((END_TAG,))
+        nodelist = parser.parse((end_tag,))
         parser.delete_first_token()
     return nodelist
 
 
+def is_blank(nodelist: NodeList | None) -> bool:
+    """Whether a tag's content is missing or only whitespace."""
+    return nodelist is None or all(
+        isinstance(node, TextNode) and not node.s.strip() for node in nodelist
+    )
+
+
 @final
 class BirdNode(template.Node):
     def __init__(
@@ -70,18 +166,92 @@ class BirdNode(template.Node):
         attrs: ParsedTagBits,
         nodelist: NodeList | None,
         isolated_context: bool = False,
+        fragment: str | None = None,
+        esi: bool = False,
+        dynamic: bool = False,
+        lazy: bool = False,
+        loop: ForLoop | None = None,
     ) -> None:
         self.name = name
         self.attrs = attrs
         self.nodelist = nodelist
         self.isolated_context = isolated_context
+        self.fragment = fragment
+        self.esi = esi
+        self.dynamic = dynamic
+        self.lazy = lazy
+        self.loop = loop
+        self.folded: FoldedRender | None = None
+        self.inlined: InlinedComponent | None = None
+
+    @cached_property
+    def constant(self) -> bool:
+        from django_bird.folding import is_constant_tag
+
+        return is_constant_tag(self)
 
     @override
     def render(self, context: Context) -> str:
+        profile = get_active_profile()
+        if profile is None:
+            return self._render(context)
+        with profile.frame(f"{{% {TAG} {self.name} %}}", context):
+            return self._render(context)
+
+    def _render(self, context: Context) -> str:
         from django_bird.components import components
 
+        if self.esi and app_settings.ESI_ENABLED:
+            from django_bird.esi import render_esi_include
+
+            include = render_esi_include(self, context)
+            if include is not None:
+                return include
+
+        if self.dynamic:
+            from django_bird.dynamic import render_dynamic_placeholder
+
+            placeholder = render_dynamic_placeholder(self, context)
+            if placeholder is not None:
+                return placeholder
+
+        if self.lazy:
+            from django_bird.lazy import render_lazy_placeholder
+
+            placeholder = render_lazy_placeholder(self, context)
+            if placeholder is not None:
+                return placeholder
+
         component_name = self.get_component_name(context)
         component = components.get_component(component_name)
+
+        if self.loop is not None and component.loaded_props:
+            forloop = context.get("forloop")
+            if isinstance(forloop, dict) and forloop.get("first"):
+                from django_bird.loaders import queue_loop_keys
+
+                queue_loop_keys(self.loop, self.attrs, component, context)
+
+        if (
+            self.constant
+            and component.pure
+            and not component.vary
+            and not is_collecting_keys()
+        ):
+            from django_bird.folding import render_folded
+
+            return render_folded(self, component, context)
+
+        if app_settings.INLINE_COMPONENTS:
+            from django_bird.inlining import render_inlined
+
+            rendered = render_inlined(self, component, context)
+            if rendered is not None:
+                return rendered
+
+        return self.render_component(component, context)
+
+    def render_component(self, component: Component, context: Context) -> str:
         bound_component = component.get_bound_component(node=self)
 
         if self.isolated_context:
@@ -98,3 +268,24 @@ class BirdNode(template.Node):
         except template.VariableDoesNotExist:
             name = self.name
         return name
+
+
+@final
+class PrerenderedNode(template.Node):
+    """A `{% bird %}` tag replaced at parse time with its component's prerendered
+    output, for components whose output does not depend on the context."""
+
+    def __init__(self, name: str, output: str) -> None:
+        self.name = name
+        self.output = mark_safe(output)
+
+    @override
+    def render(self, context: Context) -> SafeString:
+        note_nested_render(context, self.name, rendered=False)
+        if app_settings.RENDER_TIME_ASSETS:
+            from django_bird.components import components
+            from django_bird.components import get_rendered_components
+
+            component = components.get_component(self.name)
+            get_rendered_components(context)[component.name] = component
+        return self.output
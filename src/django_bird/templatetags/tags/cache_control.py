@@ -0,0 +1,76 @@
+# pyright: reportAny=false
+from __future__ import annotations
+
+from typing import final
+
+from django import template
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.context import Context
+
+from django_bird._typing import override
+from django_bird.cache_control import CachePolicy
+from django_bird.templatetags.tags.bird import parse_quoted_option
+
+TAG = "bird:cache_control"
+
+FLAGS = ("public", "private", "no_store")
+
+
+def do_cache_control(_parser: Parser, token: Token) -> CacheControlNode:
+    _tag, *bits = token.split_contents()
+    if not bits:
+        msg = f"{TAG} tag requires at least one directive"
+        raise template.TemplateSyntaxError(msg)
+
+    max_age: int | None = None
+    vary: tuple[str, ...] = ()
+    flags: set[str] = set()
+    for bit in bits:
+        if bit in FLAGS:
+            flags.add(bit)
+        elif bit.startswith("max_age="):
+            try:
+                max_age = int(bit.removeprefix("max_age="))
+            except ValueError:
+                max_age = -1
+            if max_age < 0:
+                msg = f"{TAG} tag's max_age must be a number of seconds, got {bit!r}"
+                raise template.TemplateSyntaxError(msg)
+        elif bit.startswith("vary="):
+            vary = tuple(
+                header.strip()
+                for header in parse_quoted_option(bit, TAG).split(",")
+                if header.strip()
+            )
+        else:
+            msg = (
+                f"{TAG} tag accepts max_age=, vary= and {', '.join(FLAGS)}, got {bit!r}"
+            )
+            raise template.TemplateSyntaxError(msg)
+
+    if {"public", "private"} <= flags:
+        msg = f"{TAG} tag cannot be both public and private"
+        raise template.TemplateSyntaxError(msg)
+
+    return CacheControlNode(
+        CachePolicy(
+            max_age=max_age,
+            public="public" in flags,
+            private="private" in flags,
+            no_store="no_store" in flags,
+            vary=vary,
+        )
+    )
+
+
+@final
+class CacheControlNode(template.Node):
+    """Declares how responses containing a component may be cached."""
+
+    def __init__(self, policy: CachePolicy) -> None:
+        self.policy = policy
+
+    @override
+    def render(self, context: Context) -> str:
+        return ""
@@ -0,0 +1,95 @@
+# pyright: reportAny=false
+from __future__ import annotations
+
+from typing import final
+
+from django import template
+from django.template.base import FilterExpression
+from django.template.base import NodeList
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.context import Context
+
+from django_bird._typing import ParsedTagBits
+from django_bird._typing import override
+from django_bird.profiling import get_active_profile
+
+from .bird import parse_attrs
+from .bird import parse_nodelist
+
+TAG = "bird:each"
+END_TAG = "endbird:each"
+
+
+def do_each(parser: Parser, token: Token) -> EachNode:
+    _tag, *bits = token.split_contents()
+    if len(bits) < 5 or bits[1] != "in" or bits[3] != "as":
+        msg = f"{TAG} tag requires the form '{TAG} <component> in <items> as <name>'"
+        raise template.TemplateSyntaxError(msg)
+
+    name, _in, sequence, _as, item_name, *bits = bits
+    attrs, isolated_context = parse_attrs(bits, parser, TAG)
+    nodelist = parse_nodelist(bits, parser, END_TAG)
+    return EachNode(
+        name,
+        parser.compile_filter(sequence),
+        item_name,
+        attrs,
+        nodelist,
+        isolated_context,
+    )
+
+
+@final
+class EachNode(template.Node):
+    """Render a component once for every item in a sequence.
+
+    Equivalent to `{% bird %}` inside a `{% for %}` loop, but the component is looked
+    up and its attributes are matched to its props once for the whole loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sequence: FilterExpression,
+        item_name: str,
+        attrs: ParsedTagBits,
+        nodelist: NodeList | None,
+        isolated_context: bool = False,
+    ) -> None:
+        self.name = name
+        self.sequence = sequence
+        self.item_name = item_name
+        self.attrs = attrs
+        self.nodelist = nodelist
+        self.isolated_context = isolated_context
+
+    @override
+    def render(self, context: Context) -> str:
+        profile = get_active_profile()
+        if profile is None:
+            return self._render(context)
+        with profile.frame(f"{{% {TAG} {self.name} %}}", context):
+            return self._render(context)
+
+    def _render(self, context: Context) -> str:
+        from django_bird.components import components
+
+        component_name = self.get_component_name(context)
+        component = components.get_component(component_name)
+        items = self.sequence.resolve(context, ignore_failures=True) or ()
+        return component.render_many(
+            items,
+            context,
+            item_name=self.item_name,
+            attrs=self.attrs,
+            nodelist=self.nodelist,
+            isolated_context=self.isolated_context,
+        )
+
+    def get_component_name(self, context: Context) -> str:
+        try:
+            name = template.Variable(self.name).resolve(context)
+        except template.VariableDoesNotExist:
+            name = self.name
+        return name
@@ -12,7 +12,10 @@ from django.template.context import Context
 from django_bird._typing import RawTagBits
 from django_bird._typing import override
 
+from .bird import parse_quoted_option
+
 TAG = "bird:prop"
+LOAD_OPTION = "load"
 
 
 def do_prop(parser: Parser, token: Token) -> PropNode:
@@ -29,15 +32,30 @@ def do_prop(parser: Parser, token: Token) -> PropNode:
         name = prop
         default = "None"
 
-    return PropNode(name, parser.compile_filter(default), bits)
+    loader: str | None = None
+    attrs: RawTagBits = []
+    for bit in bits:
+        if not bit.startswith(f"{LOAD_OPTION}="):
+            attrs.append(bit)
+            continue
+        loader = parse_quoted_option(bit, TAG)
+
+    return PropNode(name, parser.compile_filter(default), attrs, loader)
 
 
 @final
 class PropNode(template.Node):
-    def __init__(self, name: str, default: FilterExpression, attrs: RawTagBits):
+    def __init__(
+        self,
+        name: str,
+        default: FilterExpression,
+        attrs: RawTagBits,
+        loader: str | None = None,
+    ):
         self.name = name
         self.default = default
         self.attrs = attrs
+        self.loader = loader
 
     @override
     def render(self, context: Context) -> str:
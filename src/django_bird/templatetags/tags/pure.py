@@ -0,0 +1,48 @@
+# pyright: reportAny=false
+from __future__ import annotations
+
+from typing import final
+
+from django import template
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.context import Context
+
+from django_bird._typing import override
+from django_bird.templatetags.tags.bird import parse_quoted_option
+
+TAG = "bird:pure"
+VARY_OPTION = "vary"
+
+
+def do_pure(_parser: Parser, token: Token) -> PureNode:
+    from django_bird.render_cache import VARY_ON
+
+    _tag, *bits = token.split_contents()
+    vary: tuple[str, ...] = ()
+    for bit in bits:
+        if not bit.startswith(f"{VARY_OPTION}="):
+            msg = f"{TAG} tag only accepts a {VARY_OPTION} option, got {bit!r}"
+            raise template.TemplateSyntaxError(msg)
+        vary = tuple(name.strip() for name in parse_quoted_option(bit, TAG).split(","))
+        for name in vary:
+            if name not in VARY_ON:
+                msg = (
+                    f"{TAG} tag cannot vary on {name!r}, expected one of "
+                    f"{', '.join(sorted(VARY_ON))}"
+                )
+                raise template.TemplateSyntaxError(msg)
+    return PureNode(vary)
+
+
+@final
+class PureNode(template.Node):
+    """Marks a component whose output depends only on its props, attributes and
+    slots, and what it varies on, so identical renders can share their output."""
+
+    def __init__(self, vary: tuple[str, ...] = ()) -> None:
+        self.vary = vary
+
+    @override
+    def render(self, context: Context) -> str:
+        return ""
@@ -12,6 +12,7 @@ from django.template.context import Context
 from django.utils.safestring import SafeString
 
 from django_bird._typing import override
+from django_bird.profiling import get_active_profile
 
 TAG = "bird:slot"
 END_TAG = "endbird:slot"
@@ -47,6 +48,13 @@ class SlotNode(template.Node):
 
     @override
     def render(self, context: Context) -> SafeString:
+        profile = get_active_profile()
+        if profile is None:
+            return self._render(context)
+        with profile.frame(f"{{% {TAG} {self.name} %}}", context):
+            return self._render(context)
+
+    def _render(self, context: Context) -> SafeString:
         slots = context.get("slots")
 
         if not slots or not isinstance(slots, dict):
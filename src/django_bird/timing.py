@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import final
+
+from django_bird import hookimpl
+
+from .conf import app_settings
+from .plugins import pm
+
+if TYPE_CHECKING:
+    from django.template.context import Context
+
+    from .components import Component
+
+logger = logging.getLogger(__name__)
+
+SLOW_RENDER_LOG_WINDOW = 60.0
+
+_current_timings: ContextVar[ComponentTimings | None] = ContextVar(
+    "django_bird_component_timings", default=None
+)
+
+
+@dataclass(slots=True)
+class ComponentTiming:
+    name: str
+    count: int = 0
+    inclusive: float = 0.0
+    exclusive: float = 0.0
+
+    def render_server_timing(self) -> str:
+        """Render this timing as a `Server-Timing` header metric.
+
+        The metric's duration is the inclusive time in milliseconds; the description
+        holds the render count and exclusive time.
+        """
+        return (
+            f"bird.{self.name};"
+            f'desc="{self.count}x / {self.exclusive * 1000:.2f}ms self";'
+            f"dur={self.inclusive * 1000:.2f}"
+        )
+
+
+@final
+class ComponentTimings:
+    """Render counts and times per component, aggregated over one request.
+
+    Inclusive time is the full time spent rendering a component, including any
+    components nested in its template or slots. Exclusive time excludes the
+    inclusive time of those nested components.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, ComponentTiming] = {}
+        # Inclusive time of the finished children of each component being rendered
+        self._stack: list[float] = []
+
+    def start(self) -> None:
+        self._stack.append(0.0)
+
+    def stop(self, name: str, elapsed: float) -> None:
+        children = self._stack.pop() if self._stack else 0.0
+        if self._stack:
+            self._stack[-1] += elapsed
+
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = ComponentTiming(name)
+        timing.count += 1
+        timing.inclusive += elapsed
+        timing.exclusive += elapsed - children
+
+    def top(self, count: int) -> list[ComponentTiming]:
+        """Get the components with the highest exclusive time, slowest first."""
+        return sorted(
+            self.timings.values(), key=lambda timing: timing.exclusive, reverse=True
+        )[:count]
+
+    def render_server_timing(self, count: int) -> str:
+        """Render the slowest components as a `Server-Timing` header value."""
+        return ", ".join(timing.render_server_timing() for timing in self.top(count))
+
+
+@final
+class SlowRenderLog:
+    """Log component renders slower than the `SLOW_RENDER_THRESHOLD` app setting.
+
+    Slow renders are sampled with `SLOW_RENDER_SAMPLE_RATE` and each component is
+    logged at most `SLOW_RENDER_LOG_LIMIT` times a minute. Renders dropped by the
+    rate limit are counted and reported with the component's next log record.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        # Component name -> (window start, records logged, records suppressed)
+        self._windows: dict[str, tuple[float, int, int]] = {}
+
+    def record(
+        self,
+        component: Component,
+        props: dict[str, Any],
+        context: Context,
+        elapsed: float,
+    ) -> None:
+        threshold = app_settings.SLOW_RENDER_THRESHOLD
+        elapsed_ms = elapsed * 1000
+        if threshold is None or elapsed_ms < threshold:
+            return
+        if random.random() >= app_settings.SLOW_RENDER_SAMPLE_RATE:
+            return
+
+        suppressed = self._acquire(component.name)
+        if suppressed is None:
+            return
+
+        template = getattr(context, "template", None)
+        logger.warning(
+            "Slow render of component %r: %.2fms (threshold %.2fms)",
+            component.name,
+            elapsed_ms,
+            threshold,
+            extra={
+                "component": component.name,
+                "component_origin": component.path,
+                "template": template.origin.name if template is not None else None,
+                "props": sorted(props),
+                "elapsed_ms": round(elapsed_ms, 3),
+                "threshold_ms": threshold,
+                "suppressed": suppressed,
+            },
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def _acquire(self, name: str) -> int | None:
+        """Take a log slot for a component, returning how many records were suppressed
+        since the last one, or None if the component is over its limit."""
+        now = time.monotonic()
+        with self._lock:
+            window_start, logged, suppressed = self._windows.get(name, (now, 0, 0))
+            if now - window_start >= SLOW_RENDER_LOG_WINDOW:
+                window_start, logged = now, 0
+            if logged >= app_settings.SLOW_RENDER_LOG_LIMIT:
+                self._windows[name] = (window_start, logged, suppressed + 1)
+                return None
+            self._windows[name] = (window_start, logged + 1, 0)
+            return suppressed
+
+
+slow_render_log = SlowRenderLog()
+
+
+@contextmanager
+def record_component_timings() -> Iterator[ComponentTimings]:
+    """Record the timings of all components rendered within the block.
+
+    Timings are only recorded while this module is registered as a plugin, which
+    `ServerTimingMiddleware` does when it is loaded.
+    """
+    timings = ComponentTimings()
+    token = _current_timings.set(timings)
+    try:
+        with pm.record_component_renders():
+            yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@hookimpl
+def before_component_render() -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.start()
+
+
+@hookimpl
+def after_component_render(component: Component, elapsed: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.stop(component.name, elapsed)
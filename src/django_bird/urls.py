@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+from django.urls import path
+
+from . import views
 from .apps import DjangoBirdAppConfig
 
 app_name = DjangoBirdAppConfig.label
 
-urlpatterns = []  # type: ignore[var-annotated]
+urlpatterns = [
+    path("esi/", views.component_esi, name="component_esi"),
+    path("lazy/", views.component_lazy, name="component_lazy"),
+    path("components/<str:name>/", views.component_fragment, name="component_fragment"),
+]
@@ -1 +1,123 @@
 from __future__ import annotations
+
+import json
+from fnmatch import fnmatchcase
+from functools import partial
+from hashlib import md5
+
+from django.core import signing
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import HttpResponseBadRequest
+from django.template.exceptions import TemplateDoesNotExist
+from django.views.decorators.http import condition
+from django.views.decorators.http import require_safe
+
+from .components import Component
+from .components import components
+from .conf import app_settings
+from .esi import ESI_SALT
+from .lazy import LAZY_SALT
+from .payloads import PAYLOAD_PARAM
+from .payloads import ComponentPayload
+
+
+def get_fragment_component(name: str) -> Component:
+    """Get a component the fragment view may serve, or raise `Http404`.
+
+    Only components matching one of the `FRAGMENT_COMPONENTS` app setting's
+    patterns are served.
+    """
+    if not any(
+        fnmatchcase(name, pattern) for pattern in app_settings.FRAGMENT_COMPONENTS
+    ):
+        msg = f"Component {name!r} is not served as a fragment"
+        raise Http404(msg)
+    try:
+        return components.get_component(name)
+    except TemplateDoesNotExist as e:
+        msg = f"Component {name!r} does not exist"
+        raise Http404(msg) from e
+
+
+def get_fragment_props(request: HttpRequest, component: Component) -> dict[str, str]:
+    """Get the component's props from the query string.
+
+    Only the props the component declares with `{% bird:prop %}` are used. Other
+    parameters are ignored, so a request cannot add attributes to the component,
+    such as event handlers.
+    """
+    prop_names = component.prop_names
+    return {key: request.GET[key] for key in request.GET if key in prop_names}
+
+
+def fragment_etag(request: HttpRequest, name: str) -> str:
+    component = get_fragment_component(name)
+    props = json.dumps(sorted(get_fragment_props(request, component).items()))
+    return md5(f"{components.get_tree_id(component)}:{props}".encode()).hexdigest()
+
+
+@require_safe
+@condition(etag_func=fragment_etag)
+def component_fragment(request: HttpRequest, name: str) -> HttpResponse:
+    """Render a component as an HTML fragment, such as for an HTMX swap.
+
+    The query string parameters named after the component's props are passed as
+    its props; others are ignored. The response's `ETag` is derived from the props
+    and the templates of the component and the components it uses, so served
+    components should render the same output for the same props.
+    """
+    component = get_fragment_component(name)
+    props = get_fragment_props(request, component)
+    return HttpResponse(component.render(props, request=request))
+
+
+def payload_etag(request: HttpRequest, salt: str) -> str | None:
+    token = request.GET.get(PAYLOAD_PARAM, "")
+    try:
+        component = components.get_component(ComponentPayload.loads(token, salt).name)
+    except (signing.BadSignature, TemplateDoesNotExist):
+        return None
+    return md5(f"{components.get_tree_id(component)}:{token}".encode()).hexdigest()
+
+
+def render_payload(request: HttpRequest, salt: str) -> HttpResponse:
+    """Render the component of a signed payload in the request's query string.
+
+    Responds with a 400 if the payload was not signed with `salt` by this site, and
+    a 404 if its component no longer exists.
+    """
+    token = request.GET.get(PAYLOAD_PARAM, "")
+    try:
+        payload = ComponentPayload.loads(token, salt)
+    except signing.BadSignature:
+        return HttpResponseBadRequest("Invalid component payload")
+    try:
+        return HttpResponse(payload.render(request))
+    except TemplateDoesNotExist as e:
+        msg = f"Component {payload.name!r} does not exist"
+        raise Http404(msg) from e
+
+
+@require_safe
+@condition(etag_func=partial(payload_etag, salt=ESI_SALT))
+def component_esi(request: HttpRequest) -> HttpResponse:
+    """Render a component from the signed payload of a `{% bird ... esi %}` tag.
+
+    This is the target of the `<esi:include>` elements rendered when the
+    `ESI_ENABLED` app setting is on. The response's `ETag` is derived from the
+    component's template and the payload.
+    """
+    return render_payload(request, ESI_SALT)
+
+
+@require_safe
+@condition(etag_func=partial(payload_etag, salt=LAZY_SALT))
+def component_lazy(request: HttpRequest) -> HttpResponse:
+    """Render a component from the signed payload of a `{% bird ... lazy %}` tag.
+
+    This is fetched by the placeholders rendered in place of lazy components. The
+    response's `ETag` is derived from the component's template and the payload.
+    """
+    return render_payload(request, LAZY_SALT)
@@ -259,6 +259,24 @@ def example_template(templates_dir):
     )
 
 
+@pytest.fixture(autouse=True)
+def asset_manifest():
+    from django_bird.manifest import asset_manifest
+
+    asset_manifest.reset()
+    yield asset_manifest
+    asset_manifest.reset()
+
+
+@pytest.fixture(autouse=True)
+def prerendered_components():
+    from django_bird.prerender import prerendered_components
+
+    prerendered_components.reset()
+    yield prerendered_components
+    prerendered_components.reset()
+
+
 @pytest.fixture(autouse=True)
 def registry():
     from django_bird.components import components
@@ -614,6 +614,47 @@ class TestManifest:
                 in rendered
             )
 
+    def test_asset_tag_uses_manifest_key_without_scanning(
+        self, create_template, templates_dir, static_root, registry
+    ):
+        button = TestComponent(
+            name="button", content="<button>{{ slot }}</button>"
+        ).create(templates_dir)
+
+        button_css = TestAsset(
+            component=button,
+            content=".button { color: blue; }",
+            asset_type=CSS,
+        ).create()
+
+        template_path = templates_dir / "manifest_key_test.html"
+        template_path.write_text("""
+        <html>
+        <head>
+            {% bird:css %}
+        </head>
+        </html>
+        """)
+
+        manifest_data = {
+            "django.template.loaders.filesystem.Loader:manifest_key_test.html": [
+                "button"
+            ]
+        }
+
+        manifest_path = static_root / "django_bird"
+        manifest_path.mkdir(parents=True)
+        save_asset_manifest(manifest_data, manifest_path / "manifest.json")
+
+        with override_settings(DEBUG=False):
+            template = create_template(template_path)
+            rendered = template.render({})
+
+            assert (
+                f'<link rel="stylesheet" href="/static/django_bird/bird/{button_css.file.name}">'
+                in rendered
+            )
+
     def test_asset_tag_renders_nothing_when_no_component_found(
         self, create_template, templates_dir
     ):
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import pytest
+from django.template import Context
+from django.template import Template
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.base import TokenType
+from django.template.exceptions import TemplateSyntaxError
+
+from django_bird.components import Component
+from django_bird.components import get_rendered_components
+from django_bird.loaders import loaders
+from django_bird.templatetags.tags.each import END_TAG
+from django_bird.templatetags.tags.each import TAG
+from django_bird.templatetags.tags.each import do_each
+from tests.utils import TestComponent
+from tests.utils import normalize_whitespace
+
+
+class TestTagParsing:
+    def test_do_each(self):
+        start_token = Token(
+            TokenType.BLOCK, f"{TAG} row in rows as row_item class='row' only"
+        )
+        end_token = Token(TokenType.BLOCK, END_TAG)
+
+        node = do_each(Parser([end_token]), start_token)
+
+        assert node.name == "row"
+        assert node.sequence.token == "rows"
+        assert node.item_name == "row_item"
+        assert list(node.attrs) == ["class"]
+        assert node.nodelist is not None
+        assert node.isolated_context is True
+
+    def test_self_closing(self):
+        start_token = Token(TokenType.BLOCK, f"{TAG} row in rows as item /")
+
+        node = do_each(Parser([]), start_token)
+
+        assert node.nodelist is None
+
+    @pytest.mark.parametrize(
+        "contents",
+        [
+            "",
+            "row",
+            "row in rows",
+            "row in rows as",
+            "row of rows as item",
+            "row in rows with item",
+        ],
+    )
+    def test_invalid(self, contents):
+        start_token = Token(TokenType.BLOCK, f"{TAG} {contents}")
+
+        with pytest.raises(TemplateSyntaxError, match="requires the form"):
+            do_each(Parser([]), start_token)
+
+
+@pytest.fixture
+def row(templates_dir):
+    return TestComponent(
+        name="row",
+        content="""
+            {% bird:prop name %}
+            {% bird:prop variant="plain" %}
+            <tr {{ attrs }} data-variant="{{ props.variant }}"><td>{{ props.name }}</td><td>{{ slot }}</td></tr>
+        """,
+    ).create(templates_dir)
+
+
+def test_render(row):
+    template = Template("""
+        {% bird:each row in users as user name=user.name class="row" %}
+            {{ user.email }} {{ forloop_marker }}
+        {% endbird:each %}
+    """)
+
+    rendered = template.render(
+        Context(
+            {
+                "users": [
+                    {"name": "Ada", "email": "ada@example.com"},
+                    {"name": "Bob", "email": "bob@example.com"},
+                ],
+                "forloop_marker": "!",
+            }
+        )
+    )
+
+    assert normalize_whitespace(rendered) == (
+        '<tr class="row" data-variant="plain"><td>Ada</td><td>ada@example.com !</td></tr>'
+        '<tr class="row" data-variant="plain"><td>Bob</td><td>bob@example.com !</td></tr>'
+    )
+
+
+def test_matches_for_loop(row):
+    context = {"users": [{"name": "Ada"}, {"name": None}, {"name": "Cy"}]}
+    each = Template(
+        "{% bird:each row in users as user name=user.name variant='bold' / %}"
+    )
+    loop = Template(
+        "{% for user in users %}"
+        "{% bird row name=user.name variant='bold' / %}"
+        "{% endfor %}"
+    )
+
+    assert each.render(Context(context)) == loop.render(Context(context))
+
+
+def test_item_not_leaked(row):
+    template = Template("{% bird:each row in users as user name=user / %}[{{ user }}]")
+
+    rendered = template.render(Context({"users": ["Ada"], "user": "outer"}))
+
+    assert normalize_whitespace(rendered).endswith("[outer]")
+
+
+def test_empty_and_missing_sequence(row):
+    template = Template("{% bird:each row in users as user name=user / %}")
+
+    assert template.render(Context({"users": []})) == ""
+    assert template.render(Context({})) == ""
+
+
+def test_only(row):
+    template = Template(
+        "{% bird:each row in users as user name=user only %}[{{ secret }}]{% endbird:each %}"
+    )
+
+    rendered = template.render(Context({"users": ["Ada"], "secret": "hidden"}))
+
+    assert "<td>Ada</td>" in rendered
+    assert "hidden" not in rendered
+
+
+def test_data_bird_attributes(row, override_app_settings):
+    template = Template("{% bird:each row in users as user name=user / %}")
+    component = Component.from_name("row")
+
+    with override_app_settings(ENABLE_BIRD_ATTRS=True):
+        rendered = template.render(Context({"users": ["Ada", "Bob"]}))
+
+    ids = [part.split('"')[0] for part in rendered.split('data-bird-id="')[1:]]
+    assert len(ids) == 2
+    assert all(id.startswith(f"{component.id}-") for id in ids)
+    first, second = (int(id.rsplit("-", 1)[1]) for id in ids)
+    assert second == first + 1
+    assert rendered.count("data-bird-row") == 2
+
+
+def test_rendered_components(row, override_app_settings):
+    context = Context({"users": ["Ada", "Bob"]})
+
+    with override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_TIME_ASSETS=True):
+        Template("{% bird:each row in users as user name=user / %}").render(context)
+
+    assert list(get_rendered_components(context)) == ["row"]
+
+
+def test_loaded_props_share_a_batch(templates_dir):
+    calls = []
+
+    @loaders.register("names")
+    def load_names(ids):
+        calls.append(ids)
+        return {id: f"User {id}" for id in ids}
+
+    TestComponent(
+        name="user",
+        content="""
+            {% bird:prop user load="names" %}
+            <li>{{ props.user }}</li>
+        """,
+    ).create(templates_dir)
+    template = Template("{% bird:each user in ids as id user=id / %}")
+
+    try:
+        rendered = template.render(Context({"ids": [1, 2, 3]}))
+    finally:
+        loaders.loaders.pop("names")
+
+    assert normalize_whitespace(rendered) == (
+        "<li>User 1</li><li>User 2</li><li>User 3</li>"
+    )
+    assert calls == [[1, 2, 3]]
+
+
+def test_render_many(row):
+    component = Component.from_name("row")
+
+    rendered = component.render_many(
+        ["Ada", "Bob"],
+        {"variant": "bold"},
+        item_name="person",
+        attrs={"name": "person", "variant": "variant"},
+    )
+
+    assert normalize_whitespace(rendered) == (
+        '<tr data-variant="bold"><td>Ada</td><td>None</td></tr>'
+        '<tr data-variant="bold"><td>Bob</td><td>None</td></tr>'
+    )
@@ -16,6 +16,14 @@ from django_bird.templatetags.tags.prop import do_prop
     [
         ("id", PropNode(name="id", default="None", attrs=[])),
         ("class='btn'", PropNode(name="class", default="'btn'", attrs=[])),
+        (
+            "user load='users'",
+            PropNode(name="user", default="None", attrs=[], loader="users"),
+        ),
+        (
+            'user=None load="users" extra',
+            PropNode(name="user", default="None", attrs=["extra"], loader="users"),
+        ),
     ],
 )
 def test_do_prop(contents, expected):
@@ -26,6 +34,7 @@ def test_do_prop(contents, expected):
     assert node.name == expected.name
     assert (node.default.token if node.default else node.default) == expected.default
     assert node.attrs == expected.attrs
+    assert node.loader == expected.loader
 
 
 def test_do_prop_no_args():
@@ -33,3 +42,11 @@ def test_do_prop_no_args():
 
     with pytest.raises(template.TemplateSyntaxError):
         do_prop(Parser([]), start_token)
+
+
+@pytest.mark.parametrize("option", ["load=users", "load=''", "load=", "load='users\""])
+def test_do_prop_unquoted_loader(option):
+    start_token = Token(TokenType.BLOCK, f"{TAG} user {option}")
+
+    with pytest.raises(template.TemplateSyntaxError, match="must be a quoted name"):
+        do_prop(Parser([]), start_token)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import pytest
+from django.template import Context
+from django.template import Template
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.base import TokenType
+from django.template.exceptions import TemplateSyntaxError
+
+from django_bird.templatetags.tags.pure import TAG
+from django_bird.templatetags.tags.pure import PureNode
+from django_bird.templatetags.tags.pure import do_pure
+from tests.utils import TestComponent
+from tests.utils import normalize_whitespace
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    @property
+    def tick(self):
+        self.count += 1
+        return self.count
+
+
+class TestTagParsing:
+    def test_do_pure(self):
+        node = do_pure(Parser([]), Token(TokenType.BLOCK, TAG))
+
+        assert isinstance(node, PureNode)
+
+    @pytest.mark.parametrize(
+        "bits",
+        ["yes", 'vary="weather"', 'vary="user" yes'],
+    )
+    def test_invalid(self, bits):
+        with pytest.raises(TemplateSyntaxError):
+            do_pure(Parser([]), Token(TokenType.BLOCK, f"{TAG} {bits}"))
+
+    def test_vary(self):
+        node = do_pure(
+            Parser([]), Token(TokenType.BLOCK, f'{TAG} vary="user, language"')
+        )
+
+        assert node.vary == ("user", "language")
+
+
+class TestTemplateTag:
+    @pytest.fixture
+    def badge(self, templates_dir):
+        return TestComponent(
+            name="badge",
+            content="""
+                {% bird:pure %}
+                {% bird:prop status %}
+                <span {{ attrs }}>{{ props.status }} {{ slot }} {{ counter.tick }}</span>
+            """,
+        ).create(templates_dir)
+
+    def render(self, template, counter):
+        return normalize_whitespace(
+            Template(template).render(Context({"counter": counter}))
+        )
+
+    def test_identical_renders_are_memoized(self, badge):
+        counter = Counter()
+
+        rendered = self.render(
+            "{% bird badge status='paid' class='ok' %}A{% endbird %}"
+            "{% bird badge status='paid' class='ok' %}A{% endbird %}",
+            counter,
+        )
+
+        assert counter.count == 1
+        assert rendered == (
+            '<span class="ok">paid A 1</span><span class="ok">paid A 1</span>'
+        )
+
+    @pytest.mark.parametrize(
+        "second",
+        [
+            "{% bird badge status='due' class='ok' %}A{% endbird %}",
+            "{% bird badge status='paid' class='late' %}A{% endbird %}",
+            "{% bird badge status='paid' class='ok' %}B{% endbird %}",
+            "{% bird badge status=1 class='ok' %}A{% endbird %}",
+        ],
+    )
+    def test_different_renders(self, badge, second):
+        counter = Counter()
+
+        self.render(
+            "{% bird badge status='paid' class='ok' %}A{% endbird %}" + second,
+            counter,
+        )
+
+        assert counter.count == 2
+
+    def test_props_that_cannot_be_keys(self, badge):
+        counter = Counter()
+
+        Template(
+            "{% bird badge status=status %}A{% endbird %}"
+            "{% bird badge status=status %}A{% endbird %}"
+        ).render(Context({"counter": counter, "status": object()}))
+
+        assert counter.count == 2
+
+    def test_list_and_dict_props(self, badge):
+        counter = Counter()
+
+        Template(
+            "{% bird badge status=status %}A{% endbird %}"
+            "{% bird badge status=status %}A{% endbird %}"
+        ).render(
+            Context({"counter": counter, "status": [{"paid": True}, ("due", 1.5)]})
+        )
+
+        assert counter.count == 1
+
+    def test_memoized_within_one_render(self, badge):
+        counter = Counter()
+        template = "{% bird badge status='paid' %}A{% endbird %}"
+
+        self.render(template, counter)
+        self.render(template, counter)
+
+        assert counter.count == 2
+
+    def test_impure_component(self, templates_dir):
+        TestComponent(
+            name="badge",
+            content="<span>{{ counter.tick }}</span>",
+        ).create(templates_dir)
+        counter = Counter()
+
+        rendered = self.render(
+            "{% bird badge %}{% endbird %}{% bird badge %}{% endbird %}", counter
+        )
+
+        assert rendered == "<span>1</span><span>2</span>"
+
+    @pytest.mark.default_app_settings
+    def test_no_bird_id(self, badge):
+        counter = Counter()
+
+        rendered = self.render(
+            "{% bird badge status='paid' %}A{% endbird %}"
+            "{% bird badge status='paid' %}A{% endbird %}",
+            counter,
+        )
+
+        assert counter.count == 1
+        assert "data-bird-badge" in rendered
+        assert "data-bird-id" not in rendered
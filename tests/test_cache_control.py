@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template.base import Parser
+from django.template.base import Token
+from django.template.base import TokenType
+from django.template.exceptions import TemplateSyntaxError
+from django.test import RequestFactory
+
+from django_bird import cache_control
+from django_bird.cache_control import CachePolicy
+from django_bird.middleware import CacheControlMiddleware
+from django_bird.plugins import pm
+from django_bird.templatetags.tags.cache_control import TAG
+from django_bird.templatetags.tags.cache_control import do_cache_control
+
+from .utils import TestComponent
+
+
+@pytest.fixture(autouse=True)
+def unregister_plugin():
+    yield
+    if pm.is_registered(cache_control):
+        pm.unregister(cache_control)
+
+
+class TestTagParsing:
+    def test_do_cache_control(self):
+        token = Token(
+            TokenType.BLOCK, f'{TAG} max_age=60 public vary="Cookie, Accept-Language"'
+        )
+
+        node = do_cache_control(Parser([]), token)
+
+        assert node.policy == CachePolicy(
+            max_age=60, public=True, vary=("Cookie", "Accept-Language")
+        )
+
+    @pytest.mark.parametrize(
+        "bits",
+        ["", "max_age=soon", "max_age=-1", "public private", "shared"],
+    )
+    def test_invalid(self, bits):
+        with pytest.raises(TemplateSyntaxError):
+            do_cache_control(Parser([]), Token(TokenType.BLOCK, f"{TAG} {bits}"))
+
+
+class TestCachePolicy:
+    @pytest.mark.parametrize(
+        "first,second,expected",
+        [
+            (
+                CachePolicy(max_age=600, public=True),
+                CachePolicy(max_age=60, public=True),
+                CachePolicy(max_age=60, public=True),
+            ),
+            (
+                CachePolicy(max_age=600, public=True),
+                CachePolicy(private=True),
+                CachePolicy(max_age=600, private=True),
+            ),
+            (
+                CachePolicy(public=True, vary=("Cookie",)),
+                CachePolicy(no_store=True, vary=("Accept-Language", "Cookie")),
+                CachePolicy(
+                    public=True, no_store=True, vary=("Cookie", "Accept-Language")
+                ),
+            ),
+        ],
+    )
+    def test_combine(self, first, second, expected):
+        assert first.combine(second) == expected
+        assert second.combine(first).max_age == expected.max_age
+        assert second.combine(first).private == expected.private
+
+    def test_patch_response(self):
+        response = HttpResponse()
+        response.headers["Cache-Control"] = "public, max-age=3600"
+
+        CachePolicy(max_age=60, private=True, vary=("Cookie",)).patch_response(response)
+
+        directives = {
+            directive.strip() for directive in response["Cache-Control"].split(",")
+        }
+        assert directives == {"private", "max-age=60"}
+        assert response["Vary"] == "Cookie"
+
+    @pytest.mark.parametrize(
+        "existing,policy,expected",
+        [
+            (
+                "private",
+                CachePolicy(max_age=600, public=True),
+                {"private", "max-age=600"},
+            ),
+            (
+                "no-store",
+                CachePolicy(max_age=600, public=True),
+                {"no-store", "max-age=600"},
+            ),
+            ("max-age=60", CachePolicy(max_age=600), {"max-age=60"}),
+            ("public, max-age=60", CachePolicy(max_age=30), {"public", "max-age=30"}),
+            ("public", CachePolicy(no_store=True), {"public", "no-store"}),
+        ],
+    )
+    def test_patch_response_never_loosens(self, existing, policy, expected):
+        response = HttpResponse()
+        response.headers["Cache-Control"] = existing
+
+        policy.patch_response(response)
+
+        directives = {
+            directive.strip() for directive in response["Cache-Control"].split(",")
+        }
+        assert directives == expected
+
+
+class TestCacheControlMiddleware:
+    @pytest.fixture
+    def components(self, templates_dir):
+        TestComponent(
+            name="article",
+            content="{% bird:cache_control public max_age=600 %}<article>{{ slot }}</article>",
+        ).create(templates_dir)
+        TestComponent(
+            name="menu",
+            content='{% bird:cache_control private vary="Cookie" %}<nav></nav>',
+        ).create(templates_dir)
+        TestComponent(name="plain", content="<p>{{ slot }}</p>").create(templates_dir)
+
+    def get_response(self, templates_dir, content):
+        (templates_dir / "page.html").write_text(content)
+
+        def view(request):
+            return render(request, "page.html")
+
+        return CacheControlMiddleware(view)(RequestFactory().get("/"))
+
+    @pytest.mark.usefixtures("components")
+    def test_public_page(self, templates_dir):
+        response = self.get_response(
+            templates_dir,
+            "{% bird article %}A{% endbird %}{% bird plain %}B{% endbird %}",
+        )
+
+        assert response["Cache-Control"] in (
+            "public, max-age=600",
+            "max-age=600, public",
+        )
+        assert not response.has_header("Vary")
+
+    @pytest.mark.usefixtures("components")
+    def test_private_component(self, templates_dir):
+        response = self.get_response(
+            templates_dir,
+            "{% bird article %}A{% endbird %}{% bird menu / %}{% bird menu / %}",
+        )
+
+        directives = {d.strip() for d in response["Cache-Control"].split(",")}
+        assert directives == {"private", "max-age=600"}
+        assert response["Vary"] == "Cookie"
+
+    def test_nested_declaration(self, templates_dir):
+        TestComponent(
+            name="menu",
+            content="""
+                {% spaceless %}
+                {% bird:cache_control private %}
+                <nav></nav>
+                {% endspaceless %}
+            """,
+        ).create(templates_dir)
+
+        response = self.get_response(templates_dir, "{% bird menu / %}")
+
+        assert response["Cache-Control"] == "private"
+
+    @pytest.mark.usefixtures("components")
+    def test_private_view(self, templates_dir):
+        (templates_dir / "page.html").write_text("{% bird article %}A{% endbird %}")
+
+        def view(request):
+            response = render(request, "page.html")
+            response.headers["Cache-Control"] = "private"
+            return response
+
+        response = CacheControlMiddleware(view)(RequestFactory().get("/"))
+
+        directives = {d.strip() for d in response["Cache-Control"].split(",")}
+        assert directives == {"private", "max-age=600"}
+
+    @pytest.mark.usefixtures("components")
+    def test_only_rendered_components(self, templates_dir):
+        response = self.get_response(
+            templates_dir,
+            "{% bird article %}A{% endbird %}"
+            "{% if show_menu %}{% bird menu / %}{% endif %}",
+        )
+
+        assert "private" not in response["Cache-Control"]
+
+    @pytest.mark.usefixtures("components")
+    def test_no_policies(self, templates_dir):
+        response = self.get_response(templates_dir, "{% bird plain %}B{% endbird %}")
+
+        assert not response.has_header("Cache-Control")
+
+    @pytest.mark.usefixtures("components")
+    def test_async(self, templates_dir):
+        (templates_dir / "page.html").write_text("{% bird menu / %}")
+
+        async def view(request):
+            return await asyncio.to_thread(render, request, "page.html")
+
+        async def get():
+            return await CacheControlMiddleware(view)(RequestFactory().get("/"))
+
+        response = asyncio.run(get())
+
+        assert response["Cache-Control"] == "private"
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+from django.test import override_settings
+
+from django_bird.checks import DEFERRED_ASSETS_MIDDLEWARE
+from django_bird.checks import check_render_time_assets
+from django_bird.middleware import DeferredAssetsMiddleware
+
+
+class CustomDeferredAssetsMiddleware(DeferredAssetsMiddleware):
+    pass
+
+
+class TestCheckRenderTimeAssets:
+    def test_disabled(self):
+        assert check_render_time_assets() == []
+
+    @pytest.mark.parametrize(
+        "middleware",
+        [
+            [DEFERRED_ASSETS_MIDDLEWARE],
+            [f"{__name__}.CustomDeferredAssetsMiddleware"],
+        ],
+    )
+    def test_middleware_installed(self, override_app_settings, middleware):
+        with override_app_settings(RENDER_TIME_ASSETS=True):
+            with override_settings(MIDDLEWARE=middleware):
+                assert check_render_time_assets() == []
+
+    @pytest.mark.parametrize(
+        "middleware",
+        [
+            ["django.middleware.common.CommonMiddleware"],
+            ["not_a_module.Middleware", "django.middleware.common.CommonMiddleware"],
+        ],
+    )
+    def test_middleware_missing(self, override_app_settings, middleware):
+        with override_app_settings(RENDER_TIME_ASSETS=True):
+            with override_settings(MIDDLEWARE=middleware):
+                (warning,) = check_render_time_assets()
+
+        assert warning.id == "django_bird.W001"
@@ -13,10 +13,17 @@ from django.template import Template
 from django.template.backends.django import Template as DjangoTemplate
 from django.template.context import Context
 from django.template.exceptions import TemplateDoesNotExist
+from django.test import RequestFactory
 from django.test import override_settings
+from django.utils.safestring import mark_safe
 
+from django_bird import hookimpl
+from django_bird import render_component
+from django_bird.cache_control import CachePolicy
 from django_bird.components import Component
 from django_bird.components import components
+from django_bird.components import get_rendered_components
+from django_bird.plugins import pm
 from django_bird.staticfiles import CSS
 from django_bird.staticfiles import JS
 from django_bird.staticfiles import Asset
@@ -194,6 +201,54 @@ class TestComponentClass:
         assert len(comp.id) == 7
         assert all(c in "0123456789abcdef" for c in comp.id)
 
+    def test_template_details(self, templates_dir):
+        TestComponent(
+            name="avatar",
+            content="""
+                {% bird:pure vary="user" %}
+                {% bird:cache_control private %}
+                {% bird:prop user load="users" %}
+                {% bird:prop size="16" %}
+                <img {{ attrs }}>
+            """,
+        ).create(templates_dir)
+        TestComponent(name="button", content="<button>Click me</button>").create(
+            templates_dir
+        )
+
+        avatar = Component.from_name("avatar")
+        button = Component.from_name("button")
+
+        assert avatar.pure is True
+        assert avatar.vary == ("user",)
+        assert avatar.cache_policy is not None
+        assert avatar.cache_policy.private is True
+        assert avatar.prop_names == {"user", "size"}
+        assert avatar.loaded_props == {"user": "users"}
+        assert button.pure is False
+        assert button.vary == ()
+        assert button.cache_policy is None
+        assert button.prop_names == frozenset()
+        assert button.loaded_props == {}
+
+    def test_nested_template_details(self, templates_dir):
+        TestComponent(
+            name="menu",
+            content="""
+                {% spaceless %}
+                {% bird:pure vary="user" %}
+                {% bird:cache_control private %}
+                <nav {{ attrs }}></nav>
+                {% endspaceless %}
+            """,
+        ).create(templates_dir)
+
+        menu = Component.from_name("menu")
+
+        assert menu.pure is True
+        assert menu.vary == ("user",)
+        assert menu.cache_policy == CachePolicy(private=True)
+
     def test_data_attribute_name_basic(self, templates_dir):
         button = TestComponent(
             name="button", content="<button>Click me</button>"
@@ -276,6 +331,82 @@ class TestBoundComponent:
         ) is expected
 
 
+class TestComponentRenderHooks:
+    @pytest.fixture
+    def render_plugin(self):
+        calls = []
+
+        class RenderPlugin:
+            @hookimpl
+            def before_component_render(self, component, props, context):
+                calls.append(("before", component.name, dict(props)))
+
+            @hookimpl
+            def after_component_render(self, component, props, elapsed):
+                calls.append(("after", component.name, elapsed))
+
+        pm.register(RenderPlugin(), name="RenderPlugin")
+        yield calls
+        pm.unregister(name="RenderPlugin")
+
+    def test_hooks_called(self, render_plugin, templates_dir):
+        TestComponent(
+            name="button",
+            content="{% bird:prop variant='primary' %}<button>{{ slot }}</button>",
+        ).create(templates_dir)
+
+        template = Template("{% bird button variant='secondary' %}Click{% endbird %}")
+        template.render(Context({}))
+
+        before, after = render_plugin
+        assert before == ("before", "button", {"variant": "secondary"})
+        assert after[:2] == ("after", "button")
+        assert after[2] > 0
+
+    def test_hooks_called_for_nested_components(self, render_plugin, templates_dir):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+        ).create(templates_dir)
+
+        template = Template("{% bird button %}Click{% endbird %}")
+        template.render(Context({}))
+
+        assert [call[:2] for call in render_plugin] == [
+            ("before", "button"),
+            ("before", "icon"),
+            ("after", "icon"),
+            ("after", "button"),
+        ]
+
+    def test_after_hook_called_when_render_fails(self, render_plugin, templates_dir):
+        TestComponent(name="icon", content="<svg>{{ broken.value }}</svg>").create(
+            templates_dir
+        )
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+        ).create(templates_dir)
+
+        class Broken:
+            @property
+            def value(self):
+                raise RuntimeError("boom")
+
+        template = Template("{% bird button %}Click{% endbird %}")
+        with pytest.raises(RuntimeError):
+            template.render(Context({"broken": Broken()}))
+
+        assert [call[:2] for call in render_plugin] == [
+            ("before", "button"),
+            ("before", "icon"),
+            ("after", "icon"),
+            ("after", "button"),
+        ]
+
+    def test_no_hooks_registered(self):
+        assert pm.has_component_render_hooks is False
+
+
 class TestComponentRegistryProject:
     def test_on_demand_component_loading(self, templates_dir):
         TestComponent(name="button", content="<button>Click me</button>").create(
@@ -695,6 +826,24 @@ class TestComponentRegistryAssets:
         assert Asset(button1_css.file, button1_css.asset_type) in css_assets
         assert Asset(button2_css.file, button2_css.asset_type) in css_assets
 
+    def test_nested_component_usage(self, templates_dir):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+        ).create(templates_dir)
+        TestComponent(
+            name="toolbar", content="<div>{% bird button %}Go{% endbird %}</div>"
+        ).create(templates_dir)
+
+        test_template = templates_dir / "test_nested.html"
+        test_template.write_text("""
+        {% bird toolbar / %}
+        """)
+
+        used_components = components.get_component_names_used_in_template(test_template)
+
+        assert used_components == {"toolbar", "button", "icon"}
+
     def test_missing_asset_file(self, templates_dir):
         button = TestComponent(
             name="button", content="<button>Click me</button>"
@@ -750,6 +899,34 @@ class TestComponentRegistryCaching:
             assert second is first
             assert "Original" in second.template.template.source
 
+    def test_tree_id(self, templates_dir):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button",
+            content="<button>{% bird icon / %}{% bird missing / %}</button>",
+        ).create(templates_dir)
+        icon = components.get_component("icon")
+        button = components.get_component("button")
+
+        assert components.get_tree_id(icon) == icon.id
+        assert components.get_tree_id(button) != button.id
+
+    @pytest.mark.parametrize("debug", [True, False])
+    def test_tree_id_nested_template_changed(self, debug, templates_dir):
+        icon = TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}</button>"
+        ).create(templates_dir)
+
+        with override_settings(DEBUG=debug):
+            button = components.get_component("button")
+            before = components.get_tree_id(button)
+            icon.file.write_text("<svg><path></path></svg>")
+            after = components.get_tree_id(button)
+
+        # Templates are only reloaded with `DEBUG` on
+        assert (before != after) is debug
+
     @pytest.mark.parametrize("debug", [True, False])
     def test_asset_tracking(self, debug, templates_dir):
         button = TestComponent(
@@ -872,3 +1049,69 @@ class TestComponentRegistryPerformance:
 
         # Cached access should be significantly faster
         assert cached_access < first_access / 2
+
+
+class TestRenderComponent:
+    @pytest.fixture
+    def card(self, templates_dir):
+        return TestComponent(
+            name="card",
+            content="""
+                {% bird:prop title %}
+                <div {{ attrs }}><h2>{{ props.title }}</h2>{{ slot }}{% bird:slot footer %}{% endbird:slot %}<p>{{ user }}</p></div>
+            """,
+        ).create(templates_dir)
+
+    def test_render_component(self, card):
+        rendered = render_component(
+            "card",
+            props={"title": "<Hello>", "class": "card", "hidden": True},
+            slots={"default": "<b>body</b>", "footer": mark_safe("<i>foot</i>")},
+            context={"user": "Ada"},
+        )
+
+        assert normalize_whitespace(rendered) == (
+            '<div class="card" hidden><h2>&lt;Hello&gt;</h2>'
+            "&lt;b&gt;body&lt;/b&gt;<i>foot</i><p>Ada</p></div>"
+        )
+
+    @pytest.mark.parametrize(
+        "name", ["x><script>alert(1)</script><b", 'title="x"', "a b", "", "a/b"]
+    )
+    def test_invalid_attr_name(self, card, name):
+        with pytest.raises(ValueError, match="not a valid attribute name"):
+            render_component("card", props={name: "1"})
+
+    @pytest.mark.parametrize("name", ["data-id", "x-on:click", "@click", ":class"])
+    def test_attr_names(self, card, name):
+        rendered = render_component("card", props={name: "1"})
+
+        assert f'{name}="1"' in rendered
+
+    def test_props_not_resolved(self, card):
+        rendered = render_component(
+            "card", props={"title": "user"}, context={"user": "Ada"}
+        )
+
+        assert "<h2>user</h2>" in rendered
+
+    def test_request(self, card):
+        rendered = render_component("card", request=RequestFactory().get("/"))
+
+        assert "<h2>None</h2>" in rendered
+
+    def test_render_time_assets(self, card, override_app_settings):
+        context = Context({})
+
+        with override_app_settings(ENABLE_BIRD_ATTRS=True, RENDER_TIME_ASSETS=True):
+            rendered = render_component("card", context=context)
+
+        assert list(get_rendered_components(context)) == ["card"]
+        assert f'data-bird-id="{Component.from_name("card").id}-' in rendered
+
+    def test_matches_tag(self, card):
+        template = Template("{% bird card title='Hi' class='x' / %}")
+
+        assert render_component("card", props={"title": "Hi", "class": "x"}) == (
+            template.render(Context({}))
+        )
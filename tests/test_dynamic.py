@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import TemplateSyntaxError
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test import override_settings
+from django.views.decorators.cache import cache_page
+
+from django_bird.dynamic import DYNAMIC_PLACEHOLDER_PATTERN
+from django_bird.dynamic import defer_dynamic_components
+from django_bird.dynamic import render_dynamic_components
+from django_bird.middleware import DynamicComponentsMiddleware
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+
+@pytest.fixture(autouse=True)
+def request_context_processor():
+    options = settings.TEMPLATES[0].get("OPTIONS", {})
+    with override_settings(
+        TEMPLATES=[
+            settings.TEMPLATES[0]
+            | {
+                "OPTIONS": options
+                | {"context_processors": ["django.template.context_processors.request"]}
+            }
+        ],
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+    ):
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def page(templates_dir):
+    TestComponent(
+        name="greeting",
+        content="""
+            {% bird:prop salutation %}
+            <span>{{ props.salutation }}, {{ request.META.HTTP_X_NAME|default:"guest" }}{{ slot }}</span>
+        """,
+    ).create(templates_dir)
+    (templates_dir / "page.html").write_text(
+        "<h1>{{ title }}</h1>"
+        "{% bird greeting salutation=salutation dynamic %}{{ punctuation }}{% endbird %}"
+    )
+    return "page.html"
+
+
+def test_renders_inline_without_deferring(page):
+    rendered = render_to_string(
+        page, {"title": "Home", "salutation": "Hello", "punctuation": "!"}
+    )
+
+    assert normalize_whitespace(rendered) == ("<h1>Home</h1><span>Hello, guest!</span>")
+
+
+def test_renders_placeholder_when_deferring(page):
+    with defer_dynamic_components():
+        rendered = render_to_string(
+            page, {"title": "Home", "salutation": "Hello", "punctuation": "!"}
+        )
+
+    assert rendered.startswith("<h1>Home</h1><!--bird:dynamic ")
+    assert "Hello" not in rendered
+
+    filled = render_dynamic_components(
+        rendered.encode(), RequestFactory().get("/", headers={"x-name": "Ada"})
+    )
+
+    assert normalize_whitespace(filled.decode()) == (
+        "<h1>Home</h1><span>Hello, Ada!</span>"
+    )
+
+
+def test_unsigned_placeholders_are_left(page):
+    content = b"<!--bird:dynamic forged-->"
+
+    assert render_dynamic_components(content) == content
+
+
+def test_unserializable_props(page):
+    with defer_dynamic_components(), pytest.raises(TemplateSyntaxError):
+        render_to_string(page, {"salutation": object()})
+
+
+def test_nested_dynamic_components(templates_dir, page):
+    (templates_dir / "nested.html").write_text(
+        "{% bird greeting salutation='Hi' dynamic %}"
+        "{% bird greeting salutation='Hey' dynamic %}?{% endbird %}"
+        "{% endbird %}"
+    )
+
+    with defer_dynamic_components():
+        rendered = render_to_string("nested.html")
+    filled = render_dynamic_components(rendered.encode(), RequestFactory().get("/"))
+
+    assert not DYNAMIC_PLACEHOLDER_PATTERN.search(filled)
+    assert normalize_whitespace(filled.decode()) == (
+        "<span>Hi, guest<span>Hey, guest?</span></span>"
+    )
+
+
+class TestDynamicComponentsMiddleware:
+    def test_cached_page(self, page):
+        renders = []
+
+        @cache_page(60)
+        def view(request):
+            renders.append(request)
+            context = {"title": "Home", "salutation": "Hello", "punctuation": "!"}
+            return render(request, page, context)
+
+        middleware = DynamicComponentsMiddleware(view)
+        factory = RequestFactory()
+
+        first = middleware(factory.get("/", headers={"x-name": "Ada"}))
+        second = middleware(factory.get("/", headers={"x-name": "Grace"}))
+
+        assert len(renders) == 1
+        assert normalize_whitespace(first.content.decode()) == (
+            "<h1>Home</h1><span>Hello, Ada!</span>"
+        )
+        assert normalize_whitespace(second.content.decode()) == (
+            "<h1>Home</h1><span>Hello, Grace!</span>"
+        )
+
+    def test_content_length(self, page):
+        def view(request):
+            response = render(request, page, {"salutation": "Hello"})
+            response.headers["Content-Length"] = str(len(response.content))
+            return response
+
+        response = DynamicComponentsMiddleware(view)(RequestFactory().get("/"))
+
+        assert response.headers["Content-Length"] == str(len(response.content))
+
+    def test_async(self, page):
+        async def view(request):
+            return await asyncio.to_thread(render, request, page, {"salutation": "Hi"})
+
+        async def get():
+            middleware = DynamicComponentsMiddleware(view)
+            return await middleware(RequestFactory().get("/"))
+
+        response = asyncio.run(get())
+
+        assert "<span>Hi, guest</span>" in normalize_whitespace(
+            response.content.decode()
+        )
+
+    def test_streaming_response(self, page):
+        def view(request):
+            content = render_to_string(page, {"salutation": "Hello"})
+            return StreamingHttpResponse([content])
+
+        response = DynamicComponentsMiddleware(view)(RequestFactory().get("/"))
+
+        assert DYNAMIC_PLACEHOLDER_PATTERN.search(b"".join(response.streaming_content))
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import html
+import logging
+import re
+
+import pytest
+from django.core import signing
+from django.template.loader import render_to_string
+from django.test import Client
+from django.test import override_settings
+
+from django_bird.esi import ESI_SALT
+from django_bird.payloads import ComponentPayload
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+INCLUDE_PATTERN = re.compile(r'<esi:include src="([^"]+)" />')
+
+
+@pytest.fixture
+def page(templates_dir):
+    TestComponent(
+        name="price",
+        content="""
+            {% bird:prop amount %}
+            <span {{ attrs }}>{{ props.amount }} {{ slot }}{% bird:slot unit %}{% endbird:slot %}</span>
+        """,
+    ).create(templates_dir)
+    (templates_dir / "product.html").write_text("""
+        <h1>{{ product.name }}</h1>
+        {% bird price amount=product.price class="price" esi %}
+{{ product.currency }}{% bird:slot unit %}/{{ product.unit }}{% endbird:slot %}
+        {% endbird %}
+    """)
+    return "product.html"
+
+
+@pytest.fixture
+def product():
+    return {"name": "Tea", "price": 4, "currency": "EUR", "unit": "kg"}
+
+
+@pytest.fixture
+def esi(override_app_settings):
+    with override_app_settings(ENABLE_BIRD_ATTRS=False, ESI_ENABLED=True):
+        yield
+
+
+def test_inline_when_disabled(page, product):
+    rendered = render_to_string(page, {"product": product})
+
+    assert "esi:include" not in rendered
+    assert '<span class="price">4 EUR /kg</span>' in normalize_whitespace(rendered)
+
+
+def test_include(page, product, esi):
+    rendered = render_to_string(page, {"product": product})
+
+    (src,) = INCLUDE_PATTERN.findall(rendered)
+    assert src.startswith("/__bird__/esi/?c=")
+    assert "<span" not in rendered
+    assert "<h1>Tea</h1>" in rendered
+
+
+def test_endpoint(page, product, esi):
+    rendered = render_to_string(page, {"product": product})
+    (src,) = INCLUDE_PATTERN.findall(rendered)
+
+    response = Client().get(html.unescape(src))
+
+    assert response.status_code == 200
+    assert normalize_whitespace(response.content.decode()) == (
+        '<span class="price">4 EUR /kg</span>'
+    )
+    assert response.headers["ETag"]
+
+
+def test_endpoint_not_modified(page, product, esi):
+    src = html.unescape(
+        INCLUDE_PATTERN.findall(render_to_string(page, {"product": product}))[0]
+    )
+    etag = Client().get(src).headers["ETag"]
+
+    response = Client().get(src, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.usefixtures("esi")
+@override_settings(DEBUG=True)
+def test_endpoint_etag_depends_on_nested_templates(templates_dir):
+    icon = TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(name="badge", content="<b>{% bird icon / %}</b>").create(
+        templates_dir
+    )
+    src = f"/__bird__/esi/?c={ComponentPayload('badge').dumps(ESI_SALT)}"
+    before = Client().get(src).headers["ETag"]
+    icon.content = "<svg><path></path></svg>"
+    icon.create(templates_dir)
+
+    after = Client().get(src).headers["ETag"]
+
+    assert before != after
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "tampered",
+        signing.dumps({"name": "price", "props": {}, "slots": {}}, salt="other"),
+    ],
+)
+def test_endpoint_bad_signature(token):
+    response = Client().get("/__bird__/esi/", {"c": token})
+
+    assert response.status_code == 400
+
+
+def test_endpoint_missing_component():
+    token = ComponentPayload("missing").dumps(ESI_SALT)
+
+    response = Client().get("/__bird__/esi/", {"c": token})
+
+    assert response.status_code == 404
+
+
+def test_unserializable_props_render_inline(page, esi, caplog):
+    product = {"name": "Tea", "price": object(), "currency": "EUR", "unit": "kg"}
+
+    with caplog.at_level(logging.WARNING, logger="django_bird"):
+        rendered = render_to_string(page, {"product": product})
+
+    assert "esi:include" not in rendered
+    assert "<span" in rendered
+    assert "cannot be serialized" in caplog.text
+
+
+def test_render_time_assets(page, product, override_app_settings):
+    from django.template.context import Context
+
+    from django_bird.components import get_rendered_components
+
+    with override_app_settings(
+        ENABLE_BIRD_ATTRS=False, ESI_ENABLED=True, RENDER_TIME_ASSETS=True
+    ):
+        from django.template.loader import get_template
+
+        template = get_template(page).template
+        context = Context({"product": product})
+        template.render(context)
+
+    assert "price" in get_rendered_components(context)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from django.template import Context
+from django.template import Template
+from django.template.base import Parser
+from django.test import override_settings
+
+from django_bird import cache_control
+from django_bird import hookimpl
+from django_bird.cache_control import CachePolicy
+from django_bird.cache_control import record_cache_policies
+from django_bird.components import get_rendered_components
+from django_bird.folding import is_literal
+from django_bird.loaders import loaders
+from django_bird.plugins import pm
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    @property
+    def tick(self):
+        self.count += 1
+        return self.count
+
+
+@dataclass
+class Glyph:
+    name: str
+
+
+@pytest.fixture
+def icon(templates_dir):
+    return TestComponent(
+        name="icon",
+        content="""
+            {% bird:pure %}
+            {% bird:prop glyph %}
+            {% bird:prop size="24" %}
+            <svg {{ attrs }} width="{{ props.size }}">{{ props.glyph }} {{ counter.tick }}</svg>
+        """,
+    ).create(templates_dir)
+
+
+def render(template, counter, **context):
+    return normalize_whitespace(
+        template.render(Context({"counter": counter, **context}))
+    )
+
+
+@pytest.mark.parametrize(
+    "token,expected",
+    [
+        ('"check"', True),
+        ("16", True),
+        ("True", True),
+        ("shape", False),
+        ('"check"|upper', False),
+        ('_("check")', False),
+    ],
+)
+def test_is_literal(token, expected):
+    parser = Parser([])
+    parser.filters["upper"] = str.upper
+
+    assert is_literal(parser.compile_filter(token)) is expected
+
+
+class TestFolding:
+    def test_renders_once(self, icon):
+        counter = Counter()
+        template = Template('{% bird icon glyph="check" size="16" class="ok" / %}')
+
+        first = render(template, counter)
+        second = render(template, counter)
+
+        assert counter.count == 1
+        assert first == second == '<svg class="ok" width="16">check 1</svg>'
+
+    @pytest.mark.parametrize(
+        "tag",
+        [
+            "{% bird icon glyph=shape / %}",
+            '{% bird icon glyph="check" %}{{ shape }}{% endbird %}',
+            '{% bird icon glyph="check" %}{% endbird %}',
+        ],
+    )
+    def test_not_constant(self, icon, tag):
+        counter = Counter()
+        template = Template(tag)
+
+        render(template, counter, shape="cross")
+        render(template, counter, shape="cross")
+
+        assert counter.count == 2
+
+    def test_impure_component(self, templates_dir):
+        TestComponent(name="icon", content="<svg>{{ counter.tick }}</svg>").create(
+            templates_dir
+        )
+        counter = Counter()
+        template = Template("{% bird icon / %}")
+
+        render(template, counter)
+        rendered = render(template, counter)
+
+        assert rendered == "<svg>2</svg>"
+
+    def test_loaded_props(self, templates_dir):
+        loaded = []
+
+        @loaders.register("glyphs")
+        def load_glyphs(names):
+            loaded.append(names)
+            return {name: Glyph(name) for name in names}
+
+        TestComponent(
+            name="icon",
+            content="""
+                {% bird:pure %}
+                {% bird:prop glyph load="glyphs" %}
+                <svg>{{ props.glyph.name }} {{ counter.tick }}</svg>
+            """,
+        ).create(templates_dir)
+        counter = Counter()
+        template = Template('{% bird icon glyph="check" / %}')
+
+        try:
+            render(template, counter)
+            rendered = render(template, counter)
+        finally:
+            loaders.loaders.pop("glyphs")
+
+        assert counter.count == 2
+        assert rendered == "<svg>check 2</svg>"
+        assert loaded == [["check"], ["check"]]
+
+    def test_vary(self, templates_dir):
+        TestComponent(
+            name="icon",
+            content='{% bird:pure vary="language" %}<svg>{{ counter.tick }}</svg>',
+        ).create(templates_dir)
+        counter = Counter()
+        template = Template("{% bird icon / %}")
+
+        render(template, counter)
+        render(template, counter)
+
+        assert counter.count == 2
+
+    @override_settings(DEBUG=True)
+    def test_debug(self, icon):
+        counter = Counter()
+        template = Template('{% bird icon glyph="check" / %}')
+
+        render(template, counter)
+        render(template, counter)
+
+        assert counter.count == 2
+
+    def test_settings_change(self, icon, override_app_settings):
+        counter = Counter()
+        template = Template('{% bird icon glyph="check" / %}')
+
+        render(template, counter)
+        with override_app_settings(ENABLE_BIRD_ATTRS=True):
+            rendered = render(template, counter)
+
+        assert counter.count == 2
+        assert "data-bird-icon" in rendered
+
+    def test_rendered_components(self, icon, override_app_settings):
+        template = Template('{% bird icon glyph="check" / %}')
+        render(template, Counter())
+
+        with override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_TIME_ASSETS=True):
+            context = Context({"counter": Counter()})
+            template.render(context)
+
+        assert list(get_rendered_components(context)) == ["icon"]
+
+    def test_render_hooks(self, icon):
+        rendered = []
+
+        class Plugin:
+            @staticmethod
+            @hookimpl
+            def before_component_render(component, props, context):
+                rendered.append((component.name, props))
+
+        plugin = Plugin()
+        pm.register(plugin)
+        try:
+            counter = Counter()
+            template = Template('{% bird icon glyph="check" / %}')
+            render(template, counter)
+            render(template, counter)
+        finally:
+            pm.unregister(plugin)
+
+        assert counter.count == 1
+        assert rendered == [
+            ("icon", {"glyph": "check", "size": "24"}),
+            ("icon", {"glyph": "check", "size": "24"}),
+        ]
+
+    def test_nested_components(self, templates_dir, override_app_settings):
+        TestComponent(
+            name="outer",
+            content="{% bird:pure %}<div>{% bird inner / %} {{ counter.tick }}</div>",
+        ).create(templates_dir)
+        TestComponent(
+            name="inner", content="{% bird:cache_control private %}<span></span>"
+        ).create(templates_dir)
+        rendered = []
+
+        class Plugin:
+            @staticmethod
+            @hookimpl
+            def before_component_render(component, props, context):
+                rendered.append(component.name)
+
+        counter = Counter()
+        template = Template("{% bird outer / %}")
+        render(template, counter)
+
+        plugin = Plugin()
+        pm.register(plugin)
+        pm.register(cache_control)
+        try:
+            with (
+                override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_TIME_ASSETS=True),
+                record_cache_policies() as policies,
+            ):
+                context = Context({"counter": counter})
+                output = template.render(context)
+        finally:
+            pm.unregister(plugin)
+            pm.unregister(cache_control)
+
+        assert counter.count == 1
+        assert "<span></span> 1" in output
+        assert list(get_rendered_components(context)) == ["outer", "inner"]
+        assert policies.policy == CachePolicy(private=True)
+        assert rendered == ["outer", "inner"]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.template import TemplateDoesNotExist
+from django.template import TemplateSyntaxError
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from django_bird import render_fragment
+from django_bird.fragments import get_fragments
+from django_bird.fragments import render_fragment_to_string
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+
+@pytest.fixture
+def page(templates_dir):
+    TestComponent(
+        name="table",
+        content="""
+            {% bird:prop caption %}
+            <table><caption>{{ props.caption }}</caption>{{ slot }}</table>
+        """,
+    ).create(templates_dir)
+    TestComponent(name="nav", content="<nav>{{ slot }}</nav>").create(templates_dir)
+    (templates_dir / "base.html").write_text(
+        "<html>{% block content %}{% endblock %}</html>"
+    )
+    (templates_dir / "orders.html").write_text("""
+        {% extends "base.html" %}
+        {% block content %}
+            {% bird nav %}{{ broken_if_rendered.method }}{% endbird %}
+            {% if show %}
+                {% bird table caption=title fragment="orders" %}
+                    {% for order in orders %}<tr><td>{{ order }}</td></tr>{% endfor %}
+                {% endbird %}
+            {% endif %}
+        {% endblock %}
+    """)
+    return "orders.html"
+
+
+def test_render_fragment_to_string(page):
+    rendered = render_fragment_to_string(
+        page, "orders", {"title": "Orders", "orders": [1, 2]}
+    )
+
+    assert normalize_whitespace(rendered) == (
+        "<table><caption>Orders</caption><tr><td>1</td></tr><tr><td>2</td></tr></table>"
+    )
+
+
+def test_render_fragment(page):
+    request = RequestFactory().get("/")
+
+    response = render_fragment(request, page, "orders", {"orders": [1]}, status=201)
+
+    assert response.status_code == 201
+    assert b"<td>1</td>" in response.content
+    assert b"<nav>" not in response.content
+    assert b"<html>" not in response.content
+
+
+def test_fragments_cached(page):
+    template = get_template(page).template
+
+    fragments = get_fragments(template)
+
+    assert list(fragments) == ["orders"]
+    assert fragments["orders"].name == "table"
+    assert get_fragments(template) is fragments
+
+
+def test_select_template(page):
+    rendered = render_fragment_to_string(["missing.html", page], "orders", {})
+
+    assert "<table>" in rendered
+
+
+def test_not_a_django_template(page):
+    with patch(
+        "django_bird.fragments.get_template",
+        return_value=SimpleNamespace(template=object()),
+    ):
+        with pytest.raises(TemplateDoesNotExist, match="orders.html#orders"):
+            render_fragment_to_string(page, "orders")
+
+
+def test_fragment_not_an_attribute(page):
+    node = get_fragments(get_template(page).template)["orders"]
+
+    assert list(node.attrs) == ["caption"]
+
+
+def test_missing_fragment(page):
+    with pytest.raises(TemplateDoesNotExist, match="orders.html#missing"):
+        render_fragment_to_string(page, "missing")
+
+
+def test_duplicate_fragment(templates_dir):
+    TestComponent(name="box", content="<div>{{ slot }}</div>").create(templates_dir)
+    (templates_dir / "dupes.html").write_text(
+        '{% bird box fragment="a" %}{% endbird %}{% bird box fragment="a" %}{% endbird %}'
+    )
+
+    with pytest.raises(TemplateSyntaxError, match="'a' is defined more than once"):
+        render_fragment_to_string("dupes.html", "a")
+
+
+@pytest.mark.parametrize("option", ["fragment=orders", "fragment=''", "fragment="])
+def test_unquoted_fragment(templates_dir, option):
+    (templates_dir / "bad.html").write_text(f"{{% bird box {option} / %}}")
+
+    with pytest.raises(TemplateSyntaxError, match="must be a quoted name"):
+        get_template("bad.html")
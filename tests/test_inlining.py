@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from django.template import Context
+from django.template import Template
+from django.template.base import Template as BaseTemplate
+from django.test import override_settings
+
+from django_bird import hookimpl
+from django_bird.components import get_rendered_components
+from django_bird.nested import NestedRender
+from django_bird.nested import record_nested_renders
+from django_bird.plugins import pm
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+
+@dataclass
+class User:
+    name: str
+
+
+@pytest.fixture
+def template_renders(monkeypatch):
+    rendered = []
+    render = BaseTemplate._render
+
+    def _render(self, context):
+        rendered.append(self)
+        return render(self, context)
+
+    monkeypatch.setattr(BaseTemplate, "_render", _render)
+    return rendered
+
+
+@pytest.fixture
+def inline_settings(override_app_settings):
+    with override_app_settings(ENABLE_BIRD_ATTRS=False, INLINE_COMPONENTS=True):
+        yield
+
+
+@pytest.fixture
+def button(templates_dir):
+    return TestComponent(
+        name="button",
+        content="""
+            {% bird:prop variant="primary" %}
+            <button class="btn-{{ props.variant }}" {{ attrs }}>{{ slot }}</button>
+        """,
+    ).create(templates_dir)
+
+
+def render(tag, override_app_settings, inline, **context):
+    with override_app_settings(ENABLE_BIRD_ATTRS=False, INLINE_COMPONENTS=inline):
+        template = Template(tag)
+        rendered = template.render(Context(context))
+    (node,) = template.nodelist
+    return normalize_whitespace(rendered), node
+
+
+CONTEXT = {
+    "user": User("Ada"),
+    "items": ["a", "b"],
+    "size": 16,
+    "slot": "Outer",
+}
+
+
+@pytest.mark.parametrize(
+    "content,tag",
+    [
+        (
+            "{% bird:prop user %}<b>{{ props.user.name|upper }}</b>",
+            "{% bird card user=user / %}",
+        ),
+        (
+            """
+            {% bird:prop size="24" %}{% bird:prop hidden %}
+            {% if props.size == 16 and not props.hidden %}small{% elif props.size %}{{ props.size }}{% else %}none{% endif %}
+            """,
+            "{% bird card size=size / %}",
+        ),
+        (
+            """
+            {% bird:prop rows %}{% bird:prop label="Row" %}
+            {% for row in props.rows %}{{ props.label }} {{ row }}{{ forloop.counter }}{% empty %}Empty{% endfor %}
+            """,
+            "{% bird card rows=items / %}",
+        ),
+        (
+            "{% bird:prop glyph %}<i>{{ props.glyph }}</i>",
+            "{% bird card glyph=check / %}",
+        ),
+        (
+            "{% load static %}{# icon #}<i {{ attrs }}>{{ slot }}</i>",
+            "{% bird card class='icon' %}{% if user %}{{ user.name }}{% endif %}{% endbird %}",
+        ),
+    ],
+)
+def test_inlined(templates_dir, override_app_settings, content, tag):
+    TestComponent(name="card", content=content).create(templates_dir)
+
+    expected, _node = render(tag, override_app_settings, False, **CONTEXT)
+    rendered, node = render(tag, override_app_settings, True, **CONTEXT)
+
+    assert node.inlined.nodelist is not None
+    assert rendered == expected
+
+
+@pytest.mark.parametrize(
+    "content,tag",
+    [
+        (
+            "{% for item in items %}{% cycle 'odd' 'even' %}{% endfor %}",
+            "{% bird card / %}",
+        ),
+        ("<i {{ attrs }}></i><b {{ attrs }}></b>", "{% bird card id='x' / %}"),
+        (
+            "{% for item in items %}{{ slot }}{% endfor %}",
+            "{% bird card %}X{% endbird %}",
+        ),
+        ("<i>{{ slot }}</i>", "{% bird card / %}"),
+        ("<i>{{ slot }}</i>", "{% bird card %}{% endbird %}"),
+        ("<i>{{ slot }}{{ slot }}</i>", "{% bird card %}X{% endbird %}"),
+        ("<i>{{ props.missing }}</i>", "{% bird card / %}"),
+        ("<i>{{ props }}</i>", "{% bird card / %}"),
+        ("<i>{{ slots.footer }}</i>", "{% bird card / %}"),
+        ("{% bird:prop title %}<i>{{ title|default:attrs }}</i>", "{% bird card / %}"),
+        (
+            "{% bird:slot footer %}Footer{% endbird:slot %}",
+            "{% bird card %}{% bird:slot footer %}F{% endbird:slot %}{% endbird %}",
+        ),
+        (
+            "{% bird:prop label %}{% for item in items %}{{ props.label }}{% endfor %}",
+            "{% bird card label=item.upper / %}",
+        ),
+        (
+            "{% bird:prop label %}{% for item in items %}{{ forloop.counter }}{{ props.label }}{% endfor %}",
+            "{% bird card label=forloop / %}",
+        ),
+        (
+            "{% bird:prop label %}{% for item in items %}{{ props.label }}{% endfor %}",
+            "{% bird card label=title|default:item / %}",
+        ),
+        ("{% bird:pure %}<i>{{ user.name }}</i>", "{% bird card / %}"),
+        ("<i>{{ user.name }}</i>", "{% bird card only / %}"),
+        ("{% with x=1 %}{{ x }}{% endwith %}", "{% bird card / %}"),
+    ],
+)
+def test_not_inlined(templates_dir, override_app_settings, content, tag):
+    TestComponent(name="card", content=content).create(templates_dir)
+    context = {**CONTEXT, "item": "outer"}
+
+    expected, _node = render(tag, override_app_settings, False, **context)
+    rendered, node = render(tag, override_app_settings, True, **context)
+
+    assert node.inlined is None or node.inlined.nodelist is None
+    assert rendered == expected
+
+
+@pytest.mark.usefixtures("inline_settings", "button")
+class TestInlining:
+    def test_no_nested_template_render(self, template_renders):
+        template = Template(
+            '{% bird button variant="danger" id="delete" %}Delete{% endbird %}'
+        )
+
+        rendered = template.render(Context({}))
+
+        assert normalize_whitespace(rendered) == (
+            '<button class="btn-danger" id="delete">Delete</button>'
+        )
+        assert template_renders == [template]
+
+    def test_nested_components(self, template_renders):
+        template = Template(
+            "{% bird button %}{% bird button variant='link' %}Go{% endbird %}{% endbird %}"
+        )
+        context = Context({})
+
+        with record_nested_renders(context) as nested:
+            rendered = template.render(context)
+
+        assert normalize_whitespace(rendered) == (
+            '<button class="btn-primary"><button class="btn-link">Go</button></button>'
+        )
+        assert template_renders == [template]
+        assert nested == [NestedRender("button"), NestedRender("button")]
+
+    def test_data_attrs(self, override_app_settings):
+        template = Template("{% bird button %}Go{% endbird %}")
+
+        with override_app_settings(ENABLE_BIRD_ATTRS=True, INLINE_COMPONENTS=True):
+            first = template.render(Context({}))
+            second = template.render(Context({}))
+
+        assert template.nodelist[0].inlined.nodelist is not None
+        assert 'data-bird-id="' in first
+        assert first != second
+
+    def test_rendered_components(self, override_app_settings):
+        template = Template("{% bird button %}Go{% endbird %}")
+        context = Context({})
+
+        with override_app_settings(
+            ENABLE_BIRD_ATTRS=False, INLINE_COMPONENTS=True, RENDER_TIME_ASSETS=True
+        ):
+            template.render(context)
+
+        assert list(get_rendered_components(context)) == ["button"]
+
+    def test_component_changed(self, templates_dir, registry):
+        template = Template("{% bird button %}Go{% endbird %}")
+        template.render(Context({}))
+
+        TestComponent(name="button", content="<a>{{ slot }}</a>").create(templates_dir)
+        registry.reset()
+        rendered = template.render(Context({}))
+
+        assert rendered == "<a>Go</a>"
+
+    @override_settings(DEBUG=True)
+    def test_debug(self, template_renders):
+        template = Template("{% bird button %}Go{% endbird %}")
+
+        template.render(Context({}))
+
+        assert len(template_renders) == 2
+        assert template.nodelist[0].inlined is None
+
+    def test_render_hooks(self, template_renders):
+        rendered = []
+
+        class Plugin:
+            @staticmethod
+            @hookimpl
+            def before_component_render(component, props, context):
+                rendered.append((component.name, props))
+
+        plugin = Plugin()
+        pm.register(plugin)
+        try:
+            Template("{% bird button %}Go{% endbird %}").render(Context({}))
+        finally:
+            pm.unregister(plugin)
+
+        assert len(template_renders) == 2
+        assert rendered == [("button", {"variant": "primary"})]
+
+    def test_disabled(self, template_renders, override_app_settings):
+        template = Template("{% bird button %}Go{% endbird %}")
+
+        with override_app_settings(ENABLE_BIRD_ATTRS=False):
+            template.render(Context({}))
+
+        assert len(template_renders) == 2
+        assert template.nodelist[0].inlined is None
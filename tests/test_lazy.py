@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import html
+import logging
+import re
+
+import pytest
+from django.core import signing
+from django.template.loader import render_to_string
+from django.test import Client
+
+from django_bird.lazy import LAZY_SALT
+from django_bird.payloads import ComponentPayload
+
+from .utils import TestComponent
+from .utils import normalize_whitespace
+
+PLACEHOLDER_PATTERN = re.compile(
+    r'<div hx-get="([^"]+)" hx-trigger="revealed" hx-swap="outerHTML">(.*?)</div>',
+    re.DOTALL,
+)
+
+
+@pytest.fixture
+def page(templates_dir):
+    TestComponent(
+        name="reviews",
+        content="""
+            {% bird:prop product %}
+            <ul {{ attrs }}>{% for review in props.product.reviews %}<li>{{ review }}</li>{% endfor %}</ul>
+        """,
+    ).create(templates_dir)
+    (templates_dir / "product.html").write_text(
+        "<h1>{{ product.name }}</h1>"
+        '{% bird reviews product=product class="reviews" lazy %}'
+        "{% bird:slot fallback %}<p>Loading reviews</p>{% endbird:slot %}"
+        "{% endbird %}"
+    )
+    return "product.html"
+
+
+@pytest.fixture
+def product():
+    return {"name": "Tea", "reviews": ["Lovely", "Too strong"]}
+
+
+def test_placeholder(page, product):
+    rendered = render_to_string(page, {"product": product})
+
+    ((src, fallback),) = PLACEHOLDER_PATTERN.findall(rendered)
+    assert src.startswith("/__bird__/lazy/?c=")
+    assert fallback == "<p>Loading reviews</p>"
+    assert "<ul" not in rendered
+    assert rendered.startswith("<h1>Tea</h1>")
+
+
+def test_placeholder_without_fallback(templates_dir, page, product):
+    (templates_dir / "no_fallback.html").write_text(
+        "{% bird reviews product=product lazy / %}"
+    )
+
+    rendered = render_to_string("no_fallback.html", {"product": product})
+
+    ((_src, fallback),) = PLACEHOLDER_PATTERN.findall(rendered)
+    assert fallback == ""
+
+
+def test_endpoint(page, product):
+    rendered = render_to_string(page, {"product": product})
+    ((src, _fallback),) = PLACEHOLDER_PATTERN.findall(rendered)
+
+    response = Client().get(html.unescape(src))
+
+    assert response.status_code == 200
+    assert normalize_whitespace(response.content.decode()) == (
+        '<ul class="reviews"><li>Lovely</li><li>Too strong</li></ul>'
+    )
+    assert response.headers["ETag"]
+
+
+@pytest.mark.parametrize(
+    "salt",
+    ["django_bird.esi", "other"],
+)
+def test_endpoint_bad_signature(salt):
+    token = signing.dumps({"name": "reviews", "props": {}, "slots": {}}, salt=salt)
+
+    response = Client().get("/__bird__/lazy/", {"c": token})
+
+    assert response.status_code == 400
+
+
+def test_endpoint_missing_component():
+    token = ComponentPayload("missing").dumps(LAZY_SALT)
+
+    response = Client().get("/__bird__/lazy/", {"c": token})
+
+    assert response.status_code == 404
+
+
+def test_unserializable_props_render_inline(page, caplog):
+    product = {"name": "Tea", "reviews": [object()]}
+
+    with caplog.at_level(logging.WARNING, logger="django_bird"):
+        rendered = render_to_string(page, {"product": product})
+
+    assert "hx-get" not in rendered
+    assert "<ul" in rendered
+    assert "cannot be serialized" in caplog.text
+
+
+def test_lazy_attribute_with_value(templates_dir, page, product):
+    (templates_dir / "attribute.html").write_text(
+        "{% bird reviews product=product lazy=True esi=True / %}"
+    )
+
+    rendered = render_to_string("attribute.html", {"product": product})
+
+    assert "hx-get" not in rendered
+    assert "<ul lazy esi>" in rendered
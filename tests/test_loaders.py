@@ -0,0 +1,595 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from django import template
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.template.base import Parser
+from django.template.context import Context
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test import override_settings
+
+from django_bird import hookimpl
+from django_bird.components import RENDERED_COMPONENTS_KEY
+from django_bird.components import SequenceGenerator
+from django_bird.components import components
+from django_bird.loaders import DataLoader
+from django_bird.loaders import LoaderRegistry
+from django_bird.loaders import arender
+from django_bird.loaders import arender_to_string
+from django_bird.loaders import loaders
+from django_bird.loaders import resolve_sequence
+from django_bird.plugins import pm
+from django_bird.render_cache import render_cache
+
+from .utils import TestComponent
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture(autouse=True)
+def users(calls):
+    @loaders.register("users")
+    def load_users(ids):
+        calls.append(ids)
+        return {id: {"id": id, "name": f"User {id}"} for id in ids if id != 404}
+
+    yield load_users
+    loaders.loaders.pop("users", None)
+
+
+@pytest.fixture
+def user_component(templates_dir):
+    TestComponent(
+        name="user",
+        content="""
+            {% bird:prop user load="users" %}
+            <span>{% if props.user %}{{ props.user.name }}{% else %}Unknown{% endif %}</span>
+        """,
+    ).create(templates_dir)
+
+
+class TestLoaderRegistry:
+    def test_register(self):
+        registry = LoaderRegistry()
+
+        def load(keys):
+            return keys
+
+        assert registry.register("direct", load) is load
+        assert registry.register("decorated")(load) is load
+        assert registry.get("direct") is load
+        assert registry.get("decorated") is load
+
+        registry.reset()
+
+        assert registry.loaders == {}
+
+    def test_unknown(self):
+        with pytest.raises(template.TemplateSyntaxError, match="'missing'"):
+            LoaderRegistry().get("missing")
+
+
+class TestDataLoader:
+    def test_batches_queued_keys(self, users, calls):
+        loader = DataLoader(users)
+
+        first = loader.load_lazy(1)
+        second = loader.load_lazy(2)
+        loader.load_lazy(1)
+
+        assert calls == []
+        assert first["name"] == "User 1"
+        assert second["name"] == "User 2"
+        assert calls == [[1, 2]]
+
+    def test_caches(self, users, calls):
+        loader = DataLoader(users)
+
+        loader.load(1)
+        loader.load(1)
+
+        assert loader.load_lazy(1) == {"id": 1, "name": "User 1"}
+        assert calls == [[1]]
+
+    def test_missing_key(self, users):
+        assert DataLoader(users).load(404) is None
+
+    def test_none_key(self, users, calls):
+        loader = DataLoader(users)
+
+        assert loader.load(None) is None
+        assert loader.load_lazy(None) is None
+        assert calls == []
+
+    def test_sequence_result(self):
+        loader = DataLoader(lambda keys: [key * 10 for key in keys])
+
+        loader.queue([1, 2])
+
+        assert loader.load(2) == 20
+        assert loader.cache == {1: 10, 2: 20}
+
+    def test_dispatch_nothing_pending(self, users, calls):
+        loader = DataLoader(users)
+
+        loader.dispatch()
+        asyncio.run(loader.adispatch())
+
+        assert calls == []
+
+    def test_adispatch_sync_loader(self, users, calls):
+        loader = DataLoader(users)
+        loader.queue([1, 2])
+
+        asyncio.run(loader.adispatch())
+
+        assert loader.load(2) == {"id": 2, "name": "User 2"}
+        assert calls == [[1, 2]]
+
+    def test_sequence_result_wrong_length(self):
+        loader = DataLoader(lambda keys: [])
+
+        with pytest.raises(ValueError, match="returned 0 values for 1 keys"):
+            loader.load(1)
+
+
+class TestLoadedProps:
+    def test_render(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% bird user user=1 / %}{% bird user user=404 / %}{% bird user / %}"
+        )
+
+        rendered = render_to_string("page.html")
+
+        assert "<span>User 1</span>" in rendered
+        assert rendered.count("<span>Unknown</span>") == 2
+        assert calls == [[1], [404]]
+
+    def test_keys_queued_before_use_share_a_batch(
+        self, templates_dir, user_component, calls
+    ):
+        TestComponent(
+            name="pair",
+            content="""
+                {% bird:prop first load="users" %}
+                {% bird:prop second load="users" %}
+                {{ props.first.name }} & {{ props.second.name }}
+            """,
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text("{% bird pair first=1 second=2 / %}")
+
+        rendered = render_to_string("page.html")
+
+        assert "User 1 & User 2" in rendered
+        assert calls == [[1, 2]]
+
+    def test_cached_for_request(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% for id in ids %}{% bird user user=id / %}{% endfor %}"
+        )
+        request = RequestFactory().get("/")
+
+        render_to_string("page.html", {"ids": [1, 2, 1]}, request=request)
+        render_to_string("page.html", {"ids": [2, 3]}, request=request)
+
+        assert calls == [[1, 2], [3]]
+
+    def test_loop_shares_a_batch(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% for row in rows %}<p>{% bird user user=row.id / %}</p>{% endfor %}"
+        )
+
+        rendered = render_to_string(
+            "page.html", {"rows": [{"id": 1}, {"id": 2}, {"id": 404}]}
+        )
+
+        assert "User 1" in rendered
+        assert "User 2" in rendered
+        assert calls == [[1, 2, 404]]
+
+    def test_loop_unpacking(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% for label, id in pairs %}{{ label }}: {% bird user user=id / %}"
+            "{% endfor %}"
+        )
+
+        rendered = render_to_string("page.html", {"pairs": [("a", 1), ("b", 2)]})
+
+        assert "<span>User 2</span>" in rendered
+        assert calls == [[1, 2]]
+
+    def test_nested_loops(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% for group in groups %}{% for id in group %}"
+            "{% bird user user=id / %}"
+            "{% endfor %}{% endfor %}"
+        )
+
+        render_to_string("page.html", {"groups": [[1, 2], [3, 4]]})
+
+        assert calls == [[1, 2], [3, 4]]
+
+    def test_loop_attribute_lookups(self, templates_dir, user_component, calls):
+        class Row:
+            def __init__(self, id):
+                self.id = id
+
+        class Page:
+            rows = [Row(1), Row(2)]
+
+        (templates_dir / "page.html").write_text(
+            "{% for row in page.rows %}{% bird user user=row.id / %}{% endfor %}"
+        )
+
+        render_to_string("page.html", {"page": Page()})
+
+        assert calls == [[1, 2]]
+
+    @pytest.mark.parametrize(
+        "page",
+        [
+            "{% for id in missing %}{% bird user user=id / %}{% endfor %}",
+            "{% for id in ids %}{% bird user / %}{% endfor %}",
+        ],
+    )
+    def test_loop_keys_not_queued(self, templates_dir, user_component, calls, page):
+        (templates_dir / "page.html").write_text(page)
+
+        render_to_string("page.html", {"ids": [1, 2]})
+
+        assert [1, 2] not in calls
+
+    @pytest.mark.parametrize(
+        "loop",
+        [
+            "{% for id in get_ids %}",
+            "{% for id in ids_iter %}",
+            "{% for id in ids|slice:':3' %}",
+        ],
+    )
+    def test_loop_sequence_not_looked_up_again(
+        self, templates_dir, user_component, calls, loop
+    ):
+        (templates_dir / "page.html").write_text(
+            loop + "{% bird user user=id / %}{% endfor %}"
+        )
+        looked_up = []
+
+        def get_ids():
+            looked_up.append(True)
+            return [1, 2]
+
+        render_to_string(
+            "page.html", {"get_ids": get_ids, "ids_iter": iter([1, 2]), "ids": [1, 2]}
+        )
+
+        assert len(looked_up) <= 1
+        assert calls == [[1], [2]]
+
+    def test_loop_unpacking_fails(self, templates_dir, user_component, calls):
+        (templates_dir / "page.html").write_text(
+            "{% for label, id in pairs %}{% bird user user=id / %}{% endfor %}"
+        )
+
+        with pytest.raises(ValueError, match="Need 2 values to unpack"):
+            render_to_string("page.html", {"pairs": [("a", 1), 2]})
+
+        assert calls == [[1]]
+
+    def test_loop_key_lookup_fails(self, templates_dir, user_component, calls):
+        class Row:
+            def __init__(self, id):
+                self.show = id is not None
+                self._id = id
+
+            @property
+            def id(self):
+                if self._id is None:
+                    raise RuntimeError
+                return self._id
+
+        (templates_dir / "page.html").write_text(
+            "{% for row in rows %}{% if row.show %}{% bird user user=row.id / %}"
+            "{% endif %}{% endfor %}"
+        )
+
+        rendered = render_to_string("page.html", {"rows": [Row(1), Row(None), Row(2)]})
+
+        assert "User 2" in rendered
+        assert calls == [[1, 2]]
+
+    def test_unknown_loader(self, templates_dir):
+        TestComponent(
+            name="broken",
+            content="{% bird:prop user load='missing' %}{{ props.user }}",
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text("{% bird broken user=1 / %}")
+
+        with pytest.raises(template.TemplateSyntaxError, match="'missing'"):
+            render_to_string("page.html")
+
+
+class TestResolveSequence:
+    @pytest.fixture
+    def context(self):
+        class Page:
+            rows = [1, 2]
+
+        def get_page():
+            return Page()
+
+        evaluated = QuerySet()
+        evaluated._result_cache = [3, 4]
+        return Context(
+            {
+                "ids": [1, 2],
+                "page": Page(),
+                "get_page": get_page,
+                "evaluated": evaluated,
+                "unevaluated": QuerySet(),
+                "groups": {"a": (5, 6)},
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "sequence,expected",
+        [
+            ("ids", [1, 2]),
+            ("page.rows", [1, 2]),
+            ("groups.a", (5, 6)),
+            ("evaluated", [3, 4]),
+            ("unevaluated", None),
+            ("id", None),
+            ("missing", None),
+            ("get_page.rows", None),
+            ("page.missing", None),
+            ("'literal'", None),
+        ],
+    )
+    def test_resolve_sequence(self, context, sequence, expected):
+        expression = Parser([]).compile_filter(sequence)
+
+        resolved = resolve_sequence(expression, ("id",), context)
+
+        assert (None if resolved is None else list(resolved)) == (
+            None if expected is None else list(expected)
+        )
+
+
+def test_register_loaders_hook():
+    from django.apps import apps
+
+    def load_teams(ids):
+        return ids
+
+    class Plugin:
+        @staticmethod
+        @hookimpl
+        def register_loaders(register_loader):
+            register_loader("teams", load_teams)
+
+    plugin = Plugin()
+    pm.register(plugin)
+    try:
+        apps.get_app_config("django_bird").ready()
+        assert loaders.get("teams") is load_teams
+    finally:
+        pm.unregister(plugin)
+        loaders.loaders.pop("teams", None)
+
+
+class TestAsyncLoaders:
+    @pytest.fixture
+    def in_flight(self):
+        return {"now": 0, "max": 0}
+
+    @pytest.fixture(autouse=True)
+    def async_loaders(self, calls, in_flight):
+        def track(name):
+            async def load(keys):
+                calls.append((name, keys))
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await asyncio.sleep(0.01)
+                in_flight["now"] -= 1
+                return [f"{name} {key}" for key in keys]
+
+            return load
+
+        loaders.register("forecasts", track("forecast"))
+        loaders.register("quotes", track("quote"))
+        yield
+        loaders.loaders.pop("forecasts", None)
+        loaders.loaders.pop("quotes", None)
+
+    @pytest.fixture
+    def page(self, templates_dir):
+        TestComponent(
+            name="forecast",
+            content="""
+                {% bird:prop city load="forecasts" %}
+                <p>{{ props.city }}</p>
+            """,
+        ).create(templates_dir)
+        TestComponent(
+            name="quote",
+            content="""
+                {% bird:prop symbol load="quotes" %}
+                <p>{{ props.symbol }}</p>
+            """,
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text("""
+            {% for city in cities %}{% bird forecast city=city / %}{% endfor %}
+            {% bird quote symbol="ACME" / %}
+        """)
+        return "page.html"
+
+    def test_arender_to_string(self, page, calls, in_flight):
+        rendered = asyncio.run(arender_to_string(page, {"cities": ["Oslo", "Lima"]}))
+
+        assert "<p>forecast Oslo</p>" in rendered
+        assert "<p>forecast Lima</p>" in rendered
+        assert "<p>quote ACME</p>" in rendered
+        assert sorted(calls) == [
+            ("forecast", ["Oslo", "Lima"]),
+            ("quote", ["ACME"]),
+        ]
+        assert in_flight["max"] == 2
+
+    def test_arender(self, page, calls):
+        request = RequestFactory().get("/")
+
+        response = asyncio.run(arender(request, page, {"cities": ["Oslo"]}))
+
+        assert response.status_code == 200
+        assert b"<p>forecast Oslo</p>" in response.content
+        assert len(calls) == 2
+
+    def test_sync_and_async_loaders(self, templates_dir, user_component, calls):
+        TestComponent(
+            name="forecast",
+            content="""
+                {% bird:prop city load="forecasts" %}
+                {% bird:prop user load="users" %}
+                <p>{{ props.user.name }}: {{ props.city }}</p>
+            """,
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text(
+            "{% bird forecast city='Oslo' user=1 / %}"
+        )
+
+        rendered = asyncio.run(arender_to_string("page.html"))
+
+        assert "<p>User 1: forecast Oslo</p>" in rendered
+        assert calls == [[1], ("forecast", ["Oslo"])]
+
+    def test_keys_found_during_final_render(self, templates_dir, calls):
+        TestComponent(
+            name="forecast",
+            content="""
+                {% bird:prop city load="forecasts" %}
+                <p>{{ props.city }}</p>
+                {% if props.city %}{% bird quote symbol=props.city / %}{% endif %}
+            """,
+        ).create(templates_dir)
+        TestComponent(
+            name="quote",
+            content="""
+                {% bird:prop symbol load="quotes" %}
+                <i>{{ props.symbol }}</i>
+            """,
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text("{% bird forecast city='Oslo' / %}")
+
+        rendered = asyncio.run(arender_to_string("page.html"))
+
+        assert "<i>quote forecast Oslo</i>" in rendered
+        assert calls == [("forecast", ["Oslo"]), ("quote", ["forecast Oslo"])]
+
+    def test_sync_render(self, page, calls):
+        rendered = render_to_string(page, {"cities": ["Oslo"]})
+
+        assert "<p>forecast Oslo</p>" in rendered
+        assert calls == [("forecast", ["Oslo"]), ("quote", ["ACME"])]
+
+    @pytest.fixture
+    def card(self, page, templates_dir):
+        TestComponent(
+            name="card",
+            content="""
+                {% bird:pure %}
+                {% bird:prop title %}
+                <div>{% bird forecast city='Oslo' / %}</div>
+            """,
+        ).create(templates_dir)
+
+    @pytest.mark.parametrize(
+        "tag",
+        ["{% bird card / %}", "{% bird card title=title / %}"],
+        ids=["folded", "memo"],
+    )
+    @pytest.mark.usefixtures("card")
+    def test_pure_wrapper(self, templates_dir, calls, tag):
+        (templates_dir / "page.html").write_text(tag + tag)
+        request = RequestFactory().get("/")
+
+        rendered = asyncio.run(arender_to_string("page.html", {"title": "T"}, request))
+
+        assert rendered.count("<p>forecast Oslo</p>") == 2
+        assert calls == [("forecast", ["Oslo"])]
+
+    @pytest.mark.usefixtures("card")
+    def test_render_cache_not_stored(self, templates_dir, override_app_settings):
+        (templates_dir / "page.html").write_text("{% bird card title=title / %}")
+
+        with (
+            override_settings(
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+                    }
+                }
+            ),
+            override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_CACHE="default"),
+        ):
+            try:
+                asyncio.run(arender_to_string("page.html", {"title": "T"}))
+                rendered = render_to_string("page.html", {"title": "T"})
+            finally:
+                cache.clear()
+                render_cache.reset()
+
+        assert "<p>forecast Oslo</p>" in rendered
+
+    def test_collecting_render_not_recorded(self, page, override_app_settings):
+        renders = []
+
+        class Plugin:
+            @staticmethod
+            @hookimpl
+            def before_component_render(component):
+                renders.append(component.name)
+
+        forecast = components.get_component("forecast")
+        sequence = SequenceGenerator()
+        plugin = Plugin()
+        pm.register(plugin)
+        try:
+            with override_app_settings(ENABLE_BIRD_ATTRS=True):
+                first = sequence.next(forecast)
+                rendered = asyncio.run(
+                    arender_to_string(page, {"cities": ["Oslo", "Lima"]})
+                )
+                last = sequence.next(forecast)
+        finally:
+            pm.unregister(plugin)
+
+        assert "<p>forecast Lima</p>" in rendered
+        assert renders == ["forecast", "forecast", "quote"]
+        assert last == first + 3
+
+    def test_collecting_render_components_not_shared(
+        self, templates_dir, override_app_settings
+    ):
+        TestComponent(
+            name="forecast",
+            content="""
+                {% bird:prop city load="forecasts" %}
+                {% if props.city %}<p>{{ props.city }}</p>{% else %}{% bird empty / %}{% endif %}
+            """,
+        ).create(templates_dir)
+        TestComponent(name="empty", content="<i></i>").create(templates_dir)
+        (templates_dir / "page.html").write_text("{% bird forecast city='Oslo' / %}")
+        request = RequestFactory().get("/")
+
+        with override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_TIME_ASSETS=True):
+            asyncio.run(arender_to_string("page.html", request=request))
+
+        assert list(getattr(request, RENDERED_COMPONENTS_KEY)) == ["forecast"]
@@ -9,25 +9,17 @@ import pytest
 from django.core.management import call_command
 from django.test import override_settings
 
-from django_bird.manifest import PathPrefix
+from django_bird.manifest import MANIFEST_RETRY_BACKOFF
+from django_bird.manifest import AssetManifest
+from django_bird.manifest import ManifestFormat
 from django_bird.manifest import default_manifest_path
 from django_bird.manifest import generate_asset_manifest
 from django_bird.manifest import load_asset_manifest
-from django_bird.manifest import normalize_path
+from django_bird.manifest import read_asset_manifest
 from django_bird.manifest import save_asset_manifest
 from tests.utils import TestComponent
 
 
-@pytest.fixture(autouse=True)
-def reset_manifest_cache():
-    # Access and reset the private module-level cache variable
-    import django_bird.manifest
-
-    django_bird.manifest._manifest_cache = None
-    yield
-    django_bird.manifest._manifest_cache = None
-
-
 @pytest.fixture
 def static_root(tmp_path):
     static_dir = tmp_path / "static"
@@ -141,74 +133,282 @@ def test_load_asset_manifest_static_root_permission_error(static_root, monkeypat
     assert loaded_manifest is None
 
 
-def test_normalize_path_site_packages():
-    site_pkg_path = "/usr/local/lib/python3.12/site-packages/django_third_party_pkg/components/templates/bird/button.html"
+def test_load_asset_manifest_python_from_static_root(static_root):
+    test_manifest_data = {
+        "app:templates/template1.html": ["button", "card"],
+        "app:templates/template2.html": ["accordion", "tab"],
+    }
+
+    save_asset_manifest(
+        test_manifest_data, default_manifest_path(ManifestFormat.PYTHON)
+    )
 
-    normalized = normalize_path(site_pkg_path)
+    loaded_manifest = load_asset_manifest()
 
-    assert normalized == PathPrefix.PKG.prepend_to(
-        "django_third_party_pkg/components/templates/bird/button.html"
+    assert loaded_manifest == {
+        template: tuple(components)
+        for template, components in test_manifest_data.items()
+    }
+
+
+def test_load_asset_manifest_prefers_python_format(static_root):
+    save_asset_manifest(
+        {"app:templates/template.html": ["json"]},
+        default_manifest_path(ManifestFormat.JSON),
+    )
+    save_asset_manifest(
+        {"app:templates/template.html": ["python"]},
+        default_manifest_path(ManifestFormat.PYTHON),
     )
 
+    loaded_manifest = load_asset_manifest()
+
+    assert loaded_manifest == {"app:templates/template.html": ("python",)}
+
 
-def test_normalize_path_project_base_dir():
-    base_dir = "/home/user/project"
-    project_path = f"{base_dir}/app/templates/invoices/pending_invoice_list.html"
+@pytest.mark.parametrize(
+    "content",
+    [
+        "MANIFEST = {",
+        "NOT_THE_MANIFEST = {}",
+        "MANIFEST = []",
+        "MANIFEST = dict(page=('button',))",
+        "MANIFEST = {'app:templates/page.html': 'button'}",
+        "MANIFEST = {'app:templates/page.html': (1,)}",
+    ],
+)
+def test_read_asset_manifest_invalid_python(content, tmp_path):
+    manifest_path = tmp_path / "manifest.py"
+    manifest_path.write_text(content)
 
-    with override_settings(BASE_DIR=base_dir):
-        normalized = normalize_path(project_path)
+    assert read_asset_manifest(manifest_path) is None
 
-    assert normalized == PathPrefix.APP.prepend_to(
-        "app/templates/invoices/pending_invoice_list.html"
+
+def test_python_manifest_shares_component_names(tmp_path):
+    manifest_path = tmp_path / "manifest.py"
+
+    save_asset_manifest(
+        {
+            "app:templates/template1.html": ["modal.trigger", "button"],
+            "app:templates/template2.html": ["modal.trigger"],
+        },
+        manifest_path,
+    )
+
+    loaded_manifest = read_asset_manifest(manifest_path)
+
+    assert loaded_manifest is not None
+    assert (
+        loaded_manifest["app:templates/template1.html"][0]
+        is loaded_manifest["app:templates/template2.html"][0]
+    )
+
+
+def test_python_manifest_not_executed(tmp_path):
+    manifest_path = tmp_path / "manifest.py"
+    marker = tmp_path / "executed"
+    manifest_path.write_text(
+        f"open({str(marker)!r}, 'w').close()\n"
+        "MANIFEST = {'app:templates/page.html': ('button',)}\n"
     )
 
+    loaded_manifest = read_asset_manifest(manifest_path)
+
+    assert loaded_manifest == {"app:templates/page.html": ("button",)}
+    assert not marker.exists()
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("manifest.json", ManifestFormat.JSON),
+        ("manifest.py", ManifestFormat.PYTHON),
+        ("manifest", ManifestFormat.JSON),
+    ],
+)
+def test_manifest_format_from_path(path, expected):
+    assert ManifestFormat.from_path(path) == expected
+
+
+class TestAssetManifest:
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        import django_bird.manifest
+
+        class FakeTime:
+            now = 1000.0
 
-def test_normalize_path_base_dir_prefix_but_not_relative():
-    """Path string starts with BASE_DIR but is not actually a child of it.
+            @classmethod
+            def monotonic(cls):
+                return cls.now
 
-    e.g. BASE_DIR=/home/user/project and path=/home/user/project-extra/file.html
-    """
-    base_dir = "/home/user/project"
-    other_path = "/home/user/project-extra/templates/file.html"
+            @classmethod
+            def advance(cls, seconds):
+                cls.now += seconds
 
-    with override_settings(BASE_DIR=base_dir):
-        normalized = normalize_path(other_path)
+        monkeypatch.setattr(django_bird.manifest, "time", FakeTime)
+        return FakeTime
 
-    # Should fall through to the EXT prefix since it's not truly under BASE_DIR
-    assert normalized.startswith(PathPrefix.EXT.value)
-    assert "file.html" in normalized
+    @pytest.fixture
+    def manifest_path(self, static_root):
+        return default_manifest_path()
 
+    def test_get(self, manifest_path, clock):
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
 
-def test_normalize_path_other_absolute_dir():
-    other_path = "/some/random/external/path.html"
+        assert AssetManifest().get() == {"app:templates/page.html": ["button"]}
 
-    normalized = normalize_path(other_path)
+    def test_missing_manifest_is_cached(self, manifest_path, clock):
+        holder = AssetManifest()
 
-    assert normalized.startswith(PathPrefix.EXT.value)
-    assert "path.html" in normalized
+        assert holder.get() is None
 
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
 
-def test_normalize_path_relative_dir():
-    rel_path = "relative/path.html"
+        assert holder.get() is None
 
-    normalized = normalize_path(rel_path)
+        clock.advance(MANIFEST_RETRY_BACKOFF)
+
+        assert holder.get() == {"app:templates/page.html": ["button"]}
+
+    def test_missing_manifest_backoff_increases(self, manifest_path, clock):
+        holder = AssetManifest()
+
+        assert holder.get() is None
+        clock.advance(MANIFEST_RETRY_BACKOFF)
+        assert holder.get() is None
+
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+        clock.advance(MANIFEST_RETRY_BACKOFF)
+
+        assert holder.get() is None
+
+        clock.advance(MANIFEST_RETRY_BACKOFF)
+
+        assert holder.get() == {"app:templates/page.html": ["button"]}
+
+    def test_not_rechecked_without_reload_interval(self, manifest_path, clock):
+        holder = AssetManifest()
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+        holder.get()
+
+        save_asset_manifest(
+            {"app:templates/page.html": ["alert", "card"]}, manifest_path
+        )
+        clock.advance(3600)
+
+        assert holder.get() == {"app:templates/page.html": ["button"]}
+
+    def test_reload_interval(self, manifest_path, clock, override_app_settings):
+        holder = AssetManifest()
+
+        with override_app_settings(ASSET_MANIFEST_RELOAD_INTERVAL=5):
+            save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+            holder.get()
+
+            save_asset_manifest(
+                {"app:templates/page.html": ["alert", "card"]}, manifest_path
+            )
+
+            assert holder.get() == {"app:templates/page.html": ["button"]}
+
+            clock.advance(5)
+
+            assert holder.get() == {"app:templates/page.html": ["alert", "card"]}
+
+    def test_invalid_update_keeps_previous_manifest(
+        self, manifest_path, clock, override_app_settings
+    ):
+        holder = AssetManifest()
+
+        with override_app_settings(ASSET_MANIFEST_RELOAD_INTERVAL=5):
+            save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+            holder.get()
+
+            manifest_path.write_text("{ this is not valid JSON }")
+            clock.advance(5)
+
+            assert holder.get() == {"app:templates/page.html": ["button"]}
+
+    def test_unchanged_manifest_not_reread(
+        self, manifest_path, clock, override_app_settings
+    ):
+        holder = AssetManifest()
+
+        with override_app_settings(ASSET_MANIFEST_RELOAD_INTERVAL=5):
+            save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+            manifest = holder.get()
+            clock.advance(5)
+
+            assert holder.get() is manifest
+
+    @override_settings(STATIC_ROOT=None)
+    def test_no_static_root(self, clock):
+        assert AssetManifest().get() is None
+
+    def test_invalid_manifest_backoff(
+        self, manifest_path, clock, override_app_settings
+    ):
+        holder = AssetManifest()
 
-    assert normalized == rel_path
+        with override_app_settings(ASSET_MANIFEST_RELOAD_INTERVAL=5):
+            save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+            holder.get()
+            manifest_path.write_text("{ this is not valid JSON }")
+            clock.advance(5)
+            holder.get()
 
+            clock.advance(MANIFEST_RETRY_BACKOFF)
 
-def test_normalize_path_already_normalized():
-    """Test that already normalized paths are not double-normalized."""
-    # Test app prefix
-    app_path = PathPrefix.APP.prepend_to("some/template/path.html")
-    assert normalize_path(app_path) == app_path
+            assert holder.get() == {"app:templates/page.html": ["button"]}
 
-    # Test pkg prefix
-    pkg_path = PathPrefix.PKG.prepend_to("django_package/templates/component.html")
-    assert normalize_path(pkg_path) == pkg_path
+            save_asset_manifest(
+                {"app:templates/page.html": ["alert", "card"]}, manifest_path
+            )
 
-    # Test ext prefix
-    ext_path = PathPrefix.EXT.prepend_to("abcd1234/external.html")
-    assert normalize_path(ext_path) == ext_path
+            assert holder.get() == {"app:templates/page.html": ["button"]}
+
+            clock.advance(2 * MANIFEST_RETRY_BACKOFF)
+
+            assert holder.get() == {"app:templates/page.html": ["alert", "card"]}
+
+    def test_refresh_in_progress(self, manifest_path, clock, override_app_settings):
+        holder = AssetManifest()
+
+        with override_app_settings(ASSET_MANIFEST_RELOAD_INTERVAL=5):
+            save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+            holder.get()
+            save_asset_manifest(
+                {"app:templates/page.html": ["alert", "card"]}, manifest_path
+            )
+            clock.advance(5)
+
+            # Another reader is refreshing, so the current manifest is served
+            with holder._lock:
+                assert holder.get() == {"app:templates/page.html": ["button"]}
+
+            assert holder.get() == {"app:templates/page.html": ["alert", "card"]}
+
+    def test_reload(self, manifest_path, clock):
+        holder = AssetManifest()
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+        holder.get()
+
+        save_asset_manifest(
+            {"app:templates/page.html": ["alert", "card"]}, manifest_path
+        )
+
+        assert holder.reload() == {"app:templates/page.html": ["alert", "card"]}
+        assert holder.get() == {"app:templates/page.html": ["alert", "card"]}
+
+    def test_reset(self, manifest_path, clock):
+        holder = AssetManifest()
+        holder.get()
+        save_asset_manifest({"app:templates/page.html": ["button"]}, manifest_path)
+
+        holder.reset()
+
+        assert holder.get() == {"app:templates/page.html": ["button"]}
 
 
 def test_generate_asset_manifest(templates_dir, registry):
@@ -254,8 +454,8 @@ def test_generate_asset_manifest(templates_dir, registry):
     manifest = generate_asset_manifest()
 
     for key in manifest.keys():
-        # Keys should not be absolute paths starting with /
-        assert not key.startswith("/"), f"Found absolute path in manifest: {key}"
+        # Keys should not contain absolute paths
+        assert str(templates_dir) not in key, f"Found absolute path in manifest: {key}"
 
     template1_components = []
     template2_components = []
@@ -270,11 +470,41 @@ def test_generate_asset_manifest(templates_dir, registry):
     assert sorted(template2_components) == sorted(["accordion", "tab"])
 
 
+def test_generate_asset_manifest_nested_components(templates_dir, registry):
+    TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(
+        name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+    ).create(templates_dir)
+    TestComponent(
+        name="card", content="<div>{% bird button %}More{% endbird %}</div>"
+    ).create(templates_dir)
+
+    template = templates_dir / "test_manifest_nested.html"
+    template.write_text("""
+    <html>
+    <body>
+        {% bird card / %}
+    </body>
+    </html>
+    """)
+
+    manifest = generate_asset_manifest()
+
+    assert manifest[
+        "django.template.loaders.filesystem.Loader:test_manifest_nested.html"
+    ] == ["button", "card", "icon"]
+
+
 def test_save_and_load_asset_manifest(tmp_path):
-    # Pre-normalized paths
     test_manifest_data = {
-        PathPrefix.APP.prepend_to("path/to/template1.html"): ["button", "card"],
-        PathPrefix.PKG.prepend_to("some_package/template2.html"): ["accordion", "tab"],
+        "django.template.loaders.filesystem.Loader:path/to/template1.html": [
+            "button",
+            "card",
+        ],
+        "django.template.loaders.app_directories.Loader:template2.html": [
+            "accordion",
+            "tab",
+        ],
     }
 
     output_path = tmp_path / "test-manifest.json"
@@ -286,43 +516,25 @@ def test_save_and_load_asset_manifest(tmp_path):
     with open(output_path) as f:
         loaded_data = json.load(f)
 
-    # The paths should be saved as-is without additional normalization
+    # The keys should be saved as-is
     assert loaded_data == test_manifest_data
 
-    # Now test with absolute paths that need normalization
-    absolute_paths_data = {
-        "/absolute/path/to/template1.html": ["button", "card"],
-        "/another/path/to/template2.html": ["accordion", "tab"],
-    }
-
-    # For compatibility with existing tests, when tested with pre-fix code,
-    # we should expect the paths to be normalized by save_asset_manifest
-    output_path2 = tmp_path / "test-manifest2.json"
-
-    save_asset_manifest(absolute_paths_data, output_path2)
-
-    assert output_path2.exists()
-
-    with open(output_path2) as f:
-        loaded_data2 = json.load(f)
-
-    # With our updated code, no normalization should be done in save_asset_manifest
-    # With old code, paths would be normalized
-    # So test for either the paths as-is, or the normalized paths
-    assert loaded_data2 == absolute_paths_data or all(
-        PathPrefix.has_prefix(key) for key in loaded_data2.keys()
-    )
-
 
 def test_default_manifest_path():
     with override_settings(STATIC_ROOT="/path/to/static"):
         path = default_manifest_path()
         assert path == Path("/path/to/static/django_bird/manifest.json")
 
+        path = default_manifest_path(ManifestFormat.PYTHON)
+        assert path == Path("/path/to/static/django_bird/manifest.py")
+
     with override_settings(STATIC_ROOT=None):
         path = default_manifest_path()
         assert path == Path("django_bird-asset-manifest.json")
 
+        path = default_manifest_path(ManifestFormat.PYTHON)
+        assert path == Path("django_bird-asset-manifest.py")
+
 
 class TestManagementCommand:
     """Tests for the generate_asset_manifest management command."""
@@ -402,3 +614,33 @@ class TestManagementCommand:
 
         assert len(template_keys) == 1
         assert "test_cmd2" in manifest_data[template_keys[0]]
+
+    def test_generate_asset_manifest_command_python_format(
+        self, static_root, templates_dir
+    ):
+        TestComponent(name="test_cmd3", content="<div>{{ slot }}</div>").create(
+            templates_dir
+        )
+
+        template_path = templates_dir / "manifest_cmd_python.html"
+        template_path.write_text("""
+        <html>
+        <body>
+            {% bird test_cmd3 %}Test Command 3{% endbird %}
+        </body>
+        </html>
+        """)
+
+        call_command("generate_asset_manifest", format="python", stdout=StringIO())
+
+        manifest_path = static_root / "django_bird" / "manifest.py"
+        assert manifest_path.exists()
+
+        manifest_data = read_asset_manifest(manifest_path)
+
+        assert manifest_data is not None
+        template_keys = [
+            k for k in manifest_data.keys() if "manifest_cmd_python.html" in k
+        ]
+        assert len(template_keys) == 1
+        assert "test_cmd3" in manifest_data[template_keys[0]]
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.template.response import TemplateResponse
+from django.test import RequestFactory
+from django.test import override_settings
+
+from django_bird.middleware import AssetPreloadMiddleware
+from django_bird.middleware import ComponentProfileMiddleware
+from django_bird.middleware import DeferredAssetsMiddleware
+from django_bird.middleware import ServerTimingMiddleware
+from django_bird.staticfiles import CSS
+from django_bird.staticfiles import JS
+from django_bird.templatetags.tags.asset import AssetTag
+
+from .utils import TestAsset
+from .utils import TestComponent
+
+
+@pytest.fixture
+def render_time_assets(override_app_settings):
+    with override_app_settings(RENDER_TIME_ASSETS=True):
+        yield
+
+
+@pytest.fixture
+def components(templates_dir):
+    button = TestComponent(name="button", content="<button>{{ slot }}</button>").create(
+        templates_dir
+    )
+    TestAsset(component=button, content=".button {}", asset_type=CSS).create()
+    TestAsset(
+        component=button, content="console.log('button');", asset_type=JS
+    ).create()
+
+    alert = TestComponent(name="alert", content="<div>{{ slot }}</div>").create(
+        templates_dir
+    )
+    TestAsset(component=alert, content=".alert {}", asset_type=CSS).create()
+
+    icon = TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestAsset(component=icon, content=".icon {}", asset_type=CSS).create()
+
+    TestComponent(
+        name="toolbar", content="<div>{% bird icon / %}{{ slot }}</div>"
+    ).create(templates_dir)
+
+
+@pytest.fixture
+def page(templates_dir, components):
+    page = templates_dir / "page.html"
+    page.write_text("""
+    <html>
+    <head>{% bird:css %}</head>
+    <body>
+        {% bird alert %}Alert{% endbird %}
+        {% if show_button %}{% bird button %}Click{% endbird %}{% endif %}
+        {% bird:js %}
+    </body>
+    </html>
+    """)
+    return page
+
+
+@pytest.fixture
+def dynamic_page(templates_dir, components):
+    page = templates_dir / "dynamic_page.html"
+    page.write_text("""
+    <html>
+    <head>{% bird:css %}</head>
+    <body>{% bird dynamic / %}</body>
+    </html>
+    """)
+    return page
+
+
+def get_response(context=None, template_name="page.html"):
+    def view(request):
+        return render(request, template_name, context or {})
+
+    request = RequestFactory().get("/")
+    return DeferredAssetsMiddleware(view)(request).content.decode()
+
+
+@pytest.mark.usefixtures("render_time_assets", "page")
+class TestDeferredAssetsMiddleware:
+    def test_only_rendered_components(self):
+        content = get_response({"show_button": False})
+
+        assert "bird/alert.css" in content
+        assert "bird/button.css" not in content
+        assert "bird/button.js" not in content
+
+    def test_conditionally_rendered_component(self):
+        content = get_response({"show_button": True})
+
+        assert "bird/alert.css" in content
+        assert "bird/button.css" in content
+        assert "bird/button.js" in content
+
+    @pytest.mark.usefixtures("dynamic_page")
+    def test_dynamic_component_name(self):
+        content = get_response({"dynamic": "button"}, "dynamic_page.html")
+
+        assert "bird/button.css" in content
+        assert "bird/alert.css" not in content
+
+    @pytest.mark.usefixtures("dynamic_page")
+    def test_nested_components(self):
+        content = get_response({"dynamic": "toolbar"}, "dynamic_page.html")
+
+        assert "bird/icon.css" in content
+
+    def test_placeholders_replaced(self):
+        content = get_response()
+
+        for tag in AssetTag:
+            assert tag.placeholder not in content
+
+    def test_content_length_updated(self):
+        def view(request):
+            response = render(request, "page.html", {})
+            response.headers["Content-Length"] = str(len(response.content))
+            return response
+
+        request = RequestFactory().get("/")
+        response = DeferredAssetsMiddleware(view)(request)
+
+        assert response.headers["Content-Length"] == str(len(response.content))
+
+    def test_request_without_rendering(self):
+        def view(request):
+            return HttpResponse(AssetTag.CSS.placeholder)
+
+        request = RequestFactory().get("/")
+        response = DeferredAssetsMiddleware(view)(request)
+
+        assert response.content.decode() == AssetTag.CSS.placeholder
+
+    def test_streaming_response(self):
+        def view(request):
+            render(request, "page.html", {})
+            return StreamingHttpResponse([AssetTag.CSS.placeholder])
+
+        request = RequestFactory().get("/")
+        response = DeferredAssetsMiddleware(view)(request)
+
+        assert b"".join(response.streaming_content).decode() == (
+            AssetTag.CSS.placeholder
+        )
+
+    def test_json_response(self):
+        def view(request):
+            return JsonResponse({"html": render_to_string("page.html", {}, request)})
+
+        request = RequestFactory().get("/")
+        response = DeferredAssetsMiddleware(view)(request)
+
+        assert json.loads(response.content)["html"].count(AssetTag.CSS.placeholder) == 1
+
+    def test_template_without_request(self):
+        content = render_to_string("page.html", {})
+
+        assert AssetTag.CSS.placeholder not in content
+        assert "bird/alert.css" in content
+
+
+def test_setting_disabled(page):
+    content = get_response({"show_button": False})
+
+    assert AssetTag.CSS.placeholder not in content
+    assert "bird/button.css" in content
+
+
+class TestAssetPreloadMiddleware:
+    @pytest.fixture
+    def page(self, templates_dir, components):
+        page = templates_dir / "preload.html"
+        page.write_text("""
+        <html>
+        <head>{% bird:css %}</head>
+        <body>{% bird button %}Click{% endbird %}{% bird:js %}</body>
+        </html>
+        """)
+        return page
+
+    def get_response(self, middleware, template_name="preload.html"):
+        request = RequestFactory().get("/")
+        response = TemplateResponse(request, template_name, {})
+        response = middleware.process_template_response(request, response)
+        return response.render()
+
+    def test_link_header(self, page):
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+
+        response = self.get_response(middleware)
+
+        assert response.headers["Link"] == (
+            "</static/django_bird/bird/button.css>; rel=preload; as=style, "
+            "</static/django_bird/bird/button.js>; rel=preload; as=script"
+        )
+
+    def test_link_header_appended(self, page):
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+
+        def view(request):
+            response = TemplateResponse(request, "preload.html", {})
+            response.headers["Link"] = "</app.css>; rel=preload; as=style"
+            return response
+
+        request = RequestFactory().get("/")
+        response = middleware.process_template_response(request, view(request))
+
+        assert response.headers["Link"].startswith(
+            "</app.css>; rel=preload; as=style, </static/django_bird/bird/button.css>"
+        )
+
+    def test_no_components(self, templates_dir):
+        (templates_dir / "plain.html").write_text("<html></html>")
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+
+        response = self.get_response(middleware, "plain.html")
+
+        assert "Link" not in response.headers
+
+    def test_links_cached(self, page, monkeypatch):
+        import django_bird.middleware
+
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+        self.get_response(middleware)
+
+        calls = []
+        monkeypatch.setattr(
+            django_bird.middleware,
+            "get_template_components",
+            lambda template: calls.append(template) or [],
+        )
+
+        response = self.get_response(middleware)
+
+        assert calls == []
+        assert "button.css" in response.headers["Link"]
+
+    def test_links_not_cached_in_debug(self, page, monkeypatch):
+        import django_bird.middleware
+
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+
+        with override_settings(DEBUG=True):
+            self.get_response(middleware)
+
+            monkeypatch.setattr(
+                django_bird.middleware,
+                "get_template_components",
+                lambda template: [],
+            )
+
+            response = self.get_response(middleware)
+
+        assert "Link" not in response.headers
+
+    def test_cache_cleared_on_manifest_change(self, page, monkeypatch):
+        import django_bird.middleware
+
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+        self.get_response(middleware)
+
+        monkeypatch.setattr(
+            django_bird.middleware, "load_asset_manifest", lambda: {"other": []}
+        )
+
+        response = self.get_response(middleware)
+
+        assert "button.css" in response.headers["Link"]
+        assert middleware._manifest == {"other": []}
+
+    def test_non_django_template(self, page):
+        middleware = AssetPreloadMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/")
+        response = TemplateResponse(request, "preload.html", {})
+        response.resolve_template = lambda template: None
+
+        response = middleware.process_template_response(request, response)
+
+        assert "Link" not in response.headers
+
+
+class TestServerTimingMiddleware:
+    @pytest.fixture(autouse=True)
+    def unregister_timing(self):
+        from django_bird import timing
+        from django_bird.plugins import pm
+
+        yield
+        if pm.is_registered(timing):
+            pm.unregister(timing)
+
+    @pytest.fixture
+    def page(self, templates_dir, components):
+        page = templates_dir / "timing.html"
+        page.write_text("""
+        {% for i in items %}{% bird toolbar %}{% bird button %}Go{% endbird %}{% endbird %}{% endfor %}
+        """)
+        return page
+
+    def view(self, request):
+        return render(request, "timing.html", {"items": range(3)})
+
+    def test_server_timing_header(self, page):
+        middleware = ServerTimingMiddleware(self.view)
+
+        response = middleware(RequestFactory().get("/"))
+
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in response.headers["Server-Timing"].split(", ")
+        }
+        assert set(metrics) == {"bird.toolbar", "bird.button", "bird.icon"}
+        assert 'desc="3x' in metrics["bird.toolbar"]
+        assert 'desc="3x' in metrics["bird.button"]
+
+    def test_server_timing_header_appended(self, page):
+        def view(request):
+            response = self.view(request)
+            response.headers["Server-Timing"] = "db;dur=1.00"
+            return response
+
+        middleware = ServerTimingMiddleware(view)
+
+        response = middleware(RequestFactory().get("/"))
+
+        assert response.headers["Server-Timing"].startswith("db;dur=1.00, bird.")
+
+    def test_max_entries(self, page, override_app_settings):
+        middleware = ServerTimingMiddleware(self.view)
+
+        with override_app_settings(SERVER_TIMING_MAX_ENTRIES=1):
+            response = middleware(RequestFactory().get("/"))
+
+        assert len(response.headers["Server-Timing"].split(", ")) == 1
+
+    def test_not_sampled(self, page, override_app_settings):
+        middleware = ServerTimingMiddleware(self.view)
+
+        with override_app_settings(SERVER_TIMING_SAMPLE_RATE=0):
+            response = middleware(RequestFactory().get("/"))
+
+        assert "Server-Timing" not in response.headers
+
+    @pytest.mark.parametrize("sample_rate,expected", [(0, False), (1, True)])
+    def test_render_hooks_only_active_when_sampled(
+        self, override_app_settings, sample_rate, expected
+    ):
+        from django_bird.plugins import pm
+
+        active = []
+
+        def view(request):
+            active.append(pm.component_render_hooks_active)
+            return HttpResponse()
+
+        middleware = ServerTimingMiddleware(view)
+
+        with override_app_settings(SERVER_TIMING_SAMPLE_RATE=sample_rate):
+            middleware(RequestFactory().get("/"))
+
+        assert active == [expected]
+        assert pm.component_render_hooks_active is False
+
+    def test_no_components(self):
+        middleware = ServerTimingMiddleware(lambda request: HttpResponse())
+
+        response = middleware(RequestFactory().get("/"))
+
+        assert "Server-Timing" not in response.headers
+
+    def test_renders_outside_request_not_recorded(self, page):
+        ServerTimingMiddleware(self.view)
+
+        content = render_to_string("timing.html", {"items": range(1)})
+
+        assert "<button>Go</button>" in content
+
+    def test_async(self, page, override_app_settings):
+        async def view(request):
+            return self.view(request)
+
+        middleware = ServerTimingMiddleware(view)
+
+        response = asyncio.run(middleware(RequestFactory().get("/")))
+
+        assert "bird.button" in response.headers["Server-Timing"]
+
+    def test_async_not_sampled(self, page, override_app_settings):
+        async def view(request):
+            return self.view(request)
+
+        middleware = ServerTimingMiddleware(view)
+
+        with override_app_settings(SERVER_TIMING_SAMPLE_RATE=0):
+            response = asyncio.run(middleware(RequestFactory().get("/")))
+
+        assert "Server-Timing" not in response.headers
+
+
+class TestComponentProfileMiddleware:
+    @pytest.fixture
+    def profile_dir(self, tmp_path, override_app_settings):
+        profile_dir = tmp_path / "profiles"
+        with override_app_settings(PROFILE_DIR=profile_dir):
+            yield profile_dir
+
+    @pytest.fixture
+    def page(self, templates_dir, components):
+        page = templates_dir / "profile.html"
+        page.write_text("{% bird toolbar %}Go{% endbird %}")
+        return page
+
+    def view(self, request):
+        return render(request, "profile.html")
+
+    def test_not_used_without_profile_dir(self):
+        with pytest.raises(MiddlewareNotUsed):
+            ComponentProfileMiddleware(self.view)
+
+    def test_writes_profile(self, profile_dir, page):
+        middleware = ComponentProfileMiddleware(self.view)
+
+        middleware(RequestFactory().get("/orders/list/"))
+
+        (profile,) = profile_dir.iterdir()
+        assert profile.name.endswith(".folded")
+        assert "-GET-orders-list-" in profile.name
+        assert "profile.html;{% bird toolbar %};toolbar;{% bird icon %};icon" in (
+            profile.read_text()
+        )
+
+    def test_no_components(self, profile_dir):
+        middleware = ComponentProfileMiddleware(lambda request: HttpResponse())
+
+        middleware(RequestFactory().get("/"))
+
+        assert not profile_dir.exists()
+
+    def test_async(self, profile_dir, page):
+        async def view(request):
+            return self.view(request)
+
+        middleware = ComponentProfileMiddleware(view)
+
+        asyncio.run(middleware(RequestFactory().get("/")))
+
+        (profile,) = profile_dir.iterdir()
+        assert "-GET-index-" in profile.name
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.template import Context
+from django.template import Template
+
+from django_bird.nested import NestedRender
+from django_bird.nested import record_nested_renders
+
+from .utils import TestComponent
+
+
+def test_record_nested_renders(templates_dir):
+    TestComponent(
+        name="outer", content="<div>{% bird inner / %}{% bird inner lazy / %}</div>"
+    ).create(templates_dir)
+    TestComponent(name="inner", content="<span></span>").create(templates_dir)
+    context = Context({})
+
+    with record_nested_renders(context) as outer:
+        with record_nested_renders(context) as inner:
+            Template("{% bird inner / %}").render(context)
+        Template("{% bird outer / %}").render(context)
+
+    assert inner == [NestedRender("inner")]
+    assert outer == [
+        NestedRender("inner"),
+        NestedRender("outer"),
+        NestedRender("inner"),
+        NestedRender("inner", rendered=False),
+    ]
+
+
+def test_reused_render_recorded(templates_dir):
+    TestComponent(
+        name="outer", content="{% bird:pure %}<div>{% bird inner / %}</div>"
+    ).create(templates_dir)
+    TestComponent(name="inner", content="<span></span>").create(templates_dir)
+    context = Context({})
+
+    with record_nested_renders(context) as recording:
+        Template("{% bird outer / %}{% bird outer / %}").render(context)
+
+    assert recording == [
+        NestedRender("outer"),
+        NestedRender("inner"),
+        NestedRender("outer"),
+        NestedRender("inner"),
+    ]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from django_bird import hookimpl
+from django_bird.plugins import pm
+
+
+class BeforeRenderPlugin:
+    @hookimpl
+    def before_component_render(self, component, props, context):
+        pass
+
+
+class AfterRenderPlugin:
+    @hookimpl
+    def after_component_render(self, component, props, context, elapsed):
+        pass
+
+
+class UnrelatedPlugin:
+    @hookimpl
+    def ready(self):
+        return lambda: None
+
+
+def test_component_render_hooks_flag_default():
+    assert pm.has_component_render_hooks is False
+
+
+def test_component_render_hooks_flag_before():
+    pm.register(BeforeRenderPlugin(), name="BeforeRenderPlugin")
+
+    try:
+        assert pm.has_component_render_hooks is True
+    finally:
+        pm.unregister(name="BeforeRenderPlugin")
+
+    assert pm.has_component_render_hooks is False
+
+
+def test_component_render_hooks_flag_after():
+    plugin = AfterRenderPlugin()
+    pm.register(plugin)
+
+    try:
+        assert pm.has_component_render_hooks is True
+    finally:
+        pm.unregister(plugin)
+
+    assert pm.has_component_render_hooks is False
+
+
+def test_component_render_hooks_flag_unrelated_plugin():
+    pm.register(UnrelatedPlugin(), name="UnrelatedPlugin")
+
+    try:
+        assert pm.has_component_render_hooks is False
+    finally:
+        pm.unregister(name="UnrelatedPlugin")
+
+
+class RecorderPlugin:
+    @hookimpl
+    def before_component_render(self, component, props, context):
+        pass
+
+
+def test_render_recorder_only_active_while_recording():
+    plugin = RecorderPlugin()
+    pm.register_recorder(plugin, "RecorderPlugin")
+
+    try:
+        assert pm.has_component_render_hooks is False
+        assert pm.component_render_hooks_active is False
+        with pm.record_component_renders():
+            assert pm.component_render_hooks_active is True
+        assert pm.component_render_hooks_active is False
+    finally:
+        pm.unregister(plugin)
+
+
+def test_render_recorder_with_render_hook_plugin():
+    recorder = RecorderPlugin()
+    pm.register_recorder(recorder, "RecorderPlugin")
+    pm.register(BeforeRenderPlugin(), name="BeforeRenderPlugin")
+
+    try:
+        assert pm.component_render_hooks_active is True
+    finally:
+        pm.unregister(name="BeforeRenderPlugin")
+        pm.unregister(recorder)
+
+    assert pm.component_render_hooks_active is False
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.template import Context
+from django.template import Template
+from django.test import override_settings
+
+from django_bird.components import Component
+from django_bird.components import get_rendered_components
+from django_bird.prerender import get_prerendered_output
+from django_bird.prerender import is_static_component
+from django_bird.prerender import prerender_components
+from django_bird.prerender import save_prerendered_components
+from django_bird.templatetags.tags.bird import BirdNode
+from django_bird.templatetags.tags.bird import PrerenderedNode
+
+from .utils import TestComponent
+
+
+@pytest.fixture
+def static_root(tmp_path):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+
+    with override_settings(STATIC_ROOT=str(static_dir)):
+        yield static_dir
+
+    shutil.rmtree(static_dir)
+
+
+@pytest.fixture
+def footer(templates_dir):
+    TestComponent(
+        name="icon", content="{% bird:pure %}<svg><use href='#logo'/></svg>"
+    ).create(templates_dir)
+    return TestComponent(
+        name="footer",
+        content="""
+            {% load static %}
+            {% bird:prop year=2024 %}
+            {% comment %}{{ not_rendered }}{% endcomment %}
+            <footer>{% bird icon / %} All rights reserved</footer>
+        """,
+    ).create(templates_dir)
+
+
+@pytest.fixture
+def page(templates_dir, footer):
+    TestComponent(name="button", content="<button>{{ slot }}</button>").create(
+        templates_dir
+    )
+    (templates_dir / "page.html").write_text(
+        "{% bird footer / %}{% bird button %}Click{% endbird %}"
+    )
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ("<footer>Legal</footer>", True),
+        ("{% bird:prop title %}<footer>Legal</footer>", True),
+        ("<footer>{{ slot }}</footer>", False),
+        ("<footer>{% if x %}Legal{% endif %}</footer>", False),
+        ("<footer>{% bird icon / %}</footer>", True),
+        ("<footer>{% bird icon class='x' / %}</footer>", False),
+        ("<footer>{% bird icon %}Logo{% endbird %}</footer>", False),
+        ("<footer>{% bird footer / %}</footer>", False),
+        ("<footer>{% bird missing / %}</footer>", False),
+    ],
+)
+def test_is_static_component(templates_dir, footer, content, expected):
+    component = TestComponent(name="footer", content=content).create(templates_dir)
+
+    assert is_static_component(Component.from_name(component.name)) is expected
+
+
+def test_prerender_components(page, registry):
+    prerendered = prerender_components()
+
+    assert set(prerendered) == {"footer", "icon"}
+    assert prerendered["footer"]["id"] == registry.get_tree_id(
+        Component.from_name("footer")
+    )
+    assert (
+        "<footer><svg><use href='#logo'/></svg> All rights reserved</footer>"
+        in (prerendered["footer"]["html"])
+    )
+
+
+def test_prerender_components_missing(templates_dir, footer):
+    (templates_dir / "page.html").write_text("{% bird footer / %}{% bird missing / %}")
+
+    prerendered = prerender_components()
+
+    assert set(prerendered) == {"footer", "icon"}
+
+
+def test_command(page, static_root):
+    stdout = StringIO()
+
+    call_command("prerender_components", stdout=stdout)
+
+    assert "Prerendered 2 components" in stdout.getvalue()
+    data = json.loads((static_root / "django_bird" / "prerendered.json").read_text())
+    assert set(data) == {"footer", "icon"}
+
+
+class TestParseTimePrerendering:
+    @pytest.fixture
+    def prerendered(self, page, static_root):
+        save_prerendered_components(
+            prerender_components(), static_root / "django_bird" / "prerendered.json"
+        )
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_tag_replaced(self):
+        template = Template("{% bird footer / %}{% bird button %}Click{% endbird %}")
+
+        footer_node, button_node = template.nodelist
+        assert isinstance(footer_node, PrerenderedNode)
+        assert isinstance(button_node, BirdNode)
+        assert "All rights reserved" in template.render(Context())
+
+    @pytest.mark.usefixtures("prerendered")
+    @pytest.mark.parametrize(
+        "tag",
+        [
+            "{% bird footer class='dark' / %}",
+            "{% bird footer %}Extra{% endbird %}",
+            "{% bird footer lazy / %}",
+        ],
+    )
+    def test_tag_not_replaced(self, tag):
+        (node,) = Template(tag).nodelist
+
+        assert isinstance(node, BirdNode)
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_stale_output(self, templates_dir, registry):
+        TestComponent(name="footer", content="<footer>New</footer>").create(
+            templates_dir
+        )
+        registry.reset()
+
+        assert get_prerendered_output("footer") is None
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_stale_nested_output(self, templates_dir, registry):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        registry.reset()
+
+        assert get_prerendered_output("footer") is None
+        (node,) = Template("{% bird footer / %}").nodelist
+        assert isinstance(node, BirdNode)
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_removed_component(self, templates_dir, registry):
+        (templates_dir / "bird" / "footer.html").unlink()
+        registry.reset()
+
+        assert get_prerendered_output("footer") is None
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_debug(self):
+        with override_settings(DEBUG=True):
+            (node,) = Template("{% bird footer / %}").nodelist
+
+        assert isinstance(node, BirdNode)
+
+    @pytest.mark.usefixtures("prerendered")
+    def test_render_time_assets(self, override_app_settings):
+        template = Template("{% bird footer / %}")
+        context = Context()
+
+        with override_app_settings(RENDER_TIME_ASSETS=True):
+            template.render(context)
+
+        assert list(get_rendered_components(context)) == ["footer"]
+
+
+class TestPrerenderedComponents:
+    @pytest.mark.parametrize(
+        "content,message",
+        [
+            ("{", "Could not read prerendered components"),
+            ("[]", "must be an object"),
+        ],
+    )
+    def test_invalid_file(
+        self, static_root, prerendered_components, caplog, content, message
+    ):
+        path = static_root / "django_bird" / "prerendered.json"
+        path.parent.mkdir()
+        path.write_text(content)
+
+        with caplog.at_level(logging.WARNING, logger="django_bird"):
+            assert prerendered_components.get("footer") is None
+
+        assert message in caplog.text
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import io
+
+from django.template.loader import render_to_string
+
+from django_bird import render_component
+from django_bird.profiling import ComponentProfile
+from django_bird.profiling import get_active_profile
+from django_bird.profiling import profile_components
+
+from .utils import TestComponent
+
+
+def stacks(profile: ComponentProfile) -> set[str]:
+    return set(profile.samples)
+
+
+def test_profile_components(templates_dir):
+    TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(
+        name="button",
+        content="<button>{% bird icon / %}{% bird:slot %}{% endbird:slot %}</button>",
+    ).create(templates_dir)
+    (templates_dir / "page.html").write_text("{% bird button %}Click{% endbird %}")
+
+    with profile_components() as profile:
+        render_to_string("page.html")
+
+    assert stacks(profile) == {
+        "page.html;{% bird button %}",
+        "page.html;{% bird button %};button",
+        "page.html;{% bird button %};button;fill_slots",
+        "page.html;{% bird button %};button;{% bird icon %}",
+        "page.html;{% bird button %};button;{% bird icon %};icon",
+        "page.html;{% bird button %};button;{% bird icon %};icon;fill_slots",
+        "page.html;{% bird button %};button;{% bird:slot default %}",
+    }
+    assert all(seconds >= 0 for seconds in profile.samples.values())
+
+
+def test_profile_slot_content_components(templates_dir):
+    TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(name="card", content="<div>{{ slot }}</div>").create(templates_dir)
+    (templates_dir / "page.html").write_text(
+        "{% bird card %}{% bird icon / %}{% endbird %}"
+    )
+
+    with profile_components() as profile:
+        render_to_string("page.html")
+
+    assert "page.html;{% bird card %};card;fill_slots;{% bird icon %};icon" in (
+        stacks(profile)
+    )
+
+
+def test_profile_each(templates_dir):
+    TestComponent(name="row", content="<tr>{{ item }}</tr>").create(templates_dir)
+    (templates_dir / "page.html").write_text("{% bird:each row in rows as item / %}")
+
+    with profile_components() as profile:
+        render_to_string("page.html", {"rows": [1, 2]})
+
+    assert stacks(profile) == {
+        "page.html;{% bird:each row %}",
+        "page.html;{% bird:each row %};row",
+        "page.html;{% bird:each row %};row;fill_slots",
+    }
+
+
+def test_profile_render_component(templates_dir):
+    TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+
+    with profile_components() as profile:
+        render_component("icon")
+
+    assert stacks(profile) == {
+        "<unknown template>;icon",
+        "<unknown template>;icon;fill_slots",
+    }
+
+
+def test_not_profiling(templates_dir):
+    assert get_active_profile() is None
+
+    with profile_components() as profile:
+        assert get_active_profile() is profile
+
+    assert get_active_profile() is None
+
+
+def test_frame_self_time():
+    profile = ComponentProfile()
+    context = type("Context", (), {"template": None})()
+
+    with profile.frame("outer", context):
+        with profile.frame("inner", context):
+            pass
+
+    outer = profile.samples["<unknown template>;outer"]
+    inner = profile.samples["<unknown template>;outer;inner"]
+    assert outer >= 0
+    assert inner >= 0
+
+
+def test_collapsed():
+    profile = ComponentProfile()
+    profile.samples = {
+        "page.html;{% bird b %};b": 0.0025,
+        "page.html;{% bird a %};a": 0.001,
+    }
+
+    assert profile.collapsed() == (
+        "page.html;{% bird a %};a 1000\npage.html;{% bird b %};b 2500\n"
+    )
+
+
+def test_frame_names_cleaned():
+    profile = ComponentProfile()
+    context = type("Context", (), {"template": None})()
+
+    with profile.frame("a;b\nc", context):
+        pass
+
+    assert stacks(profile) == {"<unknown template>;a:b c"}
+
+
+def test_write(tmp_path):
+    profile = ComponentProfile()
+    profile.samples = {"page.html;{% bird a %};a": 0.001}
+
+    path = tmp_path / "profile.folded"
+    profile.write(path)
+    buffer = io.StringIO()
+    profile.write(buffer)
+
+    assert path.read_text() == "page.html;{% bird a %};a 1000\n"
+    assert buffer.getvalue() == "page.html;{% bird a %};a 1000\n"
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from django_bird import hookimpl
+from django_bird import queries
+from django_bird.middleware import ComponentQueriesMiddleware
+from django_bird.plugins import pm
+from django_bird.queries import assert_component_queries
+
+from .utils import TestComponent
+
+pytestmark = pytest.mark.django_db
+
+
+class Row:
+    def value(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            return cursor.fetchone()[0]
+
+
+@pytest.fixture(autouse=True)
+def unregister_queries():
+    yield
+    if pm.is_registered(queries):
+        pm.unregister(queries)
+
+
+@pytest.fixture
+def page(templates_dir):
+    TestComponent(
+        name="row",
+        content="""
+            {% bird:prop row %}
+            <tr><td>{{ props.row.value }}</td>{% bird icon / %}</tr>
+        """,
+    ).create(templates_dir)
+    TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(
+        name="table",
+        content="<table>{{ slot }}</table>",
+    ).create(templates_dir)
+    (templates_dir / "rows.html").write_text("""
+        {% bird table %}
+            {% for item in rows %}{% bird row row=item / %}{% endfor %}
+        {% endbird %}
+    """)
+    return "rows.html"
+
+
+def test_record_component_queries(page):
+    pm.register(queries, queries.__name__)
+
+    with queries.record_component_queries() as log:
+        render_to_string(page, {"rows": [Row(), Row(), Row()]})
+
+    row = log.queries["row"]
+    assert row.renders == 3
+    assert row.count == 3
+    assert row.max_per_render == 1
+    assert row.duration > 0
+    assert log.queries["table"].count == 0
+    assert log.queries["icon"].count == 0
+    assert [queries.name for queries in log.top()] == ["row"]
+
+
+def test_queries_outside_components_ignored(page):
+    pm.register(queries, queries.__name__)
+
+    with queries.record_component_queries() as log:
+        Row().value()
+
+    assert log.queries == {}
+
+
+def test_stop_without_start():
+    log = queries.ComponentQueryLog()
+
+    log.stop()
+
+    assert log.queries == {}
+
+
+def test_not_registered(page):
+    with queries.record_component_queries() as log:
+        render_to_string(page, {"rows": [Row()]})
+
+    assert log.queries == {}
+
+
+def test_assert_component_queries(page):
+    with assert_component_queries("row", max=1):
+        render_to_string(page, {"rows": [Row(), Row()]})
+
+    assert not pm.is_registered(queries)
+
+
+def test_assert_component_queries_fails(page):
+    with pytest.raises(AssertionError, match="'row' made 1 queries"):
+        with assert_component_queries("row", max=0):
+            render_to_string(page, {"rows": [Row()]})
+
+
+def test_assert_component_queries_not_rendered(page):
+    with assert_component_queries("row", max=0):
+        render_to_string(page, {"rows": []})
+
+
+class TestComponentQueriesMiddleware:
+    def view(self, request):
+        from django.http import HttpResponse
+
+        return HttpResponse(render_to_string("rows.html", {"rows": [Row(), Row()]}))
+
+    def test_logs_summary(self, page, caplog):
+        middleware = ComponentQueriesMiddleware(self.view)
+
+        with caplog.at_level(logging.INFO, logger="django_bird"):
+            middleware(RequestFactory().get("/orders/"))
+
+        (record,) = [
+            record for record in caplog.records if record.name == "django_bird.queries"
+        ]
+        assert record.getMessage().startswith(
+            "Component queries for GET /orders/: row: 2 queries in 2 renders"
+        )
+        assert record.component_queries["row"]["count"] == 2
+        assert record.component_queries["row"]["max_per_render"] == 1
+
+    def test_no_queries(self, page, caplog):
+        def view(request):
+            from django.http import HttpResponse
+
+            return HttpResponse(render_to_string("rows.html", {"rows": []}))
+
+        middleware = ComponentQueriesMiddleware(view)
+
+        with caplog.at_level(logging.INFO, logger="django_bird"):
+            middleware(RequestFactory().get("/orders/"))
+
+        assert not [
+            record for record in caplog.records if record.name == "django_bird.queries"
+        ]
+
+    def test_hook(self, page):
+        reported = []
+
+        class Plugin:
+            @staticmethod
+            @hookimpl
+            def report_component_queries(request, queries):
+                reported.append((request.path, queries))
+
+        plugin = Plugin()
+        pm.register(plugin)
+        try:
+            middleware = ComponentQueriesMiddleware(self.view)
+            middleware(RequestFactory().get("/orders/"))
+        finally:
+            pm.unregister(plugin)
+
+        ((path, queries),) = reported
+        assert path == "/orders/"
+        assert [(q.name, q.count, q.renders) for q in queries] == [("row", 2, 2)]
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pytest
+from django.core.cache import cache
+from django.template import Context
+from django.template import RequestContext
+from django.template import Template
+from django.test import RequestFactory
+from django.test import override_settings
+from django.utils import translation
+
+from django_bird import cache_control
+from django_bird.cache_control import CachePolicy
+from django_bird.cache_control import record_cache_policies
+from django_bird.components import get_rendered_components
+from django_bird.plugins import pm
+from django_bird.render_cache import bypass_render_cache
+from django_bird.render_cache import render_cache
+
+from .utils import TestComponent
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    @property
+    def tick(self):
+        self.count += 1
+        return self.count
+
+
+@dataclass
+class User:
+    pk: int
+    is_authenticated: bool = True
+
+
+TEMPLATE = "{% bird badge status='paid' %}A{% endbird %}"
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache():
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    ):
+        yield
+        cache.clear()
+    render_cache.reset()
+
+
+@pytest.fixture
+def render_cache_settings(override_app_settings):
+    with override_app_settings(ENABLE_BIRD_ATTRS=False, RENDER_CACHE="default"):
+        yield
+
+
+@pytest.fixture
+def badge(templates_dir):
+    return TestComponent(
+        name="badge",
+        content="""
+            {% bird:pure %}
+            {% bird:prop status %}
+            <span>{{ props.status }} {{ slot }} {{ counter.tick }}</span>
+        """,
+    ).create(templates_dir)
+
+
+def render(counter, template=TEMPLATE, request=None):
+    if request is None:
+        context = Context({"counter": counter})
+    else:
+        context = RequestContext(request, {"counter": counter})
+    return Template(template).render(context)
+
+
+def test_disabled_by_default(badge):
+    counter = Counter()
+
+    render(counter)
+    render(counter)
+
+    assert counter.count == 2
+
+
+@pytest.mark.usefixtures("render_cache_settings")
+class TestRenderCache:
+    def test_local_hit(self, badge):
+        counter = Counter()
+
+        first = render(counter)
+        second = render(counter)
+
+        assert counter.count == 1
+        assert first == second
+        assert render_cache.stats() == {
+            "hits": 0,
+            "local_hits": 1,
+            "misses": 1,
+            "local_size": 1,
+        }
+
+    def test_backend_hit(self, badge):
+        counter = Counter()
+
+        render(counter)
+        render_cache.local.clear()
+        render(counter)
+
+        assert counter.count == 1
+        assert render_cache.stats()["hits"] == 1
+        assert render_cache.stats()["local_size"] == 1
+
+    def test_local_size(self, badge, override_app_settings):
+        counter = Counter()
+
+        with override_app_settings(
+            ENABLE_BIRD_ATTRS=False, RENDER_CACHE="default", RENDER_CACHE_LOCAL_SIZE=1
+        ):
+            render(counter, "{% bird badge status='paid' %}A{% endbird %}")
+            render(counter, "{% bird badge status='due' %}A{% endbird %}")
+
+        assert len(render_cache.local) == 1
+
+    def test_no_local_cache(self, badge, override_app_settings):
+        counter = Counter()
+
+        with override_app_settings(
+            ENABLE_BIRD_ATTRS=False, RENDER_CACHE="default", RENDER_CACHE_LOCAL_SIZE=0
+        ):
+            render(counter)
+            render(counter)
+
+        assert counter.count == 1
+        assert render_cache.stats()["hits"] == 1
+        assert len(render_cache.local) == 0
+
+    def test_timeout(self, badge, override_app_settings):
+        counter = Counter()
+
+        with override_app_settings(
+            ENABLE_BIRD_ATTRS=False, RENDER_CACHE="default", RENDER_CACHE_TIMEOUT=0
+        ):
+            render(counter)
+            render(counter)
+
+        assert counter.count == 2
+
+    @override_settings(DEBUG=True)
+    def test_template_change(self, badge, templates_dir):
+        counter = Counter()
+        render(counter)
+
+        TestComponent(
+            name="badge",
+            content="""
+                {% bird:pure %}
+                {% bird:prop status %}
+                <b>{{ props.status }} {{ counter.tick }}</b>
+            """,
+        ).create(templates_dir)
+        rendered = render(counter)
+
+        assert counter.count == 2
+        assert "<b>paid 2</b>" in rendered
+
+    @override_settings(DEBUG=True)
+    def test_nested_template_change(self, templates_dir):
+        TestComponent(
+            name="outer",
+            content="{% bird:pure %}<div>{% bird inner / %} {{ counter.tick }}</div>",
+        ).create(templates_dir)
+        TestComponent(name="inner", content="<span></span>").create(templates_dir)
+        counter = Counter()
+        render(counter, "{% bird outer / %}")
+
+        TestComponent(name="inner", content="<em></em>").create(templates_dir)
+        rendered = render(counter, "{% bird outer / %}")
+
+        assert counter.count == 2
+        assert "<em></em> 2" in rendered
+
+    def test_bypass(self, badge):
+        counter = Counter()
+        render(counter)
+        request = RequestFactory().get("/")
+
+        bypass_render_cache(request)
+        render(counter, request=request)
+
+        assert counter.count == 2
+
+    def test_vary_on_user(self, templates_dir):
+        TestComponent(
+            name="badge",
+            content="""
+                {% bird:pure vary="user" %}
+                <span>{{ request.user.pk }} {{ counter.tick }}</span>
+            """,
+        ).create(templates_dir)
+        counter = Counter()
+        factory = RequestFactory()
+
+        for user in [User(1), User(2), User(1), User(3, is_authenticated=False)]:
+            request = factory.get("/")
+            request.user = user
+            render(counter, request=request)
+
+        assert counter.count == 3
+
+    def test_vary_on_language(self, templates_dir):
+        TestComponent(
+            name="badge",
+            content='{% bird:pure vary="language" %}<span>{{ counter.tick }}</span>',
+        ).create(templates_dir)
+        counter = Counter()
+
+        for language in ["en", "fr", "en"]:
+            with translation.override(language):
+                render(counter)
+
+        assert counter.count == 2
+
+    @pytest.mark.parametrize("backend_hit", [False, True])
+    def test_nested_components(self, templates_dir, override_app_settings, backend_hit):
+        TestComponent(
+            name="outer",
+            content="{% bird:pure %}<div>{% bird inner / %} {{ counter.tick }}</div>",
+        ).create(templates_dir)
+        TestComponent(
+            name="inner", content="{% bird:cache_control private %}<span></span>"
+        ).create(templates_dir)
+        counter = Counter()
+        render(counter, "{% bird outer / %}")
+        if backend_hit:
+            render_cache.local.clear()
+
+        pm.register(cache_control)
+        try:
+            with (
+                override_app_settings(
+                    ENABLE_BIRD_ATTRS=False,
+                    RENDER_CACHE="default",
+                    RENDER_TIME_ASSETS=True,
+                ),
+                record_cache_policies() as policies,
+            ):
+                context = Context({"counter": counter})
+                rendered = Template("{% bird outer / %}").render(context)
+        finally:
+            pm.unregister(cache_control)
+
+        assert counter.count == 1
+        assert "<span></span> 1" in rendered
+        assert list(get_rendered_components(context)) == ["outer", "inner"]
+        assert policies.policy == CachePolicy(private=True)
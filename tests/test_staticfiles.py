@@ -304,6 +304,7 @@ class TestAssetClass:
         button_css.file.unlink()
 
         assert asset.render() == ""
+        assert asset.render_preload_link() is None
 
     def test_absolute_path(self, templates_dir):
         button = TestComponent(
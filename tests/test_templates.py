@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import pytest
+from django.template.engine import Engine
 from django.test import override_settings
 
+from django_bird.templates import ComponentGraph
 from django_bird.templates import find_components_in_template
 from django_bird.templates import gather_bird_tag_template_usage
 from django_bird.templates import get_component_directory_names
+from django_bird.templates import get_template_key
 from django_bird.templates import get_template_names
+from tests.utils import TestComponent
 
 
 @pytest.mark.parametrize(
@@ -156,4 +160,97 @@ def test_find_components_handles_encoding_errors(templates_dir):
 
     results = list(gather_bird_tag_template_usage())
 
-    assert all(str(valid_file) in str(path) for path, _ in results)
+    assert [key for key, _ in results if "valid_file.html" in key] == [
+        "django.template.loaders.filesystem.Loader:valid_file.html"
+    ]
+    assert not any("binary_file.html" in key for key, _ in results)
+
+
+def test_get_template_key(templates_dir):
+    sub_dir = templates_dir / "pages"
+    sub_dir.mkdir()
+    (sub_dir / "home.html").write_text("<html></html>")
+
+    template = Engine.get_default().get_template("pages/home.html")
+
+    assert (
+        get_template_key(template)
+        == "django.template.loaders.filesystem.Loader:pages/home.html"
+    )
+
+
+def test_get_template_key_cached(templates_dir):
+    (templates_dir / "cached.html").write_text("<html></html>")
+
+    template = Engine.get_default().get_template("cached.html")
+    key = get_template_key(template)
+    template.origin.template_name = "changed.html"
+
+    assert get_template_key(template) == key
+
+
+def test_get_template_key_from_string():
+    template = Engine.get_default().from_string("<html></html>")
+
+    assert get_template_key(template) is None
+
+
+class TestComponentGraph:
+    def test_children(self, templates_dir):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+        ).create(templates_dir)
+
+        graph = ComponentGraph()
+
+        assert graph.children("button") == {"icon"}
+        assert graph.children("icon") == set()
+
+    def test_children_missing_component(self):
+        graph = ComponentGraph()
+
+        assert graph.children("nonexistent") == set()
+
+    def test_closure(self, templates_dir):
+        TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+        TestComponent(
+            name="button", content="<button>{% bird icon / %}{{ slot }}</button>"
+        ).create(templates_dir)
+        TestComponent(
+            name="toolbar", content="<div>{% bird button %}Go{% endbird %}</div>"
+        ).create(templates_dir)
+        TestComponent(name="alert", content="<div>{{ slot }}</div>").create(
+            templates_dir
+        )
+
+        graph = ComponentGraph()
+
+        assert graph.closure(["toolbar", "alert"]) == {
+            "toolbar",
+            "button",
+            "icon",
+            "alert",
+        }
+
+    def test_closure_cycle(self, templates_dir):
+        TestComponent(name="tree", content="<ul>{% bird tree.node / %}</ul>").create(
+            templates_dir
+        )
+        TestComponent(name="tree.node", content="<li>{% bird tree / %}</li>").create(
+            templates_dir
+        )
+
+        graph = ComponentGraph()
+
+        assert graph.closure(["tree"]) == {"tree", "tree.node"}
+
+    def test_closure_self_reference(self, templates_dir):
+        TestComponent(
+            name="menu", content="<ul>{% if items %}{% bird menu / %}{% endif %}</ul>"
+        ).create(templates_dir)
+
+        graph = ComponentGraph()
+
+        assert graph.children("menu") == set()
+        assert graph.closure(["menu"]) == {"menu"}
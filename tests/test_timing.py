@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from django.template.loader import render_to_string
+
+import django_bird.timing
+from django_bird.timing import SLOW_RENDER_LOG_WINDOW
+from django_bird.timing import ComponentTimings
+from django_bird.timing import slow_render_log
+
+from .utils import TestComponent
+
+
+def test_inclusive_and_exclusive():
+    timings = ComponentTimings()
+
+    timings.start()  # card
+    timings.start()  # button
+    timings.start()  # icon
+    timings.stop("icon", 0.001)
+    timings.stop("button", 0.003)
+    timings.start()  # button
+    timings.stop("button", 0.002)
+    timings.stop("card", 0.010)
+
+    card = timings.timings["card"]
+    button = timings.timings["button"]
+    icon = timings.timings["icon"]
+
+    assert card.count == 1
+    assert card.inclusive == pytest.approx(0.010)
+    assert card.exclusive == pytest.approx(0.005)
+    assert button.count == 2
+    assert button.inclusive == pytest.approx(0.005)
+    assert button.exclusive == pytest.approx(0.004)
+    assert icon.count == 1
+    assert icon.exclusive == pytest.approx(0.001)
+
+
+def test_top():
+    timings = ComponentTimings()
+
+    for name, elapsed in [("a", 0.001), ("b", 0.003), ("c", 0.002)]:
+        timings.start()
+        timings.stop(name, elapsed)
+
+    assert [timing.name for timing in timings.top(2)] == ["b", "c"]
+
+
+def test_render_server_timing():
+    timings = ComponentTimings()
+
+    timings.start()
+    timings.start()
+    timings.stop("button", 0.0015)
+    timings.stop("modal.trigger", 0.004)
+
+    assert timings.render_server_timing(10) == (
+        'bird.modal.trigger;desc="1x / 2.50ms self";dur=4.00, '
+        'bird.button;desc="1x / 1.50ms self";dur=1.50'
+    )
+
+
+def test_render_server_timing_empty():
+    assert ComponentTimings().render_server_timing(10) == ""
+
+
+class TestSlowRenderLog:
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        slow_render_log.reset()
+        yield
+        slow_render_log.reset()
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        class FakeTime:
+            now = 1000.0
+
+            @classmethod
+            def monotonic(cls):
+                return cls.now
+
+            @classmethod
+            def advance(cls, seconds):
+                cls.now += seconds
+
+        monkeypatch.setattr(django_bird.timing, "time", FakeTime)
+        return FakeTime
+
+    @pytest.fixture
+    def page(self, templates_dir):
+        TestComponent(
+            name="button",
+            content="""
+                {% bird:prop label %}
+                {% bird:prop size="md" %}
+                <button>{{ props.label }}</button>
+            """,
+        ).create(templates_dir)
+        (templates_dir / "page.html").write_text(
+            "{% bird button label='Go' size='sm' / %}"
+        )
+        return "page.html"
+
+    def slow_records(self, caplog):
+        return [
+            record for record in caplog.records if record.name == "django_bird.timing"
+        ]
+
+    def test_logs_slow_render(self, page, caplog, override_app_settings):
+        with override_app_settings(SLOW_RENDER_THRESHOLD=0):
+            with caplog.at_level(logging.WARNING, logger="django_bird"):
+                render_to_string(page)
+
+        (record,) = self.slow_records(caplog)
+        assert record.levelno == logging.WARNING
+        assert record.component == "button"
+        assert record.component_origin.endswith("button.html")
+        assert record.template.endswith("page.html")
+        assert record.props == ["label", "size"]
+        assert record.elapsed_ms >= 0
+        assert record.threshold_ms == 0
+        assert record.suppressed == 0
+
+    def test_fast_render_not_logged(self, page, caplog, override_app_settings):
+        with override_app_settings(SLOW_RENDER_THRESHOLD=60_000):
+            with caplog.at_level(logging.WARNING, logger="django_bird"):
+                render_to_string(page)
+
+        assert self.slow_records(caplog) == []
+
+    def test_disabled_by_default(self, page, caplog):
+        with caplog.at_level(logging.WARNING, logger="django_bird"):
+            render_to_string(page)
+
+        assert self.slow_records(caplog) == []
+
+    def test_sampling(self, page, caplog, override_app_settings):
+        with override_app_settings(
+            SLOW_RENDER_THRESHOLD=0, SLOW_RENDER_SAMPLE_RATE=0.0
+        ):
+            with caplog.at_level(logging.WARNING, logger="django_bird"):
+                render_to_string(page)
+
+        assert self.slow_records(caplog) == []
+
+    def test_rate_limit(self, page, caplog, clock, override_app_settings):
+        with override_app_settings(SLOW_RENDER_THRESHOLD=0, SLOW_RENDER_LOG_LIMIT=2):
+            with caplog.at_level(logging.WARNING, logger="django_bird"):
+                for _ in range(5):
+                    render_to_string(page)
+
+                assert len(self.slow_records(caplog)) == 2
+
+                clock.advance(SLOW_RENDER_LOG_WINDOW)
+                render_to_string(page)
+
+        records = self.slow_records(caplog)
+        assert len(records) == 3
+        assert records[-1].suppressed == 3
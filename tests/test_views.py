@@ -1 +1,145 @@
 from __future__ import annotations
+
+import pytest
+from django.http import Http404
+from django.test import RequestFactory
+from django.test import override_settings
+from django.urls import resolve
+
+from django_bird.views import component_fragment
+
+from .utils import TestComponent
+
+
+@pytest.fixture
+def button(templates_dir):
+    return TestComponent(
+        name="button",
+        content="""
+            {% bird:prop variant="plain" %}
+            {% bird:prop size="md" %}
+            <button class="{{ props.variant }}" {{ attrs }}>Go</button>
+        """,
+    ).create(templates_dir)
+
+
+@pytest.fixture
+def fragments(override_app_settings):
+    with override_app_settings(
+        ENABLE_BIRD_ATTRS=False, FRAGMENT_COMPONENTS=["button", "cards.*"]
+    ):
+        yield
+
+
+def test_url():
+    match = resolve("/components/button/", urlconf="django_bird.urls")
+
+    assert match.func is component_fragment
+    assert match.kwargs == {"name": "button"}
+
+
+def test_component_fragment(button, fragments):
+    request = RequestFactory().get("/", {"variant": "primary"})
+
+    response = component_fragment(request, "button")
+
+    assert response.status_code == 200
+    assert response.content.decode().strip() == '<button class="primary" >Go</button>'
+    assert response.headers["ETag"]
+
+
+def test_props_escaped(button, fragments):
+    request = RequestFactory().get("/", {"variant": '"><script>'})
+
+    response = component_fragment(request, "button")
+
+    assert b"<script>" not in response.content
+    assert b'class="&quot;&gt;&lt;script&gt;"' in response.content
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "onmouseover=alert(document.cookie)",
+        "x><script>alert(1)</script><b=1",
+        "hx_get=/admin/",
+    ],
+)
+def test_undeclared_params_ignored(button, fragments, query):
+    plain = component_fragment(RequestFactory().get("/"), "button")
+
+    response = component_fragment(RequestFactory().get(f"/?{query}"), "button")
+
+    assert response.content == plain.content
+    assert response.headers["ETag"] == plain.headers["ETag"]
+
+
+def test_not_modified(button, fragments):
+    etag = component_fragment(RequestFactory().get("/"), "button").headers["ETag"]
+
+    response = component_fragment(
+        RequestFactory().get("/", HTTP_IF_NONE_MATCH=etag), "button"
+    )
+
+    assert response.status_code == 304
+
+
+def test_etag_depends_on_props(button, fragments):
+    plain = component_fragment(RequestFactory().get("/"), "button")
+    primary = component_fragment(
+        RequestFactory().get("/", {"variant": "primary"}), "button"
+    )
+    reordered = component_fragment(
+        RequestFactory().get("/?variant=primary&size=lg"), "button"
+    ).headers["ETag"]
+
+    assert plain.headers["ETag"] != primary.headers["ETag"]
+    assert (
+        component_fragment(
+            RequestFactory().get("/?size=lg&variant=primary"), "button"
+        ).headers["ETag"]
+        == reordered
+    )
+
+
+@override_settings(DEBUG=True)
+def test_etag_depends_on_template(button, fragments, templates_dir):
+    before = component_fragment(RequestFactory().get("/"), "button").headers["ETag"]
+    button.content = "<button>Changed</button>"
+    button.create(templates_dir)
+
+    after = component_fragment(RequestFactory().get("/"), "button").headers["ETag"]
+
+    assert before != after
+
+
+@override_settings(DEBUG=True)
+def test_etag_depends_on_nested_templates(fragments, templates_dir):
+    icon = TestComponent(name="icon", content="<svg></svg>").create(templates_dir)
+    TestComponent(name="button", content="<button>{% bird icon / %}</button>").create(
+        templates_dir
+    )
+    before = component_fragment(RequestFactory().get("/"), "button").headers["ETag"]
+    icon.content = "<svg><path></path></svg>"
+    icon.create(templates_dir)
+
+    after = component_fragment(RequestFactory().get("/"), "button").headers["ETag"]
+
+    assert before != after
+
+
+@pytest.mark.parametrize("name", ["button", "missing"])
+def test_not_served_by_default(button, name):
+    with pytest.raises(Http404):
+        component_fragment(RequestFactory().get("/"), name)
+
+
+def test_missing_component(fragments):
+    with pytest.raises(Http404):
+        component_fragment(RequestFactory().get("/"), "cards.missing")
+
+
+def test_post_not_allowed(button, fragments):
+    response = component_fragment(RequestFactory().post("/"), "button")
+
+    assert response.status_code == 405